@@ -0,0 +1,56 @@
+"""
+Time ``MarathonTransformer.validate()`` on apps with many docker parameters
+and port mappings, like the ones service mesh sidecars generate.
+
+    $ python benchmarks/marathon_validate.py --apps 100 --parameters 500 --ports 200
+"""
+import argparse
+import timeit
+
+from container_transform.marathon import MarathonTransformer
+
+
+def build_app(index, parameters, ports):
+    return {
+        'id': 'app-{}'.format(index),
+        'container.docker.image': 'me/app:{}'.format(index),
+        'container.docker.parameters.label': [
+            {'key': 'label', 'value': 'mesh.example.com/key-{}={}'.format(i, parameters - i)}
+            for i
+            in range(parameters)
+        ],
+        'container.docker.portMappings': [
+            {'containerPort': 8000 + i, 'hostPort': 0, 'protocol': 'tcp'}
+            for i
+            in range(ports)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--apps', type=int, default=100)
+    parser.add_argument('--parameters', type=int, default=500)
+    parser.add_argument('--ports', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    transformer = MarathonTransformer()
+
+    def run():
+        for index in range(args.apps):
+            transformer.validate(build_app(index, args.parameters, args.ports))
+
+    build_time = min(timeit.repeat(
+        lambda: [build_app(i, args.parameters, args.ports) for i in range(args.apps)],
+        number=1,
+        repeat=args.repeat
+    ))
+    total = min(timeit.repeat(run, number=1, repeat=args.repeat))
+    print('{} apps, {} parameters, {} port mappings: {:.1f} ms per app'.format(
+        args.apps, args.parameters, args.ports, (total - build_time) * 1000 / args.apps
+    ))
+
+
+if __name__ == '__main__':
+    main()
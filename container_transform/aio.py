@@ -0,0 +1,132 @@
+import asyncio
+import inspect
+import io
+
+from .converter import Converter
+
+
+def _convert(data, input_type, output_type, verbose, converter_options):
+    """
+    Run a conversion of already read input data. This is a module level
+    function so it can be sent to a process pool executor.
+
+    :rtype: tuple
+    :returns: The output text, messages
+    """
+    stream = io.BytesIO(data)
+    converter = Converter(stream, input_type, output_type, **converter_options)
+    output = converter.convert(verbose)
+    return output, converter.messages
+
+
+async def read_source(source):
+    """
+    Read all of an asynchronous input source
+
+    :param source: Either an object with an awaitable ``.read()`` method (such
+        as an :class:`asyncio.StreamReader`), an async iterable of bytes, or
+        the bytes themselves
+    :rtype: bytes
+    """
+    if isinstance(source, str):
+        return source.encode('utf-8')
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, 'read'):
+        data = source.read()
+        if inspect.isawaitable(data):
+            data = await data
+        return data
+    chunks = []
+    async for chunk in source:
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+class AsyncConverter(object):
+    """
+    Run conversions from an asyncio event loop without blocking it.
+
+    Input is read asynchronously, then parsing, conversion and rendering are
+    run in ``executor``. Cancelling a pending ``.convert()`` stops waiting for
+    the result; a conversion that has already started in the executor is left
+    to finish and its result is discarded.
+
+    To use this class:
+
+    .. code-block:: python
+
+        converter = AsyncConverter(max_concurrency=4)
+        output, messages = await converter.convert(reader, 'compose', 'ecs')
+
+    """
+
+    def __init__(self, executor=None, max_concurrency=None, **converter_options):
+        """
+        :param executor: The executor to run conversions in. Defaults to the
+            event loop's default executor. Process pools are supported.
+        :type executor: concurrent.futures.Executor
+        :param max_concurrency: The maximum number of conversions to run at
+            once. Unlimited if not set
+        :type max_concurrency: int
+        :param converter_options: Extra keyword arguments for
+            :class:`Converter<container_transform.converter.Converter>`
+        """
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.converter_options = converter_options
+        self._semaphore = None
+
+    def _get_semaphore(self):
+        # Created lazily so it belongs to the running event loop
+        if self.max_concurrency and self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def convert(self, source, input_type, output_type, verbose=True):
+        """
+        :param source: The input, see :func:`read_source`
+        :param input_type: The input transformation type
+        :type input_type: str
+        :param output_type: The output transformation type
+        :type output_type: str
+        :param verbose: Expand/minify json output
+        :type verbose: bool
+
+        :rtype: tuple
+        :returns: The output text, messages
+        """
+        semaphore = self._get_semaphore()
+        if semaphore is None:
+            return await self._convert(source, input_type, output_type, verbose)
+        async with semaphore:
+            return await self._convert(source, input_type, output_type, verbose)
+
+    async def _convert(self, source, input_type, output_type, verbose):
+        data = await read_source(source)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            _convert,
+            data,
+            input_type,
+            output_type,
+            verbose,
+            self.converter_options
+        )
+
+
+async def aconvert(source, input_type, output_type, verbose=True, executor=None,
+                   **converter_options):
+    """
+    Convert an asynchronous input source without blocking the event loop.
+
+    .. code-block:: python
+
+        output, messages = await aconvert(reader, 'compose', 'ecs')
+
+    :rtype: tuple
+    :returns: The output text, messages
+    """
+    converter = AsyncConverter(executor=executor, **converter_options)
+    return await converter.convert(source, input_type, output_type, verbose)
@@ -0,0 +1,124 @@
+from array import array
+from collections import namedtuple
+
+from .schema import TransformationTypes
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+# Parameters whose values are gathered into columns
+BATCH_PARAMETERS = ('cpu', 'memory')
+
+# Values beyond this are left to the scalar methods, so shifting or
+# multiplying by 1024 can't overflow an int64 or lose float precision
+_LIMIT = 1 << 43
+
+Kernel = namedtuple('Kernel', ['typecode', 'vector', 'item'])
+Kernel.__doc__ = """
+A column version of an ``ingest_*()`` or ``emit_*()`` method. ``typecode`` is
+the ``array`` type of the column, ``vector`` runs on a whole NumPy array and
+``item`` on one value, when NumPy isn't installed.
+"""
+
+
+def _memory_from_mb():
+    return Kernel('q', lambda column: column << 20, lambda value: value << 20)
+
+
+def _memory_to_mb():
+    return Kernel(
+        'q',
+        lambda column: numpy.maximum(column >> 20, 4),
+        lambda value: max(value >> 20, 4)
+    )
+
+
+def _cpu_from_cores():
+    return Kernel('d', lambda column: column * 1024, lambda value: value * 1024)
+
+
+def _cpu_to_cores():
+    return Kernel('d', lambda column: column / 1024, lambda value: value / 1024)
+
+
+# (format, method) -> Kernel. Methods that aren't here are called per value
+KERNELS = {}
+for _format in (TransformationTypes.ECS, TransformationTypes.MARATHON, TransformationTypes.CHRONOS):
+    KERNELS[(_format.value, 'ingest_memory')] = _memory_from_mb()
+    KERNELS[(_format.value, 'emit_memory')] = _memory_to_mb()
+for _format in (TransformationTypes.MARATHON, TransformationTypes.CHRONOS):
+    KERNELS[(_format.value, 'ingest_cpu')] = _cpu_from_cores()
+    KERNELS[(_format.value, 'emit_cpu')] = _cpu_to_cores()
+
+
+def _fits(kernel, values):
+    if kernel.typecode == 'q':
+        valid = (type(value) is int and -_LIMIT < value < _LIMIT for value in values)
+    else:
+        valid = (
+            type(value) in (int, float) and -_LIMIT < value < _LIMIT
+            for value
+            in values
+        )
+    return all(valid)
+
+
+def _run_stage(format_type, transformer, method, values):
+    """
+    Run one ``ingest_*()`` or ``emit_*()`` method over a list of values, as a
+    column if there is a kernel for it and the values fit its type.
+
+    :rtype: list
+    """
+    func = getattr(transformer, method)
+    if getattr(func, 'passthrough', False):
+        return values
+
+    kernel = KERNELS.get((format_type, method))
+    if kernel is None or not _fits(kernel, values):
+        return [func(value) for value in values]
+
+    if numpy is not None:
+        dtype = numpy.int64 if kernel.typecode == 'q' else numpy.float64
+        return kernel.vector(numpy.array(values, dtype=dtype)).tolist()
+
+    item = kernel.item
+    return [item(value) for value in array(kernel.typecode, values)]
+
+
+def convert_columns(plan, containers, input_type, output_type, input_transformer,
+                    output_transformer):
+    """
+    Convert the ``BATCH_PARAMETERS`` of all containers at once. The values of
+    each parameter are gathered into a column, ingested and emitted, and
+    returned in container order, with None for containers without a value.
+
+    :param plan: The output of ``compile_plan()``
+    :type plan: tuple of PlanStep
+    :type containers: list of dict
+    :rtype: dict
+    :returns: parameter -> list of emitted values
+    """
+    columns = {}
+    for step in plan:
+        if step.parameter not in BATCH_PARAMETERS or not step.ingest or step.copy:
+            continue
+
+        indexes, values = [], []
+        for index, container in enumerate(containers):
+            value = container.get(step.input_name)
+            if value:
+                indexes.append(index)
+                values.append(value)
+
+        values = _run_stage(input_type, input_transformer, step.ingest, values)
+        values = _run_stage(output_type, output_transformer, step.emit, values)
+
+        column = [None] * len(containers)
+        for index, value in zip(indexes, values):
+            column[index] = value
+        columns[step.parameter] = column
+    return columns
@@ -0,0 +1,67 @@
+from copy import deepcopy
+
+from .manifest import Manifest, _reuse
+
+
+class ConversionCache(object):
+    """
+    An in-memory cache of converted containers, so identical container
+    definitions are only converted once, within a file or across all the
+    files converted with the same cache.
+
+    Containers are keyed by a hash of their ingested definition without its
+    name, and the formats and transformer settings of the conversion. Every
+    reuse gets its own shallow copy, since emitters change the top level of
+    the containers they are given; nested values are shared.
+
+    To use this class:
+
+    .. code-block:: python
+
+        cache = ConversionCache()
+        for filename in filenames:
+            Converter(filename, 'compose', 'ecs', dedup=cache).convert()
+        print(cache.hits, cache.misses)
+
+    """
+
+    context_key = staticmethod(Manifest.context_key)
+    container_key = staticmethod(Manifest.container_key)
+
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Return a copy of the entry stored for a container key, or None if the
+        container needs to be converted.
+
+        :rtype: dict
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _reuse(entry)
+
+    def put(self, key, container, state, messages):
+        """
+        Record a converted container
+
+        :param key: The output of ``.container_key()``
+        :type key: str
+        :param container: The validated output container
+        :type container: dict
+        :param state: The output transformer state the container added
+        :type state: dict
+        :param messages: Messages from converting the container
+        :type messages: set
+        """
+        self.entries[key] = deepcopy({
+            'container': container,
+            'state': state,
+            'messages': messages,
+        })
@@ -1,15 +1,17 @@
-import json
-import uuid
-import shlex
-
 from datetime import datetime
 
 from copy import deepcopy
 from functools import reduce
 from collections import Mapping, defaultdict
 
+from .input import load_json
+from .json_backends import get_backend
 from .schema import TransformationTypes, ARG_MAP
-from .transformer import BaseTransformer
+from .transformer import (
+    BaseTransformer, format_port_range, format_volumes_from, parse_volumes_from,
+    passthrough, port_range_fields
+)
+from .views import ContainerView
 
 
 def update_nested_dict(d, u):
@@ -54,11 +56,25 @@ class ChronosTransformer(BaseTransformer):
     """
     input_type = TransformationTypes.COMPOSE.value
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, schedule=None, json_backend=None, random_names=False):
         """
         :param filename: The file to be loaded
         :type filename: str
+        :param schedule: The ISO 8601 schedule of emitted jobs. Defaults to
+            hourly, starting when the transformer is created, so every job
+            in a conversion gets the same schedule
+        :type schedule: str
+        :param json_backend: The JSON backend to read and write with, see
+            :func:`container_transform.json_backends.get_backend`
+        :type json_backend: str
+        :param random_names: Name jobs without a name randomly, instead of
+            after their content
+        :type random_names: bool
         """
+        self._json = get_backend(json_backend)
+        self.random_names = random_names
+        self.schedule = schedule or 'R/{now}/PT1H'.format(now=datetime.utcnow().isoformat())
+        self._default_schedule = schedule is None
         if filename:
             self._filename = filename
             stream = self._read_file(filename)
@@ -70,7 +86,13 @@ class ChronosTransformer(BaseTransformer):
         """
         Read in the json stream
         """
-        return json.load(stream)
+        return load_json(stream, self._json)
+
+    def volatile_fields(self):
+        # The default schedule starts when the transformer is created
+        if self._default_schedule:
+            return frozenset(['schedule'])
+        return frozenset()
 
     def _lookup_parameter(self, container, key, common_type=None):
         """
@@ -106,7 +128,9 @@ class ChronosTransformer(BaseTransformer):
     def flatten_container(self, container):
         """
         Accepts a chronos container and pulls out the nested values into the top level
+        of a view, without modifying ``container``
         """
+        overlay = {}
         for names in ARG_MAP.values():
             if names[TransformationTypes.CHRONOS.value]['name'] and \
                             '.' in names[TransformationTypes.CHRONOS.value]['name']:
@@ -118,22 +142,23 @@ class ChronosTransformer(BaseTransformer):
                     common_type = names[TransformationTypes.CHRONOS.value].get('type')
                     result = self._lookup_parameter(container, parts[-1], common_type)
                     if result:
-                        container[chronos_dotted_name] = result
+                        overlay[chronos_dotted_name] = result
                 else:
                     result = lookup_nested_dict(container, *parts)
                     if result:
-                        container[chronos_dotted_name] = result
-        return container
-
-    def ingest_containers(self, containers=None):
-        containers = containers or self.stream or {}
-        # Accept lists of tasks for convenience
-        if isinstance(containers, dict):
-            containers = [containers]
-        return [
-            self.flatten_container(container)
-            for container
-            in containers]
+                        overlay[chronos_dotted_name] = result
+        return ContainerView(container, overlay)
+
+    def _ingest_container(self, container):
+        # Lists of tasks are accepted by ._raw_containers() for convenience
+        return self.flatten_container(container)
+
+    def _build_output(self, containers):
+        containers = sorted(self._name_containers(containers), key=lambda c: c.get('name'))
+
+        if len(containers) == 1 and isinstance(containers, list):
+            containers = containers[0]
+        return containers
 
     def emit_containers(self, containers, verbose=True):
         """
@@ -142,27 +167,19 @@ class ChronosTransformer(BaseTransformer):
         :param containers: List of the container definitions
         :type containers: list of dict
 
-        :param verbose: Print out newlines and indented JSON
+        :param verbose: Print out newlines and indented JSON, otherwise use
+            compact JSON
         :type verbose: bool
 
         :returns: The text output
         :rtype: str
         """
-        containers = sorted(containers, key=lambda c: c.get('name'))
+        return self._json.dumps(self._build_output(containers), verbose)
 
-        if len(containers) == 1 and isinstance(containers, list):
-            containers = containers[0]
-
-        if verbose:
-            return json.dumps(containers, indent=4, sort_keys=True)
-        else:
-            return json.dumps(containers)
+    def emit_stream(self, containers, verbose=True):
+        return self._json.iterencode(self._build_output(containers), verbose)
 
     def validate(self, container):
-        # Ensure container name
-        container_name = container.get('name', str(uuid.uuid4()))
-        container['name'] = container_name
-
         container_data = defaultdict(lambda: defaultdict(dict))
         container_data.update(container)
 
@@ -185,14 +202,10 @@ class ChronosTransformer(BaseTransformer):
 
         # Sort the parameters in a deterministic way
         if container_data['container'].get('parameters'):
-            old_params = container_data['container']['parameters']
-            sorted_values = sorted(
-                old_params, key=lambda p: str(p.get('value'))
-            )
-            sorted_keys = sorted(
-                sorted_values, key=lambda p: p.get('key')
+            container_data['container']['parameters'] = sorted(
+                container_data['container']['parameters'],
+                key=lambda p: (p.get('key'), str(p.get('value')))
             )
-            container_data['container']['parameters'] = sorted_keys
 
         # Assume the network mode is BRIDGE if unspecified
         if container_data['container'].get('network') != 'HOST':
@@ -201,7 +214,7 @@ class ChronosTransformer(BaseTransformer):
         container_data['container']['forcePullImage'] = True
         container_data['container']['type'] = 'DOCKER'
         container_data['uris'] = []
-        container_data['schedule'] = 'R/{now}/PT1H'.format(now=datetime.utcnow().isoformat())
+        container_data['schedule'] = self.schedule
         container_data['disabled'] = False
         container_data['shell'] = False
         container_data['owner'] = None
@@ -229,14 +242,10 @@ class ChronosTransformer(BaseTransformer):
         mapping = str(mapping).rstrip('/udp')
         parts = str(mapping).split(':')
         if len(parts) == 1:
-            output.update({
-                'container_port': int(parts[0])
-            })
+            output.update(port_range_fields('container', parts[0]))
         else:
-            output.update({
-                'host_port': int(parts[0]),
-                'container_port': int(parts[1]),
-            })
+            output.update(port_range_fields('host', parts[0]))
+            output.update(port_range_fields('container', parts[1]))
         return output
 
     def ingest_port_mappings(self, port_mappings):
@@ -251,9 +260,12 @@ class ChronosTransformer(BaseTransformer):
         return [self._parse_port_mapping(mapping) for mapping in port_mappings]
 
     def _construct_port_mapping(self, mapping):
-        output = str(mapping['container_port'])
+        output = format_port_range(mapping['container_port'], mapping.get('container_port_end'))
         if 'host_port' in mapping:
-            output = str(mapping['host_port']) + ':' + output
+            output = format_port_range(
+                mapping['host_port'],
+                mapping.get('host_port_end')
+            ) + ':' + output
         if mapping.get('protocol') == 'udp':
             output += '/udp'
         return output
@@ -299,8 +311,9 @@ class ChronosTransformer(BaseTransformer):
         return self._list2cmdline(command)
 
     def emit_command(self, command):
-        return shlex.split(command)
+        return self._cmdline2list(command)
 
+    @passthrough
     def ingest_entrypoint(self, entrypoint):
         return entrypoint
 
@@ -308,10 +321,13 @@ class ChronosTransformer(BaseTransformer):
         return [{'key': 'entrypoint', 'value': entrypoint}]
 
     def ingest_volumes_from(self, volumes_from):
-        return volumes_from
+        return [parse_volumes_from(vol) for vol in volumes_from]
 
     def emit_volumes_from(self, volumes_from):
-        return [{'key': 'volumes-from', 'value': vol} for vol in volumes_from]
+        return [
+            {'key': 'volumes-from', 'value': format_volumes_from(vol)}
+            for vol in volumes_from
+        ]
 
     def _convert_volume(self, volume):
         """
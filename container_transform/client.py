@@ -1,13 +1,124 @@
+import os
+import sys
+
 import click
 
 from .converter import Converter
+from .hashing import NAMED_FORMATS
+from .interpolation import load_environment
+from .json_backends import JSON_BACKENDS, JSON_FORMATS
+from .kubernetes import WORKLOAD_API_VERSIONS
+from .output import COMPRESSION_TYPES, atomic_open, dumps, write_atomic
 from .schema import InputTransformationTypes, OutputTransformationTypes
 from .version import __version__
+from .watch import Watcher
 
 
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 
 
+def _input_options(input_file, input_type, interpolate, env_file):
+    """
+    Build the ``Converter`` input_options from the CLI options
+    """
+    if not (interpolate or env_file):
+        return {}
+    if input_type != InputTransformationTypes.COMPOSE.value:
+        raise click.BadOptionUsage('interpolate', '--interpolate requires compose input')
+    return {
+        'environment': load_environment(
+            env_file,
+            os.path.dirname(os.path.abspath(input_file))
+        )
+    }
+
+
+def _output_options(output_type, kind, api_version, split, schedule):
+    """
+    Build the ``Converter`` output_options from the CLI options
+    """
+    if schedule:
+        if output_type != OutputTransformationTypes.CHRONOS.value:
+            raise click.BadOptionUsage('schedule', '--schedule requires chronos output')
+        return {'schedule': schedule}
+    if not (kind or api_version or split):
+        return {}
+    if output_type != OutputTransformationTypes.KUBERNETES.value:
+        raise click.BadOptionUsage(
+            'kind', '--kind, --api-version and --split require kubernetes output')
+    return dict(kind=kind or 'Deployment', api_version=api_version, split=split)
+
+
+def _check_incremental(workers, batch, dedup, manifest):
+    """
+    Reject the options that incremental conversion, with ``--dedup`` or
+    ``--manifest``, doesn't use
+    """
+    if not (dedup or manifest):
+        return
+    if workers > 1:
+        raise click.BadOptionUsage('workers', "--workers can't be used with --dedup or --manifest")
+    if batch:
+        raise click.BadOptionUsage('batch', "--batch can't be used with --dedup or --manifest")
+
+
+def _add_option(options, format_type, formats, name, value):
+    """
+    Set an option in the ``Converter`` options of the formats that support it
+    """
+    if value and format_type in formats:
+        options[name] = value
+
+
+def _write_stream(converter, stream, verbose, compress):
+    """
+    Convert and write the output to a binary stream. Uncompressed output ends
+    with a newline, like ``click.echo`` writes it to a terminal.
+    """
+    converter.write(stream, verbose, compress)
+    if not compress:
+        stream.write(b'\n')
+        stream.flush()
+
+
+def _write_output(converter, output_file, verbose, compress):
+    """
+    Convert and write the output to ``output_file`` or STDOUT
+    """
+    stdout = click.get_text_stream('stdout')
+    if output_file:
+        with atomic_open(output_file) as stream:
+            _write_stream(converter, stream, verbose, compress)
+    elif stdout.isatty() and not compress:
+        output = converter.convert(verbose)
+        click.echo(click.style(output, fg='green'))
+    else:
+        # No colour codes when piping, and write the output as it is encoded
+        _write_stream(converter, click.get_binary_stream('stdout'), verbose, compress)
+
+
+def _echo_cache_stats(cache):
+    click.echo('Reused {} of {} containers'.format(
+        cache.hits, cache.hits + cache.misses
+    ), err=True)
+
+
+def _validate(converter, quiet):
+    """
+    Report schema errors in the input and exit with 1 if there are any
+    """
+    errors = converter.validate()
+    for error in errors:
+        click.echo(click.style(
+            'Container {}: "{}" {}'.format(*error), fg='red', bold=True
+        ), err=True)
+    if not quiet:
+        for message in converter.messages:
+            click.echo(click.style(message, fg='red', bold=True), err=True)
+    if errors:
+        sys.exit(1)
+
+
 @click.command(context_settings=CONTEXT_SETTINGS)
 @click.argument(
     'input_file',
@@ -31,6 +142,63 @@ CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
     type=click.Choice([v.value.lower() for v in list(OutputTransformationTypes)]),
     default=OutputTransformationTypes.ECS.value,
 )
+@click.option(
+    '-f',
+    '--override',
+    'overrides',
+    envvar='CT_OVERRIDE',
+    multiple=True,
+    type=click.Path(exists=True, file_okay=True, dir_okay=False),
+    help='A compose file to merge over INPUT_FILE, may be repeated'
+)
+@click.option(
+    '--interpolate',
+    envvar='CT_INTERPOLATE',
+    default=False,
+    is_flag=True,
+    help='Substitute environment variables in compose input'
+)
+@click.option(
+    '--env-file',
+    'env_file',
+    envvar='CT_ENV_FILE',
+    type=click.Path(exists=True, file_okay=True, dir_okay=False),
+    help='Variables to interpolate, instead of the .env next to INPUT_FILE. Implies '
+         '--interpolate'
+)
+@click.option(
+    '--kind',
+    envvar='CT_KIND',
+    type=click.Choice(sorted(WORKLOAD_API_VERSIONS)),
+    help='Kubernetes workload kind to output. Defaults to Deployment'
+)
+@click.option(
+    '--api-version',
+    'api_version',
+    envvar='CT_API_VERSION',
+    help='Kubernetes apiVersion to output, such as apps/v1'
+)
+@click.option(
+    '--split',
+    envvar='CT_SPLIT',
+    default=False,
+    is_flag=True,
+    help='Output one Kubernetes workload per container instead of one pod'
+)
+@click.option(
+    '--validate-only',
+    'validate_only',
+    envvar='CT_VALIDATE_ONLY',
+    default=False,
+    is_flag=True,
+    help='Check INPUT_FILE against the schema without converting it. Exits '
+         'with 1 if there are errors'
+)
+@click.option(
+    '--schedule',
+    envvar='CT_SCHEDULE',
+    help='ISO 8601 schedule of Chronos jobs. Defaults to hourly from now'
+)
 @click.option(
     '-v/--no-verbose',
     '--verbose',
@@ -47,8 +215,78 @@ CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
     is_flag=True,
     help='Silence error messages'
 )
+@click.option(
+    '-O',
+    '--output',
+    'output_file',
+    envvar='CT_OUTPUT',
+    type=click.Path(dir_okay=False, writable=True),
+    help='Write the output to a file instead of STDOUT'
+)
+@click.option(
+    '--compress',
+    envvar='CT_COMPRESS',
+    type=click.Choice(COMPRESSION_TYPES),
+    help='Write compressed output'
+)
+@click.option(
+    '--workers',
+    envvar='CT_WORKERS',
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of processes to convert containers with. Can't be used with "
+         "--dedup or --manifest"
+)
+@click.option(
+    '--hashes',
+    'hashes_file',
+    envvar='CT_HASHES',
+    type=click.Path(dir_okay=False, writable=True),
+    help='Write content hashes of each container and the whole output to this file'
+)
+@click.option(
+    '--dedup',
+    envvar='CT_DEDUP',
+    default=False,
+    is_flag=True,
+    help='Convert identical container definitions once'
+)
+@click.option(
+    '--batch',
+    envvar='CT_BATCH',
+    default=False,
+    is_flag=True,
+    help="Convert cpu and memory of all containers at once, faster for large "
+         "inputs. Can't be used with --dedup or --manifest"
+)
+@click.option(
+    '--random-names',
+    'random_names',
+    envvar='CT_RANDOM_NAMES',
+    default=False,
+    is_flag=True,
+    help='Name containers and volumes without a name randomly, instead of '
+         'after their content'
+)
+@click.option(
+    '--json-backend',
+    'json_backend',
+    envvar='CT_JSON_BACKEND',
+    type=click.Choice(JSON_BACKENDS),
+    help='Library to read and write ECS, Marathon and Chronos JSON with. auto '
+         'uses orjson if it is installed. Defaults to json'
+)
+@click.option(
+    '--manifest',
+    envvar='CT_MANIFEST',
+    type=click.Path(dir_okay=False),
+    help='Only reconvert containers that changed since the run recorded in this file'
+)
 @click.version_option(__version__)
-def transform(input_file, input_type, output_type, verbose, quiet):
+def transform(input_file, input_type, output_type, overrides, interpolate, env_file,
+              validate_only, kind, api_version, split, schedule, verbose, quiet, output_file,
+              compress, workers, hashes_file, dedup, batch, random_names, json_backend,
+              manifest):
     """
     container-transform is a small utility to transform various docker
     container formats to one another.
@@ -60,11 +298,163 @@ def transform(input_file, input_type, output_type, verbose, quiet):
     All options may be set by environment variables with the prefix "CT_"
     followed by the full argument name.
     """
-    converter = Converter(input_file, input_type, output_type)
-    output = converter.convert(verbose)
+    input_options = _input_options(input_file, input_type, interpolate, env_file)
+    output_options = _output_options(output_type, kind, api_version, split, schedule)
+    _check_incremental(workers, batch, dedup, manifest)
+    for options, format_type in ((input_options, input_type), (output_options, output_type)):
+        _add_option(options, format_type, JSON_FORMATS, 'json_backend', json_backend)
+        _add_option(options, format_type, NAMED_FORMATS, 'random_names', random_names)
+
+    if overrides:
+        if input_type != InputTransformationTypes.COMPOSE.value:
+            raise click.BadOptionUsage('overrides', '--override requires compose input')
+        input_file = [input_file] + list(overrides)
+
+    converter = Converter(
+        input_file,
+        input_type,
+        output_type,
+        workers=workers,
+        batch=batch,
+        hashes=bool(hashes_file),
+        dedup=dedup,
+        manifest=manifest,
+        input_options=input_options,
+        output_options=output_options
+    )
+    if validate_only:
+        _validate(converter, quiet)
+        return
 
-    click.echo(click.style(output, fg='green'))
+    _write_output(converter, output_file, verbose, compress)
+
+    if hashes_file:
+        write_atomic(hashes_file, dumps({
+            'document': converter.document_hash,
+            'containers': converter.container_hashes,
+        }))
 
     if not quiet:
         for message in converter.messages:
             click.echo(click.style(message, fg='red', bold=True), err=True)
+        if converter.cache is not None:
+            _echo_cache_stats(converter.cache)
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument(
+    'paths',
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, file_okay=True, dir_okay=True),
+)
+@click.option(
+    '-i',
+    '--input-type',
+    'input_type',
+    envvar='CT_INPUT_TYPE',
+    type=click.Choice([v.value.lower() for v in list(InputTransformationTypes)]),
+    default=InputTransformationTypes.COMPOSE.value,
+)
+@click.option(
+    '-o',
+    '--output-type',
+    'output_type',
+    envvar='CT_OUTPUT_TYPE',
+    type=click.Choice([v.value.lower() for v in list(OutputTransformationTypes)]),
+    default=OutputTransformationTypes.ECS.value,
+)
+@click.option(
+    '-v/--no-verbose',
+    '--verbose',
+    'verbose',
+    envvar='CT_VERBOSE',
+    default=True,
+    help='Expand/minify json output'
+)
+@click.option(
+    '-q',
+    '--quiet',
+    envvar='CT_QUIET',
+    default=False,
+    is_flag=True,
+    help='Silence error messages'
+)
+@click.option(
+    '-d',
+    '--output-dir',
+    envvar='CT_OUTPUT_DIR',
+    type=click.Path(exists=True, file_okay=False, dir_okay=True),
+    help='Directory to write outputs to. Defaults to next to each input'
+)
+@click.option(
+    '--interval',
+    envvar='CT_INTERVAL',
+    default=1.0,
+    type=float,
+    help='Seconds between checks for changes'
+)
+@click.option(
+    '--debounce',
+    envvar='CT_DEBOUNCE',
+    default=0.2,
+    type=float,
+    help='Seconds a changed file must be left alone before it is converted'
+)
+@click.option(
+    '--dedup',
+    envvar='CT_DEDUP',
+    default=False,
+    is_flag=True,
+    help='Convert identical container definitions once across all files'
+)
+def watch(paths, input_type, output_type, verbose, quiet, output_dir, interval, debounce,
+          dedup):
+    """
+    Watch files and directories and convert inputs whenever they change.
+
+    Directories are searched for files with the input type's extension.
+    Outputs are named after each input with the output type's extension.
+    """
+    watcher = Watcher(
+        paths,
+        input_type,
+        output_type,
+        output_dir=output_dir,
+        verbose=verbose,
+        interval=interval,
+        debounce=debounce,
+        dedup=dedup
+    )
+    try:
+        while True:
+            for filename in watcher.poll():
+                try:
+                    output_file, elapsed, messages = watcher.convert(filename)
+                except Exception as e:
+                    click.echo(click.style(
+                        'Failed to convert {}: {}'.format(filename, e), fg='red', bold=True
+                    ), err=True)
+                    continue
+                click.echo('Converted {} to {} in {:.1f} ms'.format(
+                    filename, output_file, elapsed * 1000
+                ), err=True)
+                if not quiet:
+                    for message in messages:
+                        click.echo(click.style(message, fg='red', bold=True), err=True)
+                    if watcher.cache is not None:
+                        _echo_cache_stats(watcher.cache)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(args=None):
+    """
+    The ``container-transform`` entry point. ``container-transform watch``
+    runs the :func:`watch` command, anything else is passed to
+    :func:`transform`.
+    """
+    args = sys.argv[1:] if args is None else list(args)
+    if args and args[0] == 'watch':
+        return watch.main(args[1:], prog_name='container-transform watch')
+    return transform.main(args, prog_name='container-transform')
@@ -1,9 +1,14 @@
-import uuid
 from functools import reduce
 
 import yaml
 
-from .transformer import BaseTransformer
+from .compose_resolver import ComposeResolver
+from .interpolation import Interpolator
+from .transformer import (
+    BaseTransformer, format_port_range, format_volumes_from, passthrough,
+    port_range_fields
+)
+from .views import ContainerView
 
 
 class ComposeTransformer(BaseTransformer):
@@ -18,17 +23,37 @@ class ComposeTransformer(BaseTransformer):
         normalized_keys = transformer.ingest_containers()
 
     """
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, environment=None, random_names=False):
         """
         We override ``.__init__()`` on purpose, we need to get the volume,
         version, network, and possibly other data.
 
-        :param filename: The file to be loaded
-        :type filename: str
+        :param filename: The file to be loaded, or a list of files that are
+            merged in order, like ``docker-compose -f a.yml -f b.yml``.
+            ``extends`` is resolved across files
+        :type filename: str or list of str
+        :param environment: Variables to interpolate into the services, like
+            docker-compose does. Services are not interpolated if this is None
+        :type environment: dict
+        :param random_names: Name emitted services without a name randomly,
+            instead of after their content
+        :type random_names: bool
         """
+        self.random_names = random_names
+        self.messages = set()
+        if environment is not None:
+            self._interpolator = Interpolator(environment)
+            self.messages = self._interpolator.messages
+        else:
+            self._interpolator = None
+
         if filename:
             self._filename = filename
-            stream = self._read_file(filename)
+            if isinstance(filename, (list, tuple)):
+                filenames = list(filename)
+            else:
+                filenames = [filename]
+            stream = ComposeResolver(self._read_file).resolve(filenames)
             self.stream_version = float(stream.get('version', '1'))
 
             if self.stream_version > 1:
@@ -43,31 +68,26 @@ class ComposeTransformer(BaseTransformer):
     def _read_stream(self, stream):
         return yaml.safe_load(stream=stream)
 
-    def ingest_containers(self, containers=None):
+    def _raw_containers(self, containers):
         """
-        Transform the YAML into a dict with normalized keys
+        The services of the YAML, as (name, definition) pairs
         """
-        containers = containers or self.stream or {}
+        return list(containers.items())
 
-        output_containers = []
-
-        for container_name, definition in containers.items():
-            container = definition.copy()
-            container['name'] = container_name
-            output_containers.append(container)
-
-        return output_containers
+    def _ingest_container(self, container):
+        """
+        Transform a service into a dict with normalized keys
+        """
+        container_name, definition = container
+        if self._interpolator is not None:
+            definition = self._interpolator.interpolate(definition)
+        return ContainerView(definition, {'name': container_name})
 
     def emit_containers(self, containers, verbose=True):
 
         services = {}
-        for container in containers:
-            name_in_container = container.get('name')
-            if not name_in_container:
-                name = str(uuid.uuid4())
-            else:
-                name = container.pop('name')
-            services[name] = container
+        for container in self._name_containers(containers):
+            services[container.pop('name')] = container
 
         output = {
             'services': services,
@@ -96,34 +116,24 @@ class ComposeTransformer(BaseTransformer):
         mapping = str(mapping).rstrip('/udp')
         parts = str(mapping).split(':')
         if len(parts) == 1:
-            output.update({
-                'container_port': int(parts[0])
-            })
+            output.update(port_range_fields('container', parts[0]))
         elif len(parts) == 2 and '.' not in mapping:
-            output.update({
-                'host_port': int(parts[0]),
-                'container_port': int(parts[1]),
-            })
+            output.update(port_range_fields('host', parts[0]))
+            output.update(port_range_fields('container', parts[1]))
         elif len(parts) == 3:
             if '.' in parts[0]:
-                output.update({
-                    'host_ip': parts[0],
-                    'host_port': int(parts[1]),
-                    'container_port': int(parts[2]),
-                })
+                output['host_ip'] = parts[0]
+                output.update(port_range_fields('host', parts[1]))
+                output.update(port_range_fields('container', parts[2]))
             else:
-                output.update({
-                    'host_port': int(parts[0]),
-                    'container_ip': parts[1],
-                    'container_port': int(parts[2]),
-                })
+                output.update(port_range_fields('host', parts[0]))
+                output['container_ip'] = parts[1]
+                output.update(port_range_fields('container', parts[2]))
         elif len(parts) == 4:
-            output.update({
-                'host_ip': parts[0],
-                'host_port': int(parts[1]),
-                'container_ip': parts[2],
-                'container_port': int(parts[3]),
-            })
+            output['host_ip'] = parts[0]
+            output.update(port_range_fields('host', parts[1]))
+            output['container_ip'] = parts[2]
+            output.update(port_range_fields('container', parts[3]))
         return output if len(output) >= 2 else None
 
     def ingest_port_mappings(self, port_mappings):
@@ -143,11 +153,14 @@ class ComposeTransformer(BaseTransformer):
         if mapping.get('host_ip'):
             parts.append(str(mapping['host_ip']))
         if mapping.get('host_port'):
-            parts.append(str(mapping['host_port']))
+            parts.append(format_port_range(mapping['host_port'], mapping.get('host_port_end')))
         if mapping.get('container_ip'):
             parts.append(str(mapping['container_ip']))
         if mapping.get('container_port'):
-            parts.append(str(mapping['container_port']))
+            parts.append(format_port_range(
+                mapping['container_port'],
+                mapping.get('container_port_end')
+            ))
         output = ':'.join(parts)
         if mapping.get('protocol') == 'udp':
             output += '/udp'
@@ -194,29 +207,35 @@ class ComposeTransformer(BaseTransformer):
     def emit_memory(self, memory):
         return '{}b'.format(memory)
 
+    @passthrough
     def ingest_cpu(self, cpu):
         return cpu
 
+    @passthrough
     def emit_cpu(self, cpu):
         return cpu
 
     def ingest_environment(self, environment):
+        # ``$$`` has already been unescaped if the services were interpolated
+        escape = '$' if self._interpolator is not None else '$$'
         output = {}
         if type(environment) is list:
             for kv in environment:
                 index = kv.find('=')
-                output[str(kv[:index])] = str(kv[index + 1:]).replace('$$', '$')
+                output[str(kv[:index])] = str(kv[index + 1:]).replace(escape, '$')
         if type(environment) is dict:
             for key, value in environment.items():
-                output[str(key)] = str(value).replace('$$', '$')
+                output[str(key)] = str(value).replace(escape, '$')
         return output
 
     def emit_environment(self, environment):
         # Use double-dollar and avoid vairable substitution. Reference,
         # https://docs.docker.com/compose/compose-file/compose-file-v2
-        for key, value in environment.items():
-            environment[key] = str(value).replace('$', '$$')
-        return environment
+        return {
+            key: str(value).replace('$', '$$')
+            for key, value
+            in environment.items()
+        }
 
     def ingest_command(self, command):
         if isinstance(command, list):
@@ -224,7 +243,8 @@ class ComposeTransformer(BaseTransformer):
         return command
 
     def emit_command(self, command):
-        return command
+        # A plain str, the YAML dumper doesn't represent CommandLine
+        return str(command)
 
     def ingest_entrypoint(self, entrypoint):
         if isinstance(entrypoint, list):
@@ -232,7 +252,7 @@ class ComposeTransformer(BaseTransformer):
         return entrypoint
 
     def emit_entrypoint(self, entrypoint):
-        return entrypoint
+        return str(entrypoint)
 
     def ingest_volumes_from(self, volumes_from):
         ingested_volumes_from = []
@@ -268,7 +288,7 @@ class ComposeTransformer(BaseTransformer):
         return ingested_volumes_from
 
     def emit_volumes_from(self, volumes_from):
-        return volumes_from
+        return [format_volumes_from(vol) for vol in volumes_from]
 
     @staticmethod
     def _ingest_volume(volume):
@@ -344,17 +364,22 @@ class ComposeTransformer(BaseTransformer):
             )
         return labels
 
+    @passthrough
     def emit_labels(self, labels):
         return labels
 
+    @passthrough
     def ingest_logging(self, logging):
         return logging
 
+    @passthrough
     def emit_logging(self, logging):
         return logging
 
+    @passthrough
     def ingest_privileged(self, privileged):
         return privileged
 
+    @passthrough
     def emit_privileged(self, privileged):
         return privileged
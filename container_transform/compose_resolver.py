@@ -0,0 +1,216 @@
+import os
+from copy import deepcopy
+
+# Options whose values are concatenated when a service is overridden
+CONCATENATED_OPTIONS = ('ports', 'expose', 'external_links', 'dns', 'dns_search', 'tmpfs')
+
+# Options that are merged by key, with the overriding value taking precedence
+KEYED_OPTIONS = ('environment', 'labels')
+
+# Options that are merged by the path they are mounted at in the container
+MOUNT_OPTIONS = ('volumes', 'devices')
+
+# Options a service never inherits through ``extends``
+UNINHERITED_OPTIONS = ('links', 'volumes_from', 'depends_on')
+
+
+def _as_list(value):
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def _as_dict(value):
+    """
+    Turn a list of 'KEY=VALUE' strings into a dict
+    """
+    if isinstance(value, dict):
+        return value
+    output = {}
+    for item in value:
+        key, _, val = str(item).partition('=')
+        output[key] = val
+    return output
+
+
+def _mount_path(mount):
+    if isinstance(mount, dict):
+        return mount.get('target')
+    parts = str(mount).split(':')
+    return parts[1] if len(parts) > 1 else parts[0]
+
+
+def merge_service(base, override):
+    """
+    Merge two definitions of a service with docker-compose semantics:
+    single values are replaced, options like ``ports`` are concatenated,
+    ``environment`` and ``labels`` are merged by key and ``volumes`` and
+    ``devices`` are merged by their container path.
+
+    Neither argument is modified.
+
+    :param base: The service definition being overridden
+    :type base: dict
+    :param override: The overriding service definition
+    :type override: dict
+    :rtype: dict
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        if key not in base or value is None or base[key] is None:
+            merged[key] = value
+        elif key in CONCATENATED_OPTIONS:
+            merged[key] = _as_list(base[key]) + _as_list(value)
+        elif key in KEYED_OPTIONS:
+            merged[key] = dict(_as_dict(base[key]))
+            merged[key].update(_as_dict(value))
+        elif key in MOUNT_OPTIONS:
+            mounts = dict((_mount_path(m), m) for m in base[key])
+            mounts.update((_mount_path(m), m) for m in value)
+            merged[key] = list(mounts.values())
+        else:
+            merged[key] = value
+    return merged
+
+
+class ComposeResolver(object):
+    """
+    Load a set of compose files, resolve ``extends`` (within and across
+    files) and merge the files in order, as ``docker-compose -f a.yml -f
+    b.yml`` does.
+
+    Parsed files and resolved services are cached, so many services extending
+    the same base file only read and parse it once.
+
+    To use this class:
+
+    .. code-block:: python
+
+        resolver = ComposeResolver(load_yaml_file)
+        document = resolver.resolve(['docker-compose.yml', 'docker-compose.prod.yml'])
+
+    """
+
+    def __init__(self, loader):
+        """
+        :param loader: A function that takes a filename (or open file) and
+            returns the parsed YAML document
+        :type loader: callable
+        """
+        self._loader = loader
+        self._files = {}
+        self._services = {}
+
+    @staticmethod
+    def _key(filename):
+        if isinstance(filename, str):
+            return os.path.abspath(filename)
+        return filename
+
+    def _load(self, filename):
+        key = self._key(filename)
+        if key not in self._files:
+            self._files[key] = self._loader(filename) or {}
+        return self._files[key]
+
+    @staticmethod
+    def _version(document):
+        return float(document.get('version', '1'))
+
+    def _definitions(self, filename):
+        document = self._load(filename)
+        if self._version(document) > 1:
+            return document.get('services') or {}
+        return document
+
+    def service(self, filename, name, _seen=()):
+        """
+        Return a service definition with its ``extends`` chain resolved
+
+        :param filename: The file the service is defined in
+        :type filename: str
+        :param name: The service name
+        :type name: str
+        :rtype: dict
+        """
+        key = (self._key(filename), name)
+        if key in _seen:
+            raise ValueError('Circular extends for service "{}" in {}'.format(name, filename))
+        if key in self._services:
+            return self._services[key]
+
+        definitions = self._definitions(filename)
+        if name not in definitions:
+            raise ValueError('Service "{}" is not defined in {}'.format(name, filename))
+        definition = definitions[name] or {}
+
+        extends = definition.get('extends')
+        if extends:
+            if not isinstance(extends, dict):
+                extends = {'service': extends}
+            base_file = filename
+            if extends.get('file'):
+                directory = os.getcwd()
+                if isinstance(filename, str):
+                    directory = os.path.dirname(os.path.abspath(filename))
+                base_file = os.path.join(directory, extends['file'])
+
+            base = deepcopy(self.service(base_file, extends['service'], _seen + (key,)))
+            for option in UNINHERITED_OPTIONS:
+                base.pop(option, None)
+
+            definition = dict(definition)
+            del definition['extends']
+            definition = merge_service(base, definition)
+
+        self._services[key] = definition
+        return definition
+
+    def _has_extends(self, filename):
+        return any(
+            isinstance(definition, dict) and definition.get('extends')
+            for definition
+            in self._definitions(filename).values()
+        )
+
+    def _resolved_definitions(self, filename):
+        if not self._has_extends(filename):
+            return self._definitions(filename)
+        return dict(
+            (name, self.service(filename, name))
+            for name
+            in self._definitions(filename)
+        )
+
+    def resolve(self, filenames):
+        """
+        Load, resolve and merge compose files. The result has the layout of
+        the first file: a mapping of services for version 1 files, otherwise
+        a document with ``version``, ``services`` and any ``volumes`` and
+        ``networks``.
+
+        :param filenames: The compose files, later files override earlier ones
+        :type filenames: list of str
+        :rtype: dict
+        """
+        first = self._load(filenames[0])
+        if len(filenames) == 1 and not self._has_extends(filenames[0]):
+            # Nothing to resolve, use the document as it is
+            return first
+
+        services = {}
+        top_level = {}
+        for filename in filenames:
+            for name, definition in self._resolved_definitions(filename).items():
+                if name in services:
+                    definition = merge_service(services[name], definition)
+                services[name] = definition
+            document = self._load(filename)
+            if self._version(document) > 1:
+                for option in ('volumes', 'networks'):
+                    if document.get(option):
+                        top_level.setdefault(option, {}).update(document[option])
+
+        if self._version(first) > 1:
+            return dict(top_level, version=first['version'], services=services)
+        return services
@@ -1,4 +1,17 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy, deepcopy
+from functools import lru_cache
+from itertools import repeat
+
+from .batch import convert_columns
+from .cache import ConversionCache
+from .hashing import container_hash, document_hash
+from .interning import INTERNED_PARAMETERS, Interner
+from .manifest import Manifest
+from .output import write_chunks
 from .schema import TransformationTypes, ARG_MAP
+from .validation import validate_containers
 
 from .compose import ComposeTransformer
 from .ecs import ECSTransformer
@@ -18,9 +31,88 @@ TRANSFORMER_CLASSES = {
 }
 
 
+PlanStep = namedtuple(
+    'PlanStep',
+    ['parameter', 'input_name', 'output_name', 'output_required', 'ingest', 'emit', 'copy']
+)
+
+
+def _is_passthrough(transformer_class, method):
+    return getattr(getattr(transformer_class, method), 'passthrough', False)
+
+
+@lru_cache(maxsize=None)
+def compile_plan(input_type, output_type, fast_path=True):
+    """
+    Work out which ``ARG_MAP`` parameters are converted between two formats.
+
+    This only depends on the formats, so it is done once per pair instead of
+    for every container. ``ingest`` and ``emit`` are the transformer method
+    names, or None if the parameter can't be converted.
+
+    When converting a format to itself, ``copy`` is set for parameters whose
+    ingest and emit methods are both marked as
+    :func:`passthrough<container_transform.transformer.passthrough>`, and the
+    value is copied over as is.
+
+    :rtype: tuple of PlanStep
+    """
+    input_class = TRANSFORMER_CLASSES.get(input_type)
+    output_class = TRANSFORMER_CLASSES.get(output_type)
+
+    plan = []
+    for parameter, options in ARG_MAP.items():
+        output_name = options.get(output_type, {}).get('name')
+        output_required = options.get(output_type, {}).get('required')
+
+        input_name = options.get(input_type, {}).get('name')
+
+        ingest = 'ingest_{}'.format(parameter)
+        emit = 'emit_{}'.format(parameter)
+        if not (hasattr(input_class, ingest) and output_name and hasattr(output_class, emit)):
+            ingest, emit = None, None
+
+        copy_value = bool(
+            fast_path and
+            ingest and
+            input_type == output_type and
+            _is_passthrough(input_class, ingest) and
+            _is_passthrough(output_class, emit)
+        )
+
+        plan.append(PlanStep(
+            parameter, input_name, output_name, output_required, ingest, emit, copy_value
+        ))
+    return tuple(plan)
+
+
+def _convert_chunk(converter, input_transformer, output_transformer, containers):
+    """
+    Convert a chunk of containers in a worker process.
+
+    The validated containers are returned as plain dicts, since some
+    ``validate()`` methods return a ``defaultdict`` that can't be pickled.
+
+    :rtype: tuple
+    :returns: Converted containers, messages, output transformer state
+    """
+    output_containers = converter._convert_containers(
+        containers,
+        input_transformer,
+        output_transformer
+    )
+    return (
+        [dict(container) for container in output_containers],
+        converter.messages,
+        output_transformer.export_state(),
+    )
+
+
 class Converter(object):
 
-    def __init__(self, filename, input_type, output_type):
+    def __init__(self, filename, input_type, output_type, workers=None, chunk_size=None,
+                 manifest=None, input_options=None, output_options=None, batch=False,
+                 hashes=False, dedup=None):
         """
         :param filename: The file to be loaded
         :type filename: str
@@ -28,6 +120,35 @@ class Converter(object):
         :type input_type: str
         :param output_type: The output class for the transformer
         :type output_type: str
+        :param workers: The number of processes to convert containers with.
+            Containers are converted in the current process if this is not
+            greater than 1, or with a manifest or dedup
+        :type workers: int
+        :param chunk_size: The number of containers sent to a worker at a time.
+            Defaults to an even split across the workers
+        :type chunk_size: int
+        :param manifest: A manifest of a previous conversion, or its filename.
+            Only containers that changed since then are converted, and the
+            manifest is updated for the next run
+        :type manifest: container_transform.manifest.Manifest or str
+        :param input_options: Keyword arguments for the input transformer,
+            such as the ``environment`` to interpolate into a compose file
+        :type input_options: dict
+        :param output_options: Keyword arguments for the output transformer,
+            such as the kubernetes workload ``kind``
+        :type output_options: dict
+        :param batch: Convert numeric fields such as cpu and memory for all
+            containers at once, with NumPy when it is installed. Not used with
+            a manifest or dedup
+        :type batch: bool
+        :param hashes: Hash every converted container and the whole output
+            document into ``.container_hashes`` and ``.document_hash``, so
+            callers can tell whether the output changed without comparing it
+        :type hashes: bool
+        :param dedup: Convert identical container definitions once and reuse
+            the result. Pass a ConversionCache to share it across files, or
+            True for one per converter. Not used with a manifest
+        :type dedup: container_transform.cache.ConversionCache or bool
         """
         self._filename = filename
 
@@ -35,68 +156,368 @@ class Converter(object):
         self._input_class = TRANSFORMER_CLASSES.get(input_type)
         self.output_type = output_type
         self._output_class = TRANSFORMER_CLASSES.get(output_type)
+        self.input_options = input_options or {}
+        self.output_options = output_options or {}
+        self.batch = batch
+        self.hashes = hashes
+        self._plan = compile_plan(input_type, output_type)
+
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+        if isinstance(manifest, str):
+            manifest = Manifest(manifest)
+        self.manifest = manifest
+
+        if dedup is True:
+            dedup = ConversionCache()
+        self.cache = dedup or None
 
         self.messages = set()
+        self.interner = Interner()
+        self.container_hashes = {}
+        self.document_hash = None
 
     def convert(self, verbose=True):
         """
         :rtype: tuple
         :returns: Output containers, messages
         """
-        input_transformer = self._input_class(self._filename)
-        output_transformer = self._output_class()
+        output_transformer, output_containers = self._convert()
+        return output_transformer.emit_containers(output_containers, verbose)
+
+    def write(self, stream, verbose=True, compression=None):
+        """
+        Convert and write the output to a binary stream in chunks, without
+        building the whole output as one string where the output format
+        allows it.
+
+        :param stream: A binary file-like object
+        :param verbose: Expand/minify json output
+        :type verbose: bool
+        :param compression: 'gzip', 'lzma' or None
+        :type compression: str
+        """
+        output_transformer, output_containers = self._convert()
+        write_chunks(
+            output_transformer.emit_stream(output_containers, verbose),
+            stream,
+            compression
+        )
+
+    def validate(self):
+        """
+        Check the input containers against the schema without converting
+        them.
+
+        :rtype: list of container_transform.validation.ValidationError
+        """
+        input_transformer = self._input_class(self._filename, **self.input_options)
+        errors = validate_containers(
+            input_transformer.iter_containers(),
+            self.input_type,
+            input_transformer
+        )
+        self.messages.update(getattr(input_transformer, 'messages', ()))
+        return errors
+
+    def _convert(self):
+        """
+        Containers are ingested, converted and validated one at a time, so
+        each raw input container can be freed once it's converted. Only the
+        validated containers are kept, since emitters need all of them.
+
+        :rtype: tuple
+        :returns: The output transformer, validated output containers
+        """
+        input_transformer = self._input_class(self._filename, **self.input_options)
+        output_transformer = self._output_class(**self.output_options)
+
+        containers = input_transformer.iter_containers()
+
+        if self.manifest is not None or self.cache is not None:
+            output_containers = self._convert_incremental(
+                containers,
+                input_transformer,
+                output_transformer
+            )
+        elif self.workers and self.workers > 1:
+            output_containers = self._convert_parallel(
+                containers,
+                input_transformer,
+                output_transformer
+            )
+        else:
+            output_containers = self._convert_containers(
+                containers,
+                input_transformer,
+                output_transformer
+            )
+        # Input transformers add messages as they ingest
+        self.messages.update(getattr(input_transformer, 'messages', ()))
+
+        if self.hashes:
+            self._hash(output_transformer, output_containers)
+
+        return output_transformer, output_containers
+
+    def _hash(self, output_transformer, output_containers):
+        """
+        Hash the validated containers before they are emitted, since some
+        emitters modify them.
 
-        containers = input_transformer.ingest_containers()
+        Containers are keyed by name. A container whose name was already
+        used is keyed by ``name[index]`` instead, so no hash is lost.
+        """
+        volatile = output_transformer.volatile_fields()
+        self.container_hashes = {}
+        for index, container in enumerate(output_containers):
+            name = str(container.get('name') or container.get('id') or index)
+            if name in self.container_hashes:
+                key = '{}[{}]'.format(name, index)
+                self.messages.add(
+                    'Container {} has the same name as another container, its '
+                    'hash is stored as "{}".'.format(name, key)
+                )
+                name = key
+            self.container_hashes[name] = container_hash(container, volatile)
+
+        settings = {
+            key: value
+            for key, value
+            in output_transformer.settings().items()
+            if key not in volatile
+        }
+        settings['type'] = self.output_type
+        self.document_hash = document_hash(
+            list(self.container_hashes.values()),
+            output_transformer.export_state(),
+            settings
+        )
 
+    def _convert_containers(self, containers, input_transformer, output_transformer):
+        """
+        Convert and validate ingested containers
+
+        :type containers: iterable of dict
+        :rtype: list of dict
+        """
         output_containers = []
 
-        for container in containers:
+        columns = {}
+        if self.batch:
+            # Columns need every container at once
+            containers = list(containers)
+            columns = convert_columns(
+                self._plan,
+                containers,
+                self.input_type,
+                self.output_type,
+                input_transformer,
+                output_transformer
+            )
+
+        for index, container in enumerate(containers):
             converted_container = self._convert_container(
                 container,
                 input_transformer,
-                output_transformer
+                output_transformer,
+                {parameter: column[index] for parameter, column in columns.items()}
             )
 
             validated = output_transformer.validate(converted_container)
 
             output_containers.append(validated)
 
-        return output_transformer.emit_containers(output_containers, verbose)
+        return output_containers
+
+    def _convert_incremental(self, containers, input_transformer, output_transformer):
+        """
+        Reuse containers from ``self.manifest``, or ``self.cache``, and only
+        convert the ones that changed or haven't been seen.
+
+        Each changed container is converted with its own copy of the output
+        transformer, so the state and messages it produces can be recorded
+        alongside it.
+
+        Containers are keyed without their name, so identical definitions
+        under different names are converted once: a reused container gets the
+        name of the one it stands for, and the messages that name a container
+        are added for each container.
+
+        :rtype: list of dict
+        """
+        cache = self.manifest if self.manifest is not None else self.cache
+        context = cache.context_key(
+            self.input_type,
+            self.output_type,
+            input_transformer,
+            output_transformer
+        )
+        template = deepcopy(output_transformer)
+        messages = self.messages
+        volatile = output_transformer.volatile_fields()
+        settings = output_transformer.settings()
+
+        output_containers = []
+        for container in containers:
+            key = cache.container_key(container, context)
+            entry = cache.get(key)
+            if entry is None:
+                transformer = deepcopy(template)
+                self.messages = set()
+                validated = transformer.validate(self._convert_container(
+                    container, input_transformer, transformer, check_required=False
+                ))
+                entry = {
+                    'container': validated,
+                    'state': transformer.export_state(),
+                    'messages': self.messages,
+                }
+                cache.put(key, **entry)
+            else:
+                reused = entry['container']
+                if 'name' in container:
+                    reused.update(self._convert_container(
+                        {'name': container['name']},
+                        input_transformer,
+                        output_transformer,
+                        check_required=False
+                    ))
+                # Volatile fields aren't part of the key, so they may be stale
+                reused.update(
+                    (field, settings[field])
+                    for field
+                    in volatile
+                    if field in reused and field in settings
+                )
+
+            output_transformer.merge_state(entry['state'], [entry['container']])
+            output_containers.append(entry['container'])
+            messages.update(entry['messages'])
+            self.messages = messages
+            self._check_required(container)
+
+        self.messages = messages
+        if self.manifest is not None:
+            # Saved before emitting, since some emitters modify the containers
+            self.manifest.save()
+        return output_containers
 
-    def _convert_container(self, container, input_transformer, output_transformer):
+    def _convert_parallel(self, containers, input_transformer, output_transformer):
+        """
+        Split the containers into chunks and convert them in a process pool.
+
+        Chunks are merged back in their original order, and the state each
+        worker's output transformer accumulated is merged into
+        ``output_transformer``, so the result is the same as a sequential
+        conversion.
+
+        :rtype: list of dict
+        """
+        containers = list(containers)
+        chunk_size = self.chunk_size or -(-len(containers) // self.workers)
+        chunks = [
+            containers[i:i + chunk_size]
+            for i
+            in range(0, len(containers), chunk_size)
+        ]
+        if len(chunks) < 2:
+            return self._convert_containers(containers, input_transformer, output_transformer)
+
+        # The workers only need the transformer settings, not the parsed input
+        worker_input_transformer = copy(input_transformer)
+        worker_input_transformer.stream = None
+
+        output_containers = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(
+                _convert_chunk,
+                repeat(self),
+                repeat(worker_input_transformer),
+                repeat(output_transformer),
+                chunks
+            )
+            for converted, messages, state in results:
+                output_transformer.merge_state(state, converted)
+                output_containers.extend(converted)
+                self.messages.update(messages)
+
+        return output_containers
+
+    def _convert_container(self, container, input_transformer, output_transformer,
+                           converted=None, check_required=True):
         """
         Converts a given dictionary to an output container definition
 
         :type container: dict
         :param container: The container definitions as a dictionary
+        :param converted: Values that were already converted in a batch, by
+            parameter
+        :type converted: dict
+        :param check_required: Add a message for each required output
+            parameter the container is missing, see ``._check_required()``
+        :type check_required: bool
 
         :rtype: dict
         :return: A output_type container definition
         """
+        converted = converted or {}
         output = {}
-        for parameter, options in ARG_MAP.items():
-            output_name = options.get(self.output_type, {}).get('name')
-            output_required = options.get(self.output_type, {}).get('required')
+        for step in self._plan:
+            value = container.get(step.input_name)
 
-            input_name = options.get(self.input_type, {}).get('name')
+            if value and step.parameter in converted:
+                output[step.output_name] = converted[step.parameter]
+            elif value and step.copy:
+                output[step.output_name] = value
+            elif value and step.ingest:
+                ingest_func = getattr(input_transformer, step.ingest)
+                emit_func = getattr(output_transformer, step.emit)
 
-            if container.get(input_name) and \
-                    hasattr(input_transformer, 'ingest_{}'.format(parameter)) and \
-                    output_name and hasattr(output_transformer, 'emit_{}'.format(parameter)):
-                # call transform_{}
-                ingest_func = getattr(input_transformer, 'ingest_{}'.format(parameter))
-                emit_func = getattr(output_transformer, 'emit_{}'.format(parameter))
+                ingested = ingest_func(value)
+                if step.parameter in INTERNED_PARAMETERS:
+                    # Containers with the same environment or labels share them
+                    ingested = self.interner.map(ingested)
+                if step.parameter == 'volumes':
+                    self._check_volume_types(ingested, output_transformer)
+                output[step.output_name] = emit_func(ingested)
 
-                output[output_name] = emit_func(ingest_func(container.get(input_name)))
+        if check_required:
+            self._check_required(container)
 
-            if not container.get(input_name) and output_required:
+        return output
+
+    def _check_volume_types(self, volumes, output_transformer):
+        """
+        Add a message for each volume of a type the output format doesn't
+        support, which is mounted as an anonymous volume instead
+
+        :type volumes: list of dict
+        """
+        for volume in volumes or ():
+            if volume.get('type') and volume['type'] not in output_transformer.volume_types:
+                self.messages.add(
+                    'Volume "{}" of type {} is not supported by {} output and is mounted '
+                    'as an anonymous volume.'.format(
+                        volume.get('volume'), volume['type'], self.output_type
+                    )
+                )
+
+    def _check_required(self, container):
+        """
+        Add a message for each required output parameter the container is
+        missing
+
+        :type container: dict
+        """
+        for step in self._plan:
+            if step.output_required and not container.get(step.input_name):
                 msg_template = 'Container {name} is missing required parameter "{output_name}".'
                 self.messages.add(
                     msg_template.format(
-                        output_name=output_name,
+                        output_name=step.output_name,
                         output_type=self.output_type,
                         name=container.get('name', container)
                     )
                 )
-
-        return output
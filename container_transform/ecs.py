@@ -1,10 +1,9 @@
-import json
-import uuid
 from copy import copy
-import shlex
 
+from .input import load_json
+from .json_backends import get_backend
 from .schema import TransformationTypes
-from .transformer import BaseTransformer
+from .transformer import BaseTransformer, expand_port_mappings, passthrough
 
 
 class ECSTransformer(BaseTransformer):
@@ -22,13 +21,21 @@ class ECSTransformer(BaseTransformer):
     """
     input_type = TransformationTypes.COMPOSE.value
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, json_backend=None, random_names=False):
         """
         We override ``.__init__()`` on purpose, we need to get the volume data.
 
         :param filename: The file to be loaded
         :type filename: str
+        :param json_backend: The JSON backend to read and write with, see
+            :func:`container_transform.json_backends.get_backend`
+        :type json_backend: str
+        :param random_names: Name containers and volumes without a name or
+            source path randomly, instead of after their content
+        :type random_names: bool
         """
+        self._json = get_backend(json_backend)
+        self.random_names = random_names
         family, stream, volumes_in = '', None, []
         if filename:
             self._filename = filename
@@ -52,21 +59,21 @@ class ECSTransformer(BaseTransformer):
         :rtype: tuple of (str, list of dict, list of dict)
 
         """
-        contents = json.load(stream)
+        contents = load_json(stream, self._json)
 
         family, containers, volumes = '', contents, []
 
         if isinstance(contents, dict) and 'containerDefinitions' in contents.keys():
             family = contents.get('family', None)
             containers = contents.get('containerDefinitions', [])
-            volumes = self.ingest_volumes_param(contents.get('volumes', []))
+            volumes = self.ingest_volumes_param(
+                contents.get('volumes', []),
+                family,
+                [container.get('name') for container in containers]
+            )
 
         return family, containers, volumes
 
-    def ingest_containers(self, containers=None):
-        containers = containers or self.stream or {}
-        return containers
-
     def add_volume(self, volume):
         """
         Add a volume to self.volumes if it isn't already present
@@ -76,6 +83,21 @@ class ECSTransformer(BaseTransformer):
                 return
         self.volumes.append(volume)
 
+    def export_state(self):
+        return {'volumes': self.volumes}
+
+    def merge_state(self, state, containers=()):
+        for volume in state.get('volumes', []):
+            self.add_volume(volume)
+
+    def _build_task_definition(self, containers):
+        containers = sorted(self._name_containers(containers), key=lambda c: c.get('name'))
+        return {
+            'family': self.family,
+            'containerDefinitions': containers,
+            'volumes': self.volumes or []
+        }
+
     def emit_containers(self, containers, verbose=True):
         """
         Emits the task definition and sorts containers by name
@@ -83,32 +105,20 @@ class ECSTransformer(BaseTransformer):
         :param containers: List of the container definitions
         :type containers: list of dict
 
-        :param verbose: Print out newlines and indented JSON
+        :param verbose: Print out newlines and indented JSON, otherwise use
+            compact JSON
         :type verbose: bool
 
         :returns: The text output
         :rtype: str
         """
-        containers = sorted(containers, key=lambda c: c.get('name'))
-        task_definition = {
-            'family': self.family,
-            'containerDefinitions': containers,
-            'volumes': self.volumes or []
-        }
-        if verbose:
-            return json.dumps(task_definition, indent=4, sort_keys=True)
-        else:
-            return json.dumps(task_definition)
-
-    @staticmethod
-    def validate(container):
-        container['essential'] = True
+        return self._json.dumps(self._build_task_definition(containers), verbose)
 
-        container_name = container.get('name')
+    def emit_stream(self, containers, verbose=True):
+        return self._json.iterencode(self._build_task_definition(containers), verbose)
 
-        if not container_name:
-            container_name = str(uuid.uuid4())
-            container['name'] = container_name
+    def validate(self, container):
+        container['essential'] = True
         return container
 
     @staticmethod
@@ -151,7 +161,7 @@ class ECSTransformer(BaseTransformer):
         return output
 
     def emit_port_mappings(self, port_mappings):
-        return [self._emit_mapping(mapping) for mapping in port_mappings]
+        return [self._emit_mapping(mapping) for mapping in expand_port_mappings(port_mappings)]
 
     def ingest_memory(self, memory):
         return memory << 20
@@ -163,15 +173,19 @@ class ECSTransformer(BaseTransformer):
             return 4
         return mem_in_mb
 
+    @passthrough
     def ingest_cpu(self, cpu):
         return cpu
 
+    @passthrough
     def emit_cpu(self, cpu):
         return cpu
 
+    @passthrough
     def ingest_privileged(self, privileged):
         return privileged
 
+    @passthrough
     def emit_privileged(self, privileged):
         return privileged
 
@@ -191,31 +205,47 @@ class ECSTransformer(BaseTransformer):
         return self._list2cmdline(command)
 
     def emit_command(self, command):
-        return shlex.split(command)
+        return self._cmdline2list(command)
 
     def ingest_entrypoint(self, entrypoint):
         return self._list2cmdline(entrypoint)
 
     def emit_entrypoint(self, entrypoint):
-        return shlex.split(entrypoint)
+        return self._cmdline2list(entrypoint)
 
     def ingest_volumes_from(self, volumes_from):
-        return [vol['sourceContainer'] for vol in volumes_from]
+        ingested = []
+        for vol in volumes_from:
+            ingested_vol = {'source_container': vol['sourceContainer']}
+            if 'readOnly' in vol:
+                ingested_vol['read_only'] = vol['readOnly']
+            ingested.append(ingested_vol)
+        return ingested
 
     def emit_volumes_from(self, volumes_from):
         emitted = []
         volumes_from = copy(volumes_from)
         for vol in volumes_from:
             emit = {}
-            if vol.get('read_only'):
+            if 'read_only' in vol:
                 emit['readOnly'] = vol['read_only']
             emit['sourceContainer'] = vol['source_container']
             emitted.append(emit)
         return emitted
 
-    def ingest_volumes_param(self, volumes):
+    def ingest_volumes_param(self, volumes, family=None, container_names=()):
         """
-        This is for ingesting the "volumes" of a task description
+        This is for ingesting the "volumes" of a task description. Volumes
+        without a source path get a directory in /tmp named after a hash of
+        the volume, the task family and the names of the task's containers,
+        so tasks with identically defined volumes don't share a directory.
+
+        :param volumes: The task's volumes
+        :type volumes: list of dict
+        :param family: The task family
+        :type family: str
+        :param container_names: The names of the task's containers
+        :type container_names: list of str
         """
         data = {}
 
@@ -227,7 +257,9 @@ class ECSTransformer(BaseTransformer):
                 }
             else:
                 data[volume.get('name')] = {
-                    'path': '/tmp/{}'.format(uuid.uuid4().hex[:8]),
+                    'path': '/tmp/{}'.format(
+                        self._generate_name([family, list(container_names), volume], 8)
+                    ),
                     'readonly': volume.get('readOnly', False)
                 }
         return data
@@ -274,22 +306,25 @@ class ECSTransformer(BaseTransformer):
             if self._build_mountpoint(volume) is not None
         ]
 
+    @passthrough
     def ingest_labels(self, labels):
         return labels
 
+    @passthrough
     def emit_labels(self, labels):
         return labels
 
     def ingest_logging(self, logging):
-        data = logging
+        # Copied, since the input may be converted again
+        data = dict(logging)
         if data.get('logDriver'):  # pragma: no cover
             data['driver'] = data.get('logDriver')
             del data['logDriver']
-        return logging
+        return data
 
     def emit_logging(self, logging):
-        data = logging
+        data = dict(logging)
         if data.get('driver'):  # pragma: no cover
             data['logDriver'] = data.get('driver')
             del data['driver']
-        return logging
+        return data
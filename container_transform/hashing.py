@@ -0,0 +1,85 @@
+import hashlib
+import json
+
+from .schema import TransformationTypes
+
+
+# Formats that name containers or volumes that don't have a name
+NAMED_FORMATS = (
+    TransformationTypes.ECS.value,
+    TransformationTypes.COMPOSE.value,
+    TransformationTypes.MARATHON.value,
+    TransformationTypes.CHRONOS.value,
+)
+
+_encoder = json.JSONEncoder(sort_keys=True, separators=(',', ':'), default=str)
+
+
+def field_hash(key, value):
+    """
+    Hash one field of a container. Nested dicts are hashed independent of
+    their order.
+
+    :rtype: str
+    """
+    text = _encoder.encode([key, value])
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def container_hash(container, volatile=frozenset()):
+    """
+    Hash a converted container one field at a time, in key order, so the
+    hash doesn't depend on the order the fields were added in.
+
+    :param container: A validated output container
+    :type container: dict
+    :param volatile: Fields to leave out
+    :type volatile: frozenset
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    for key in sorted(container, key=str):
+        if key in volatile:
+            continue
+        digest.update(field_hash(key, container[key]).encode('ascii'))
+    return digest.hexdigest()
+
+
+def document_hash(container_hashes, state=None, settings=None):
+    """
+    Hash a whole output document from the hashes of its containers, the
+    output transformer state, such as ECS task volumes, and the output
+    format and settings, such as the Kubernetes workload kind. The order of
+    the containers doesn't matter, since every format sorts them when
+    emitting.
+
+    :param container_hashes: The output of :func:`container_hash` for every
+        container
+    :type container_hashes: list of str
+    :param state: The output of ``.export_state()``
+    :type state: dict
+    :param settings: The output type and the output of ``.settings()``
+    :type settings: dict
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    for value in sorted(container_hashes):
+        digest.update(value.encode('ascii'))
+    digest.update(field_hash('state', state or {}).encode('ascii'))
+    digest.update(field_hash('settings', settings or {}).encode('ascii'))
+    return digest.hexdigest()
+
+
+def content_name(data, length=12):
+    """
+    Name something after a hash of its content, so converting the same input
+    twice gives the same name.
+
+    :param data: A container or volume definition
+    :type data: dict
+    :param length: The number of hex digits to keep
+    :type length: int
+    :rtype: str
+    """
+    text = _encoder.encode(data)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:length]
@@ -0,0 +1,53 @@
+import mmap
+import os
+import stat
+from contextlib import contextmanager
+
+from .json_backends import JSONBackend
+
+
+@contextmanager
+def open_input(filename):
+    """
+    Open an input file for reading as bytes. Regular files are memory-mapped,
+    so parsers read them from the page cache instead of a decoded copy of the
+    whole file. Pipes such as ``/dev/stdin``, empty files and files that can't
+    be mapped are read as a binary stream.
+
+    :param filename: The location of the file to read
+    :type filename: str
+    :rtype: mmap.mmap or file
+    """
+    with open(filename, 'rb') as stream:
+        buf = None
+        info = os.fstat(stream.fileno())
+        if stat.S_ISREG(info.st_mode) and info.st_size:
+            try:
+                buf = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                pass
+
+        if buf is None:
+            yield stream
+        else:
+            with buf:
+                yield buf
+
+
+def load_json(stream, backend=None):
+    """
+    Parse a JSON document from a text or binary file-like object, or a memory
+    map from :func:`open_input`. Memory maps are handed to the parser as a
+    buffer, without reading them into bytes first.
+
+    :param stream: A file-like object or memory map
+    :type stream: file or mmap.mmap
+    :param backend: The JSON backend to parse with. Defaults to the standard
+        library
+    :type backend: container_transform.json_backends.JSONBackend
+    """
+    backend = backend or JSONBackend()
+    if isinstance(stream, mmap.mmap):
+        with memoryview(stream) as view:
+            return backend.loads(view)
+    return backend.loads(stream.read())
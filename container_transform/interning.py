@@ -0,0 +1,102 @@
+import sys
+
+import yaml
+from yaml.representer import SafeRepresenter
+
+
+# Parameters whose ingested maps are shared between containers
+INTERNED_PARAMETERS = ('environment', 'labels')
+
+
+class FrozenDict(dict):
+    """
+    A dict that can't be modified, so one instance can be shared by every
+    container with the same environment or labels. ``.copy()`` returns a
+    plain dict to modify.
+
+    Copies and deep copies return the same instance, since the values are
+    immutable.
+    """
+    __slots__ = ('_hash',)
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('{} is immutable, modify a .copy()'.format(type(self).__name__))
+
+    __setitem__ = __delitem__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+    __ior__ = _immutable
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(frozenset(self.items()))
+            return self._hash
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def copy(self):
+        return dict(self)
+
+
+# Emit shared maps like any other dict
+yaml.add_representer(FrozenDict, SafeRepresenter.represent_dict, Dumper=yaml.SafeDumper)
+
+
+def _intern_value(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class Interner(object):
+    """
+    Keep one shared :class:`FrozenDict` for every distinct map, with its keys
+    and string values interned, so thousands of containers with the same
+    environment hold one copy of it.
+
+    To use this class:
+
+    .. code-block:: python
+
+        interner = Interner()
+        environment = interner.map({'LANG': 'C.UTF-8'})
+
+    """
+
+    def __init__(self):
+        self._maps = {}
+
+    def map(self, mapping):
+        """
+        :param mapping: A map of scalars
+        :type mapping: dict
+        :returns: The shared FrozenDict equal to ``mapping``, or ``mapping``
+            itself if it isn't a dict or has values that can't be shared
+        :rtype: dict
+        """
+        if type(mapping) is FrozenDict or not isinstance(mapping, dict):
+            return mapping
+        try:
+            # Types are part of the key, since 1 == 1.0 == True
+            key = frozenset((k, type(v), v) for k, v in mapping.items())
+        except TypeError:
+            return mapping
+
+        shared = self._maps.get(key)
+        if shared is None:
+            shared = FrozenDict(
+                (_intern_value(k), _intern_value(v))
+                for k, v
+                in mapping.items()
+            )
+            self._maps[key] = shared
+        return shared
+
+    def __len__(self):
+        return len(self._maps)
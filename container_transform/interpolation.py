@@ -0,0 +1,136 @@
+import os
+import re
+
+INTERPOLATION_PATTERN = re.compile(r'''
+    \$(?:
+        (?P<escaped>\$) |
+        (?P<named>[_a-zA-Z][_a-zA-Z0-9]*) |
+        {(?P<braced>[_a-zA-Z][_a-zA-Z0-9]*)(?:(?P<separator>:?[-?])(?P<argument>[^}]*))?} |
+        (?P<invalid>)
+    )
+''', re.VERBOSE)
+
+
+def read_env_file(filename):
+    """
+    Read a docker-compose ``.env`` file of ``KEY=VALUE`` lines. Blank lines
+    and lines starting with ``#`` are ignored.
+
+    :param filename: The file to read
+    :type filename: str
+    :rtype: dict
+    """
+    environment = {}
+    with open(filename, 'r') as stream:
+        for line in stream:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            key, _, value = line.partition('=')
+            environment[key.strip()] = value.strip()
+    return environment
+
+
+def load_environment(env_file=None, project_dir=None):
+    """
+    Build the variables a compose file is interpolated with, like
+    docker-compose: the process environment, falling back to the values in
+    ``env_file`` or, if that isn't given, the ``.env`` file in
+    ``project_dir`` when there is one.
+
+    :param env_file: A ``.env`` file to read
+    :type env_file: str
+    :param project_dir: The directory of the compose file
+    :type project_dir: str
+    :rtype: dict
+    """
+    if env_file is None and project_dir is not None:
+        env_file = os.path.join(project_dir, '.env')
+        if not os.path.isfile(env_file):
+            env_file = None
+
+    environment = read_env_file(env_file) if env_file else {}
+    environment.update(os.environ)
+    return environment
+
+
+class Interpolator(object):
+    """
+    Substitute ``$VAR``, ``${VAR}``, ``${VAR:-default}``, ``${VAR-default}``,
+    ``${VAR:?error}`` and ``${VAR?error}`` in compose file values, and turn
+    ``$$`` into ``$``.
+
+    Variables that are not set are replaced with an empty string and
+    reported in ``.messages``. Results are cached, since the same strings
+    tend to repeat across services.
+
+    To use this class:
+
+    .. code-block:: python
+
+        interpolator = Interpolator({'TAG': '1.0'})
+        interpolator.interpolate({'image': 'web:${TAG}'})
+
+    """
+
+    def __init__(self, environment):
+        """
+        :param environment: The variables to substitute
+        :type environment: dict
+        """
+        self.environment = environment
+        self.messages = set()
+        self._cache = {}
+
+    def interpolate(self, value):
+        """
+        Interpolate a string, or all strings in a dict or list. Dict keys are
+        left as they are.
+
+        :param value: The value to interpolate
+        :returns: A new value, the argument is not modified
+        """
+        if isinstance(value, str):
+            if value not in self._cache:
+                self._cache[value] = self._interpolate_string(value)
+            return self._cache[value]
+        if isinstance(value, dict):
+            return dict((k, self.interpolate(v)) for k, v in value.items())
+        if isinstance(value, list):
+            return [self.interpolate(v) for v in value]
+        return value
+
+    def _interpolate_string(self, value):
+        if '$' not in value:
+            return value
+
+        def substitute(match):
+            return self._substitute(match, value)
+
+        return INTERPOLATION_PATTERN.sub(substitute, value)
+
+    def _substitute(self, match, value):
+        if match.group('escaped') is not None:
+            return '$'
+        if match.group('invalid') is not None:
+            self.messages.add('Invalid interpolation format in "{}".'.format(value))
+            return match.group(0)
+
+        name = match.group('named') or match.group('braced')
+        separator = match.group('separator')
+        argument = match.group('argument')
+        variable = self.environment.get(name)
+
+        is_unset = variable is None or (separator and separator.startswith(':') and not variable)
+        if not is_unset:
+            return variable
+
+        if separator in (':-', '-'):
+            return argument
+        if separator in (':?', '?'):
+            self.messages.add('Required variable "{}" is not set: {}'.format(name, argument))
+        elif variable is None:
+            self.messages.add(
+                'The "{}" variable is not set. Defaulting to a blank string.'.format(name)
+            )
+        return variable or ''
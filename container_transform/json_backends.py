@@ -0,0 +1,152 @@
+import json
+import math
+import os
+import re
+
+from .output import json_encoder
+from .schema import TransformationTypes
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# The environment variable that selects the backend when none is given
+JSON_BACKEND_VARIABLE = 'CT_JSON_BACKEND'
+
+# ``auto`` uses orjson if it is installed
+JSON_BACKENDS = ('json', 'orjson', 'auto')
+
+# Formats whose transformers read and write JSON with a backend
+JSON_FORMATS = (
+    TransformationTypes.ECS.value,
+    TransformationTypes.MARATHON.value,
+    TransformationTypes.CHRONOS.value,
+)
+
+# Characters json.dumps(ensure_ascii=True) escapes that orjson doesn't
+_NON_ASCII = re.compile(r'[^\x00-\x7e]')
+
+
+def _buffer_text(data):
+    """
+    Decode a bytes-like object with the encoding the JSON spec allows it to
+    have
+    """
+    return str(data, json.detect_encoding(bytes(data[:4])))
+
+
+def _escape_non_ascii(match):
+    """
+    Escape a character like ``json.dumps(ensure_ascii=True)`` does
+    """
+    code = ord(match.group(0))
+    if code < 0x10000:
+        return '\\u{0:04x}'.format(code)
+    code -= 0x10000
+    return '\\u{0:04x}\\u{1:04x}'.format(0xd800 | (code >> 10), 0xdc00 | (code & 0x3ff))
+
+
+def _has_non_finite(data):
+    """
+    Whether ``data`` holds a NaN or infinite float, which orjson writes as
+    ``null``
+    """
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite(value) for value in data)
+    return False
+
+
+class JSONBackend(object):
+    """
+    Read and write JSON with the standard library. This is the default, and
+    the reference the other backends match.
+    """
+    name = 'json'
+
+    def loads(self, data):
+        """
+        :param data: A JSON document
+        :type data: str or bytes-like object
+        """
+        if not isinstance(data, (str, bytes, bytearray)):
+            data = _buffer_text(data)
+        return json.loads(data)
+
+    def dumps(self, data, verbose=True):
+        """
+        :param verbose: Indent and sort keys, otherwise use compact separators
+        :type verbose: bool
+        :rtype: str
+        """
+        return json_encoder(verbose).encode(data)
+
+    def iterencode(self, data, verbose=True):
+        """
+        :param verbose: Indent and sort keys, otherwise use compact separators
+        :type verbose: bool
+        :rtype: iterator of str
+        """
+        return json_encoder(verbose).iterencode(data)
+
+
+class OrjsonBackend(JSONBackend):
+    """
+    Read and write JSON with `orjson <https://github.com/ijl/orjson>`_,
+    falling back to the standard library for what orjson formats
+    differently: indented output, which orjson can only indent by two
+    spaces, and data orjson can't serialize, such as integers beyond 64
+    bits or NaN and infinite floats, which orjson writes as ``null``.
+    Non-ASCII characters are escaped like the standard library does.
+
+    Floats that need an exponent are written the shortest way, such as
+    ``1e16`` instead of ``1e+16``, which parses to the same value.
+    """
+    name = 'orjson'
+
+    def loads(self, data):
+        if not isinstance(data, str) and json.detect_encoding(bytes(data[:4])) != 'utf-8':
+            # orjson only reads UTF-8
+            data = _buffer_text(data)
+        return orjson.loads(data)
+
+    def dumps(self, data, verbose=True):
+        if verbose:
+            return super(OrjsonBackend, self).dumps(data, verbose)
+        try:
+            text = orjson.dumps(data).decode('utf-8')
+        except TypeError:
+            return super(OrjsonBackend, self).dumps(data, verbose)
+        if 'null' in text and _has_non_finite(data):
+            return super(OrjsonBackend, self).dumps(data, verbose)
+        if _NON_ASCII.search(text):
+            text = _NON_ASCII.sub(_escape_non_ascii, text)
+        return text
+
+    def iterencode(self, data, verbose=True):
+        if verbose:
+            return super(OrjsonBackend, self).iterencode(data, verbose)
+        return iter([self.dumps(data, verbose)])
+
+
+def get_backend(name=None):
+    """
+    Get a JSON backend by name. orjson falls back to the standard library if
+    it isn't installed.
+
+    :param name: One of ``JSON_BACKENDS``. Defaults to the
+        ``CT_JSON_BACKEND`` environment variable, or ``json``
+    :type name: str
+    :rtype: JSONBackend
+    """
+    name = name or os.environ.get(JSON_BACKEND_VARIABLE) or 'json'
+    if name not in JSON_BACKENDS:
+        raise ValueError('Unsupported JSON backend {}'.format(name))
+    if name != 'json' and orjson is not None:
+        return OrjsonBackend()
+    return JSONBackend()
@@ -1,14 +1,14 @@
 import json
-import shlex
 
 from copy import deepcopy
 from functools import reduce
-from collections import Mapping, defaultdict
+from collections import Mapping, defaultdict, namedtuple
 
 import yaml
 
 from .schema import TransformationTypes, ARG_MAP
-from .transformer import BaseTransformer
+from .transformer import BaseTransformer, expand_port_mappings
+from .views import ContainerView
 
 
 def update_nested_dict(d, u):
@@ -35,6 +35,38 @@ def lookup_nested_dict(dic, key, *keys):
         return None
 
 
+VolumeDescriptor = namedtuple('VolumeDescriptor', ['name', 'type', 'host', 'source'])
+VolumeDescriptor.__doc__ = """
+A pod volume, indexed by name. ``host`` is what mounts of the volume are
+ingested as: a host path, or '' for an anonymous volume.
+"""
+
+# Volume types that are converted, and the host path mounts of them are
+# ingested with. Persistent volume claims are only kept by Kubernetes output
+VOLUME_TYPES = {
+    'hostPath': lambda source: source.get('path', ''),
+    'emptyDir': lambda source: '',
+    'persistentVolumeClaim': lambda source: '',
+}
+
+# Volume types that are known, but only have an anonymous volume equivalent
+UNSUPPORTED_VOLUME_TYPES = (
+    'awsElasticBlockStore', 'azureDisk', 'azureFile', 'cephfs', 'cinder',
+    'configMap', 'csi', 'downwardAPI', 'ephemeral', 'fc', 'flexVolume', 'flocker',
+    'gcePersistentDisk', 'gitRepo', 'glusterfs', 'iscsi', 'nfs',
+    'photonPersistentDisk', 'portworxVolume', 'projected', 'quobyte', 'rbd',
+    'scaleIO', 'secret', 'storageos', 'vsphereVolume',
+)
+
+# The apiVersion used for each workload kind unless one is given.
+# Deployments keep the version older clusters understand
+WORKLOAD_API_VERSIONS = {
+    'Deployment': 'extensions/v1beta1',
+    'StatefulSet': 'apps/v1',
+    'Job': 'batch/v1',
+}
+
+
 class KubernetesTransformer(BaseTransformer):
     """
     A transformer for Kubernetes Pods
@@ -44,6 +76,8 @@ class KubernetesTransformer(BaseTransformer):
     """
     input_type = TransformationTypes.COMPOSE.value
 
+    volume_types = ('persistentVolumeClaim',)
+
     pod_types = {
         'ReplicaSet': lambda x: x.get('spec').get('template').get('spec'),
         'Deployment': lambda x: x.get('spec').get('template').get('spec'),
@@ -52,12 +86,27 @@ class KubernetesTransformer(BaseTransformer):
         'ReplicationController': lambda x: x.get('spec').get('template').get('spec')
     }
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, kind='Deployment', api_version=None, split=False):
         """
         :param filename: The file to be loaded
         :type filename: str
+        :param kind: The workload kind to emit, one of ``WORKLOAD_API_VERSIONS``
+        :type kind: str
+        :param api_version: The apiVersion to emit, such as ``apps/v1``.
+            Defaults to ``WORKLOAD_API_VERSIONS[kind]``
+        :type api_version: str
+        :param split: Emit one workload per container instead of a single pod
+            with all the containers
+        :type split: bool
         """
-        obj, stream, volumes_in = {}, None, []
+        if kind not in WORKLOAD_API_VERSIONS:
+            raise ValueError('Unsupported workload kind {}'.format(kind))
+        self.kind = kind
+        self.api_version = api_version or WORKLOAD_API_VERSIONS[kind]
+        self.split = split
+
+        self.messages = set()
+        obj, stream, volumes_in = {}, None, {}
         if filename:
             self._filename = filename
             obj, stream, volumes_in = self._read_file(filename)
@@ -66,6 +115,41 @@ class KubernetesTransformer(BaseTransformer):
         self.volumes_in = volumes_in
 
         self.volumes = {}
+        # Volume key -> volume name, so repeated mounts reuse their volume
+        self._volume_names = {}
+        # Volume name -> the key and preferred name it was added with
+        self._volume_sources = {}
+
+    def export_state(self):
+        return {
+            'volumes': [
+                [self._volume_sources[name][0], self._volume_sources[name][1], volume]
+                for name, volume
+                in self.volumes.items()
+            ]
+        }
+
+    def merge_state(self, state, containers=()):
+        """
+        Add the volumes of another transformer like ``.emit_volumes()`` adds
+        them, so their names don't collide with the volumes already here, and
+        rename the volume mounts of its containers to match.
+        """
+        renames = {}
+        for key, name, volume in state.get('volumes', []):
+            source = {k: v for k, v in volume.items() if k != 'name'}
+            renames[volume['name']] = self._add_volume(name, source, key)
+
+        for container in containers:
+            mounts = container.get('volumeMounts')
+            if mounts and any(renames.get(m.get('name'), m.get('name')) != m.get('name')
+                              for m in mounts):
+                # A new list, since the mounts may be shared with a cache
+                container['volumeMounts'] = [
+                    dict(mount, name=renames.get(mount.get('name'), mount.get('name')))
+                    for mount
+                    in mounts
+                ]
 
     def _find_convertable_object(self, data):
         """
@@ -93,38 +177,80 @@ class KubernetesTransformer(BaseTransformer):
         pod = self.pod_types[obj['kind']](obj)
         return obj, pod.get('containers'), self.ingest_volumes_param(pod.get('volumes', []))
 
+    def _ingest_volume_param(self, volume):
+        name = volume.get('name')
+        for volume_type, host in VOLUME_TYPES.items():
+            if volume_type in volume:
+                source = volume[volume_type] or {}
+                return VolumeDescriptor(name, volume_type, host(source), source)
+
+        for volume_type in UNSUPPORTED_VOLUME_TYPES:
+            if volume_type in volume:
+                self.messages.add(
+                    'Volume "{}" of type {} is not supported and is mounted as an '
+                    'anonymous volume.'.format(name, volume_type)
+                )
+                return VolumeDescriptor(name, volume_type, '', volume[volume_type] or {})
+
+        self.messages.add(
+            'Volume "{}" has an unknown type and is mounted as an anonymous '
+            'volume.'.format(name)
+        )
+        return VolumeDescriptor(name, None, '', {})
+
     def ingest_volumes_param(self, volumes):
         """
         This is for ingesting the "volumes" of a pod spec
+
+        :returns: An index of the volumes by name
+        :rtype: dict of VolumeDescriptor
         """
-        data = {}
-        for volume in volumes:
-            if volume.get('hostPath', {}).get('path'):
-                data[volume.get('name')] = {
-                    'path': volume.get('hostPath', {}).get('path'),
-                }
-            elif volume.get('emptyDir'):
-                data[volume.get('name')] = {}
-            else:
-                data[volume.get('name')] = {}
-            # TODO Support other k8s volume types?
-        return data
+        return {
+            volume.get('name'): self._ingest_volume_param(volume)
+            for volume
+            in volumes
+        }
 
     def _ingest_volume(self, volume):
+        descriptor = self.volumes_in.get(volume.get('name'))
+        if descriptor is None:
+            return None
+
+        host = descriptor.host
+        if host and descriptor.type == 'hostPath' and volume.get('subPath'):
+            host = '{}/{}'.format(host.rstrip('/'), volume['subPath'])
+
         data = {
-            'host': self.volumes_in.get(volume.get('name')).get('path', ''),
+            'host': host,
             'container': volume.get('mountPath', ''),
             'readonly': bool(volume.get('readOnly')),
         }
+        if not host:
+            # Mounts of the same pod volume share it
+            data['volume'] = descriptor.name
+        if descriptor.type in self.volume_types:
+            data['type'] = descriptor.type
+            data['source'] = descriptor.source
         return data
 
     def ingest_volumes(self, volumes):
-        return [self._ingest_volume(volume) for volume in volumes]
+        ingested = (self._ingest_volume(volume) for volume in volumes)
+        return [volume for volume in ingested if volume is not None]
+
+    def _check_volume_mounts(self, container):
+        for mount in container.get('volumeMounts') or []:
+            if mount.get('name') not in self.volumes_in:
+                self.messages.add(
+                    'Container {} mounts volume "{}", which is not defined in the pod, '
+                    'and is skipped.'.format(container.get('name'), mount.get('name'))
+                )
 
     def flatten_container(self, container):
         """
         Accepts a kubernetes container and pulls out the nested values into the top level
+        of a view, without modifying ``container``
         """
+        overlay = {}
         for names in ARG_MAP.values():
             if names[TransformationTypes.KUBERNETES.value]['name'] and \
                             '.' in names[TransformationTypes.KUBERNETES.value]['name']:
@@ -132,18 +258,12 @@ class KubernetesTransformer(BaseTransformer):
                 parts = kubernetes_dotted_name.split('.')
                 result = lookup_nested_dict(container, *parts)
                 if result:
-                    container[kubernetes_dotted_name] = result
-        return container
-
-    def ingest_containers(self, containers=None):
-        containers = containers or self.stream or {}
-        # Accept groups api output
-        if isinstance(containers, dict):
-            containers = [containers]
-        return [
-            self.flatten_container(container)
-            for container
-            in containers]
+                    overlay[kubernetes_dotted_name] = result
+        return ContainerView(container, overlay)
+
+    def _ingest_container(self, container):
+        self._check_volume_mounts(container)
+        return self.flatten_container(container)
 
     def emit_containers(self, containers, verbose=True):
         """
@@ -159,51 +279,96 @@ class KubernetesTransformer(BaseTransformer):
         :rtype: str
         """
         containers = sorted(containers, key=lambda c: c.get('name'))
-
-        output = {
-            'kind': 'Deployment',
-            'apiVersion': 'extensions/v1beta1',
-            'metadata': {
-                'name': None,
-                'namespace': 'default',
-                'labels': {
-                    'app': None,
-                    'version': 'latest',
-                },
-            },
-            'spec': {
-                'replicas': 1,
-                'selector': {
-                    'matchLabels': {
-                        'app': None,
-                        'version': 'latest'
-                    }
-                },
-                'template': {
-                    'metadata': {
-                        'labels': {
-                            'app': None,
-                            'version': 'latest'
-                        }
-                    },
-                    'spec': {
-                        'containers': json.loads(json.dumps(containers))
-                    }
-                }
-            }
-        }
-        if self.volumes:
+        containers = json.loads(json.dumps(containers))
+
+        if self.split:
+            output = [
+                self._build_workload(
+                    container.get('name'),
+                    [container],
+                    self._container_volumes(container)
+                )
+                for container
+                in containers
+            ]
+        else:
             volumes = sorted(self.volumes.values(), key=lambda x: x.get('name'))
-            output['spec']['template']['spec']['volumes'] = volumes
+            output = [self._build_workload(None, containers, volumes)]
 
         noalias_dumper = yaml.dumper.SafeDumper
         noalias_dumper.ignore_aliases = lambda self, data: True
-        return yaml.dump(
+        return yaml.dump_all(
             output,
             default_flow_style=False,
             Dumper=noalias_dumper
         )
 
+    def _container_volumes(self, container):
+        names = sorted(set(
+            mount.get('name')
+            for mount
+            in container.get('volumeMounts', [])
+        ))
+        return [self.volumes[name] for name in names if name in self.volumes]
+
+    def _build_workload(self, name, containers, volumes):
+        """
+        Build a ``self.kind`` workload running ``containers`` in one pod
+
+        :type name: str
+        :type containers: list of dict
+        :type volumes: list of dict
+        :rtype: dict
+        """
+        pod_spec = {
+            'containers': containers
+        }
+        if volumes:
+            pod_spec['volumes'] = volumes
+
+        spec = {
+            'template': {
+                'metadata': {
+                    'labels': {
+                        'app': name,
+                        'version': 'latest'
+                    }
+                },
+                'spec': pod_spec
+            }
+        }
+        if self.kind == 'Job':
+            pod_spec['restartPolicy'] = 'Never'
+        else:
+            spec['replicas'] = 1
+            spec['selector'] = {
+                'matchLabels': {
+                    'app': name,
+                    'version': 'latest'
+                }
+            }
+        if self.kind == 'StatefulSet':
+            # Grouped containers have no workload name, so the governing
+            # service is named after the first container
+            spec['serviceName'] = name or next(
+                (container.get('name') for container in containers if container.get('name')),
+                'default'
+            )
+
+        return {
+            'kind': self.kind,
+            'apiVersion': self.api_version,
+            'metadata': {
+                'name': name,
+                'namespace': 'default',
+                'labels': {
+                    'app': name,
+                    'version': 'latest',
+                },
+            },
+            'spec': spec
+        }
+
     def validate(self, container):
         # Ensure container name
         # container_name = container.get('name', str(uuid.uuid4()))
@@ -250,7 +415,7 @@ class KubernetesTransformer(BaseTransformer):
 
     def emit_port_mappings(self, port_mappings):
         output = []
-        for mapping in port_mappings:
+        for mapping in expand_port_mappings(port_mappings):
             data = {
                 'containerPort': mapping['container_port'],
                 'protocol': mapping.get('protocol', 'tcp').upper()
@@ -318,8 +483,8 @@ class KubernetesTransformer(BaseTransformer):
     def ingest_cpu(self, cpu):
         cpu = str(cpu)
         if cpu[-1] == 'm':
-            cpu = float(int(cpu[:-1]) / 1000)
-        return float(cpu * 1024)
+            cpu = float(cpu[:-1]) / 1000
+        return float(cpu) * 1024
 
     def emit_cpu(self, cpu):
         value = float(cpu / 1024)
@@ -337,32 +502,78 @@ class KubernetesTransformer(BaseTransformer):
         return self._list2cmdline(command)
 
     def emit_command(self, command):
-        return shlex.split(command)
+        return self._cmdline2list(command)
 
     def ingest_entrypoint(self, entrypoint):
         return self._list2cmdline(entrypoint)
 
     def emit_entrypoint(self, entrypoint):
-        return shlex.split(entrypoint)
+        return self._cmdline2list(entrypoint)
 
     @staticmethod
     def _build_volume_name(hostpath):
         return hostpath.replace('/', '-').strip('-')
 
+    def _add_volume(self, name, source, key=None):
+        """
+        Add a volume to ``self.volumes`` and return its name. Volumes with the
+        same key are added once. If another volume already has ``name``, a
+        numeric suffix is added, so one volume never replaces another.
+
+        :param name: The preferred name
+        :type name: str
+        :param source: The volume type and its options, such as
+            ``{'emptyDir': {}}``
+        :type source: dict
+        :param key: What the volume stands for, such as a host path. Volumes
+            without a key are always added
+        :type key: str
+        :rtype: str
+        """
+        if key is not None and key in self._volume_names:
+            return self._volume_names[key]
+        candidate, index = name, 1
+        while candidate in self.volumes:
+            index += 1
+            candidate = '{}-{}'.format(name, index)
+        self.volumes[candidate] = dict({'name': candidate}, **source)
+        self._volume_sources[candidate] = (key, name)
+        if key is not None:
+            self._volume_names[key] = candidate
+        return candidate
+
     def _build_volume(self, volume):
         """
-        Given a generic volume definition, create the volumes element
+        Given a generic volume definition, create the volumes element.
+        Each host path or pod volume is added to ``self.volumes`` once,
+        however many containers mount it. Other anonymous volumes each
+        become an ``emptyDir`` of their own.
         """
-        self.volumes[self._build_volume_name(volume.get('host'))] = {
-            'name': self._build_volume_name(volume.get('host')),
-            'hostPath': {
-                'path': volume.get('host')
-            }
-        }
+        host = volume.get('host')
+        pod_volume = volume.get('volume')
+        if host:
+            name = self._add_volume(
+                self._build_volume_name(host),
+                {'hostPath': {'path': host}},
+                'hostPath:{}'.format(host)
+            )
+        elif volume.get('type') in self.volume_types:
+            name = self._add_volume(
+                pod_volume,
+                {volume['type']: volume['source']},
+                '{}:{}'.format(volume['type'], pod_volume)
+            )
+        elif pod_volume:
+            name = self._add_volume(pod_volume, {'emptyDir': {}}, 'emptyDir:{}'.format(pod_volume))
+        else:
+            name = self._add_volume(
+                self._build_volume_name(volume.get('container', '')),
+                {'emptyDir': {}}
+            )
+
         response = {
-            'name': self._build_volume_name(volume.get('host')),
+            'name': name,
             'mountPath': volume.get('container'),
-
         }
         if volume.get('readonly', False):
             response['readOnly'] = bool(volume.get('readonly', False))
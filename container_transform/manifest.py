@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+
+from .output import write_atomic
+
+MANIFEST_VERSION = 1
+
+
+def _encode(value):
+    # Container views hash like the dicts they stand for
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def _digest(data):
+    text = json.dumps(data, sort_keys=True, default=_encode)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _reuse(entry):
+    """
+    A copy of a stored entry to hand out. Emitters only change the top level
+    of the containers they are given, such as popping the name, so the
+    container is copied one level deep and its values are shared.
+    """
+    return dict(entry, container=dict(entry['container']))
+
+
+class Manifest(object):
+    """
+    A record of the containers produced by a previous conversion.
+
+    Every converted container is stored with a hash of its ingested
+    definition, the messages its conversion produced and the output
+    transformer state (such as ECS task volumes) it added. On the next run
+    only containers whose definitions changed need to be converted again.
+
+    To use this class:
+
+    .. code-block:: python
+
+        converter = Converter(filename, 'compose', 'ecs', manifest='.ct-manifest')
+        output = converter.convert()
+
+    """
+
+    def __init__(self, filename=None):
+        """
+        :param filename: The manifest file. It does not need to exist yet
+        :type filename: str
+        """
+        self._filename = filename
+        self.entries = {}
+        self._current = {}
+        self.hits = 0
+        self.misses = 0
+
+        if filename and os.path.exists(filename):
+            with open(filename, 'r') as stream:
+                data = json.load(stream)
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('containers', {})
+
+    @staticmethod
+    def context_key(input_type, output_type, input_transformer, output_transformer):
+        """
+        Hash everything besides the container definitions that affects the
+        output: the formats and the settings and file-level data (such as
+        task or pod volumes) of both transformers. Volatile output settings,
+        such as a default Chronos schedule, are left out; they are applied to
+        reused containers instead.
+
+        :rtype: str
+        """
+        volatile = output_transformer.volatile_fields()
+        return _digest([
+            input_type,
+            output_type,
+            input_transformer.settings(),
+            {
+                key: value
+                for key, value
+                in output_transformer.settings().items()
+                if key not in volatile
+            },
+        ])
+
+    @staticmethod
+    def container_key(container, context):
+        """
+        Hash a container definition without its name, so identical
+        definitions under different names share a key. Whether it has a name
+        is kept, since unnamed containers are named after their output.
+
+        :param container: An ingested container definition
+        :type container: dict
+        :param context: The output of ``.context_key()``
+        :type context: str
+        :rtype: str
+        """
+        definition = {key: value for key, value in container.items() if key != 'name'}
+        return _digest([context, 'name' in container, definition])
+
+    def get(self, key):
+        """
+        Return a copy of the entry stored for a container key and keep it for
+        the next run, or None if the container needs to be converted.
+
+        :rtype: dict
+        """
+        entry = self._current.get(key) or self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._current[key] = entry
+        return _reuse(entry)
+
+    def put(self, key, container, state, messages):
+        """
+        Record a converted container
+
+        :param key: The output of ``.container_key()``
+        :type key: str
+        :param container: The validated output container
+        :type container: dict
+        :param state: The output transformer state the container added
+        :type state: dict
+        :param messages: Messages from converting the container
+        :type messages: set
+        """
+        # Store what a JSON round trip gives back, so a reused entry is the
+        # same whether it came from this run or a previous one
+        self._current[key] = json.loads(json.dumps({
+            'container': container,
+            'state': state,
+            'messages': sorted(messages),
+        }))
+
+    def save(self, filename=None):
+        """
+        Write the containers used in this run to the manifest file. Entries
+        for containers that are no longer in the input are dropped.
+
+        :param filename: Defaults to the file the manifest was loaded from
+        :type filename: str
+        """
+        data = {
+            'version': MANIFEST_VERSION,
+            'containers': self._current,
+        }
+        write_atomic(filename or self._filename, json.dumps(data, sort_keys=True))
@@ -1,13 +1,15 @@
-import json
-import uuid
-import shlex
-
 from copy import deepcopy
 from functools import reduce
 from collections import Mapping, defaultdict
 
+from .input import load_json
+from .json_backends import get_backend
 from .schema import TransformationTypes, ARG_MAP
-from .transformer import BaseTransformer
+from .transformer import (
+    BaseTransformer, expand_port_mappings, format_volumes_from, parse_volumes_from,
+    passthrough
+)
+from .views import ContainerView
 
 
 def update_nested_dict(d, u):
@@ -56,11 +58,19 @@ class MarathonTransformer(BaseTransformer):
     """
     input_type = TransformationTypes.COMPOSE.value
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, json_backend=None, random_names=False):
         """
         :param filename: The file to be loaded
         :type filename: str
+        :param json_backend: The JSON backend to read and write with, see
+            :func:`container_transform.json_backends.get_backend`
+        :type json_backend: str
+        :param random_names: Name applications without an id randomly,
+            instead of after their content
+        :type random_names: bool
         """
+        self._json = get_backend(json_backend)
+        self.random_names = random_names
         if filename:
             self._filename = filename
             stream = self._read_file(filename)
@@ -72,7 +82,7 @@ class MarathonTransformer(BaseTransformer):
         """
         Read in the json stream
         """
-        return json.load(stream)
+        return load_json(stream, self._json)
 
     def _lookup_parameter(self, container, key, common_type=None):
         """
@@ -108,7 +118,9 @@ class MarathonTransformer(BaseTransformer):
     def flatten_container(self, container):
         """
         Accepts a marathon container and pulls out the nested values into the top level
+        of a view, without modifying ``container``
         """
+        overlay = {}
         for names in ARG_MAP.values():
 
             if names[TransformationTypes.MARATHON.value]['name'] and \
@@ -121,24 +133,28 @@ class MarathonTransformer(BaseTransformer):
                     common_type = names[TransformationTypes.MARATHON.value].get('type')
                     result = self._lookup_parameter(container, parts[-1], common_type)
                     if result:
-                        container[marathon_dotted_name] = result
+                        overlay[marathon_dotted_name] = result
                 else:
                     result = lookup_nested_dict(container, *parts)
                     if result:
-                        container[marathon_dotted_name] = result
-        return container
+                        overlay[marathon_dotted_name] = result
+        return ContainerView(container, overlay)
 
-    def ingest_containers(self, containers=None):
-        containers = containers or self.stream or {}
+    def _raw_containers(self, containers):
         # Accept groups api output
         if 'apps' in containers:
-            containers = containers['apps']
-        elif isinstance(containers, dict):
-            containers = [containers]
-        return [
-            self.flatten_container(container)
-            for container
-            in containers]
+            return containers['apps']
+        return super(MarathonTransformer, self)._raw_containers(containers)
+
+    def _ingest_container(self, container):
+        return self.flatten_container(container)
+
+    def _build_output(self, containers):
+        containers = sorted(self._name_containers(containers, 'id'), key=lambda c: c.get('id'))
+
+        if len(containers) == 1 and isinstance(containers, list):
+            containers = containers[0]
+        return containers
 
     def emit_containers(self, containers, verbose=True):
         """
@@ -147,27 +163,19 @@ class MarathonTransformer(BaseTransformer):
         :param containers: List of the container definitions
         :type containers: list of dict
 
-        :param verbose: Print out newlines and indented JSON
+        :param verbose: Print out newlines and indented JSON, otherwise use
+            compact JSON
         :type verbose: bool
 
         :returns: The text output
         :rtype: str
         """
-        containers = sorted(containers, key=lambda c: c.get('id'))
+        return self._json.dumps(self._build_output(containers), verbose)
 
-        if len(containers) == 1 and isinstance(containers, list):
-            containers = containers[0]
-
-        if verbose:
-            return json.dumps(containers, indent=4, sort_keys=True)
-        else:
-            return json.dumps(containers)
+    def emit_stream(self, containers, verbose=True):
+        return self._json.iterencode(self._build_output(containers), verbose)
 
     def validate(self, container):
-        # Ensure container name
-        container_name = container.get('id', str(uuid.uuid4()))
-        container['id'] = container_name
-
         container_data = defaultdict(lambda: defaultdict(dict))  # pragma: no coverage
         container_data.update(container)
 
@@ -188,41 +196,39 @@ class MarathonTransformer(BaseTransformer):
                     update_nested_dict(container_data, data)
                     del container_data[key]
 
+        docker = container_data['container']['docker']
+
         # Sort the parameters in a deterministic way
-        if container_data['container']['docker'].get('parameters'):
-            old_params = container_data['container']['docker']['parameters']
-            sorted_values = sorted(
-                old_params, key=lambda p: str(p.get('value'))
+        if docker.get('parameters'):
+            docker['parameters'] = sorted(
+                docker['parameters'],
+                key=lambda p: (p.get('key'), str(p.get('value')))
             )
-            sorted_keys = sorted(
-                sorted_values, key=lambda p: p.get('key')
-            )
-            container_data['container']['docker']['parameters'] = sorted_keys
-
-        # Set requirePorts if any hostPorts are specified.
-        if container_data['container']['docker'].get('portMappings'):
-            host_ports = set([
-                 p.get('hostPort', 0)
-                 for p
-                 in container_data['container']['docker']['portMappings']])
-            container_data['requirePorts'] = bool(host_ports.difference({0}))
 
         # Assume the network mode is BRIDGE if unspecified
-        if container_data.get('container', {}).get('docker', {}).get('network') == 'HOST':
-            if container_data['container']['docker'].get('portMappings'):
-                container_data['ports'] = [
-                    p.get('containerPort') or p.get('hostPort')
-                    for p
-                    in container_data['container']['docker']['portMappings']]
-                # del container_data['container']['docker']['portMappings']
-                container_data['requirePorts'] = True
-        else:
-            container_data['container']['docker']['network'] = 'BRIDGE'
-
-        container_data['container']['docker']['forcePullImage'] = True
+        host_network = docker.get('network') == 'HOST'
+
+        port_mappings = docker.get('portMappings')
+        if port_mappings:
+            ports = []
+            has_host_ports = False
+            for mapping in port_mappings:
+                host_port = mapping.get('hostPort', 0)
+                has_host_ports = has_host_ports or host_port != 0
+                ports.append(mapping.get('containerPort') or mapping.get('hostPort'))
+
+            # Set requirePorts if any hostPorts are specified.
+            container_data['requirePorts'] = has_host_ports or host_network
+            if host_network:
+                container_data['ports'] = ports
+
+        if not host_network:
+            docker['network'] = 'BRIDGE'
+
+        docker['forcePullImage'] = True
         container_data['container']['type'] = 'DOCKER'
         container_data['acceptedResourceRoles'] = []
-        if container_data.get('container', {}).get('docker', {}).get('portMappings'):
+        if port_mappings:
             container_data["healthChecks"] = [
                 {
                     "protocol": "HTTP",
@@ -276,7 +282,7 @@ class MarathonTransformer(BaseTransformer):
                 'protocol': mapping.get('protocol', 'tcp')
             }
             for mapping
-            in port_mappings]
+            in expand_port_mappings(port_mappings)]
 
     def ingest_memory(self, memory):
         return memory << 20
@@ -293,9 +299,11 @@ class MarathonTransformer(BaseTransformer):
     def emit_cpu(self, cpu):
         return float(cpu/1024)
 
+    @passthrough
     def ingest_environment(self, environment):
         return environment
 
+    @passthrough
     def emit_environment(self, environment):
         return environment
 
@@ -303,8 +311,9 @@ class MarathonTransformer(BaseTransformer):
         return self._list2cmdline(command)
 
     def emit_command(self, command):
-        return shlex.split(command)
+        return self._cmdline2list(command)
 
+    @passthrough
     def ingest_entrypoint(self, entrypoint):
         return entrypoint
 
@@ -312,12 +321,12 @@ class MarathonTransformer(BaseTransformer):
         return [{'key': 'entrypoint', 'value': entrypoint}]
 
     def ingest_volumes_from(self, volumes_from):
-        return volumes_from
+        return [parse_volumes_from(vol) for vol in volumes_from]
 
     def emit_volumes_from(self, volumes_from):
         _emitted = []
         for vol in volumes_from:
-            _emitted.append({'key': 'volumes-from', 'value': vol['source_container']})
+            _emitted.append({'key': 'volumes-from', 'value': format_volumes_from(vol)})
         return _emitted
 
     def _convert_volume(self, volume):
@@ -0,0 +1,137 @@
+import gzip
+import json
+import lzma
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+
+CHUNK_SIZE = 64 * 1024
+
+COMPRESSION_TYPES = ('gzip', 'lzma')
+
+
+def json_encoder(verbose=True):
+    """
+    :param verbose: Indent and sort keys, otherwise use compact separators
+    :type verbose: bool
+    :rtype: json.JSONEncoder
+    """
+    if verbose:
+        return json.JSONEncoder(indent=4, sort_keys=True)
+    return json.JSONEncoder(separators=(',', ':'))
+
+
+def dumps(data, verbose=True):
+    """
+    Serialize data as JSON
+
+    :param verbose: Indent and sort keys, otherwise use compact separators
+    :type verbose: bool
+    :rtype: str
+    """
+    return json_encoder(verbose).encode(data)
+
+
+def compressed(stream, compression=None):
+    """
+    Wrap a binary stream so that data written to it is compressed. Closing
+    the wrapper does not close ``stream``.
+
+    :param stream: A binary file-like object
+    :param compression: One of ``COMPRESSION_TYPES``, or None to write
+        uncompressed data
+    :type compression: str
+    """
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=stream, mode='wb')
+    if compression == 'lzma':
+        return lzma.LZMAFile(stream, mode='wb')
+    if compression:
+        raise ValueError('Unknown compression type "{}"'.format(compression))
+    return stream
+
+
+def write_chunks(chunks, stream, compression=None, chunk_size=CHUNK_SIZE):
+    """
+    Encode text chunks as UTF-8 and write them to a binary stream in blocks
+    of about ``chunk_size`` characters, without building the whole output in
+    memory.
+
+    :param chunks: An iterable of str
+    :param stream: A binary file-like object
+    :param compression: One of ``COMPRESSION_TYPES``
+    :type compression: str
+    """
+    writer = compressed(stream, compression)
+    buffer, size = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= chunk_size:
+            writer.write(''.join(buffer).encode('utf-8'))
+            buffer, size = [], 0
+    if buffer:
+        writer.write(''.join(buffer).encode('utf-8'))
+    if writer is not stream:
+        writer.close()
+    stream.flush()
+
+
+def _file_mode(filename):
+    """
+    The permissions to write ``filename`` with: those it already has, or the
+    ones ``open()`` would create it with under the current umask
+
+    :type filename: str
+    :rtype: int
+    """
+    try:
+        return stat.S_IMODE(os.stat(filename).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_open(filename, mode='wb'):
+    """
+    Open a temporary file in the same directory as ``filename`` and rename it
+    over ``filename`` once the block exits, so readers never see a partially
+    written file. The temporary file is removed if the block raises. The
+    file keeps the permissions of the file it replaces, or gets the ones a
+    plain ``open()`` would give a new file, not the owner-only permissions
+    of a temporary file.
+
+    :param filename: The destination file
+    :type filename: str
+    :param mode: The file mode, 'w' or 'wb'
+    :type mode: str
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    file_mode = _file_mode(filename)
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix='.ct-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode) as stream:
+            yield stream
+        os.chmod(temp_name, file_mode)
+        os.replace(temp_name, filename)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+def write_atomic(filename, data, mode='w'):
+    """
+    Write data to a file atomically, see :func:`atomic_open`
+
+    :param filename: The destination file
+    :type filename: str
+    :param data: The contents to write
+    :type data: str
+    :param mode: The file mode, 'w' or 'wb'
+    :type mode: str
+    """
+    with atomic_open(filename, mode) as stream:
+        stream.write(data)
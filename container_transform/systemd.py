@@ -1,6 +1,8 @@
 from jinja2 import Template
 
-from .transformer import BaseTransformer
+from .transformer import (
+    BaseTransformer, format_port_range, format_volumes_from
+)
 
 
 UNIT_TEMPLATE = '''\
@@ -104,11 +106,14 @@ class SystemdTransformer(BaseTransformer):
         if mapping.get('host_ip'):
             parts.append(str(mapping['host_ip']))
         if mapping.get('host_port'):
-            parts.append(str(mapping['host_port']))
+            parts.append(format_port_range(mapping['host_port'], mapping.get('host_port_end')))
         if mapping.get('container_ip'):
             parts.append(str(mapping['container_ip']))
         if mapping.get('container_port'):
-            parts.append(str(mapping['container_port']))
+            parts.append(format_port_range(
+                mapping['container_port'],
+                mapping.get('container_port_end')
+            ))
         output = ':'.join(parts)
         if mapping.get('protocol') == 'udp':
             output += '/udp'
@@ -157,7 +162,7 @@ class SystemdTransformer(BaseTransformer):
         pass
 
     def emit_volumes_from(self, volumes_from):
-        return volumes_from
+        return [format_volumes_from(vol) for vol in volumes_from]
 
     def ingest_volumes(self, volumes):
         pass
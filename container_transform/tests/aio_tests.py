@@ -0,0 +1,122 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from unittest import TestCase
+
+from mock import patch
+
+from container_transform.aio import AsyncConverter, aconvert, read_source
+from container_transform.converter import Converter
+
+
+class AsyncReader(object):
+
+    def __init__(self, data):
+        self.data = data
+
+    async def read(self):
+        return self.data
+
+
+class AsyncChunks(object):
+
+    def __init__(self, data, size=16):
+        self.chunks = [data[i:i + size] for i in range(0, len(data), size)]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+
+class AsyncConverterTests(TestCase):
+
+    def setUp(self):
+        self.filename = './container_transform/tests/composev2_extended.yml'
+        with open(self.filename, 'rb') as f:
+            self.data = f.read()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_read_source(self):
+        self.assertEqual(self.run_async(read_source(self.data)), self.data)
+        self.assertEqual(self.run_async(read_source(bytearray(self.data))), self.data)
+        self.assertEqual(self.run_async(read_source(self.data.decode())), self.data)
+        self.assertEqual(self.run_async(read_source(AsyncReader(self.data))), self.data)
+        self.assertEqual(self.run_async(read_source(AsyncChunks(self.data))), self.data)
+
+    def test_aconvert(self):
+        conv = Converter(self.filename, 'compose', 'ecs')
+        want = conv.convert()
+
+        output, messages = self.run_async(aconvert(AsyncChunks(self.data), 'compose', 'ecs'))
+
+        self.assertEqual(json.loads(output), json.loads(want))
+        self.assertEqual(messages, conv.messages)
+
+    def test_convert_max_concurrency(self):
+        converter = AsyncConverter(
+            executor=ThreadPoolExecutor(max_workers=4),
+            max_concurrency=2
+        )
+        running = []
+        high_water = []
+        convert = Converter.convert
+
+        def tracked_convert(conv, verbose=True):
+            running.append(conv)
+            high_water.append(len(running))
+            try:
+                return convert(conv, verbose)
+            finally:
+                running.remove(conv)
+
+        async def convert_all():
+            return await asyncio.gather(*[
+                converter.convert(AsyncReader(self.data), 'compose', 'ecs', verbose=False)
+                for _ in range(6)
+            ])
+
+        with patch.object(Converter, 'convert', tracked_convert):
+            results = self.run_async(convert_all())
+
+        self.assertEqual(len(results), 6)
+        self.assertLessEqual(max(high_water), 2)
+
+    def test_convert_cancel(self):
+        started = Event()
+        release = Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        converter = AsyncConverter(executor=executor)
+
+        def blocking_convert(conv, verbose=True):
+            started.set()
+            release.wait(5)
+            return ''
+
+        async def cancel():
+            task = asyncio.ensure_future(converter.convert(self.data, 'compose', 'ecs'))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return True
+            return False
+
+        with patch.object(Converter, 'convert', blocking_convert):
+            cancelled = self.run_async(cancel())
+            release.set()
+        executor.shutdown()
+
+        self.assertTrue(cancelled)
@@ -1,6 +1,12 @@
 from unittest import TestCase
 
-from container_transform.transformer import BaseTransformer
+import pickle
+
+from container_transform.compose import ComposeTransformer
+from container_transform.marathon import MarathonTransformer
+from container_transform.transformer import (
+    BaseTransformer, CommandLine, expand_port_mappings, format_port_range, parse_port_range
+)
 from container_transform.schema import ARG_MAP
 
 
@@ -30,3 +36,86 @@ class BaseTransformerTests(TestCase):
             available_params.difference(ingest_methods),
             {'build', 'essential', 'volumes_from', 'logging'}
         )
+
+    def test_list2cmdline(self):
+        command = BaseTransformer._list2cmdline(['/bin/echo', 'Hello world', '"quoted"'])
+
+        self.assertIsInstance(command, CommandLine)
+        self.assertEqual(command, '/bin/echo \'Hello world\' "quoted"')
+        self.assertEqual(command.argv, ('/bin/echo', 'Hello world', 'quoted'))
+
+    def test_cmdline2list(self):
+        command = BaseTransformer._list2cmdline(['/bin/echo', 'Hello world', '"quoted"'])
+
+        # The arguments are what splitting the string gives
+        self.assertEqual(
+            BaseTransformer._cmdline2list(command),
+            ['/bin/echo', 'Hello world', 'quoted']
+        )
+        self.assertEqual(
+            BaseTransformer._cmdline2list('/bin/echo \'Hello world\' "quoted"'),
+            ['/bin/echo', 'Hello world', 'quoted']
+        )
+
+    def test_command_line_pickle(self):
+        command = BaseTransformer._list2cmdline(['/bin/echo', 'Hello world'])
+        unpickled = pickle.loads(pickle.dumps(command))
+
+        self.assertEqual(unpickled, command)
+        self.assertEqual(unpickled.argv, command.argv)
+
+    def test_parse_port_range(self):
+        self.assertEqual(parse_port_range('8000-8100'), (8000, 8100))
+        self.assertEqual(parse_port_range(80), (80, None))
+        self.assertEqual(format_port_range(8000, 8100), '8000-8100')
+        self.assertEqual(format_port_range(80, None), '80')
+
+    def test_expand_port_mappings(self):
+        mappings = [
+            {'container_port': 80, 'protocol': 'tcp'},
+            {'host_port': 9000, 'host_port_end': 9002, 'container_port': 8000,
+             'container_port_end': 8002, 'protocol': 'udp'},
+            {'container_port': 7000, 'container_port_end': 7001, 'protocol': 'tcp'},
+        ]
+
+        expanded = expand_port_mappings(mappings)
+
+        self.assertNotIsInstance(expanded, list)
+        self.assertEqual(
+            list(expanded),
+            [
+                {'container_port': 80, 'protocol': 'tcp'},
+                {'host_port': 9000, 'container_port': 8000, 'protocol': 'udp'},
+                {'host_port': 9001, 'container_port': 8001, 'protocol': 'udp'},
+                {'host_port': 9002, 'container_port': 8002, 'protocol': 'udp'},
+                {'container_port': 7000, 'protocol': 'tcp'},
+                {'container_port': 7001, 'protocol': 'tcp'},
+            ]
+        )
+
+    def test_iter_containers(self):
+        """
+        Test .iter_containers() ingests containers in order and lets go of the
+        parsed input without changing it
+        """
+        transformer = MarathonTransformer('./container_transform/tests/marathon-group.json')
+        stream = transformer.stream
+        apps = list(stream['apps'])
+        expected = MarathonTransformer(
+            './container_transform/tests/marathon-group.json'
+        ).ingest_containers()
+
+        containers = transformer.iter_containers()
+        first = next(containers)
+
+        self.assertIsNone(transformer.stream)
+        self.assertEqual([first] + list(containers), expected)
+        self.assertEqual(stream['apps'], apps)
+
+    def test_iter_containers_compose(self):
+        transformer = ComposeTransformer('./container_transform/tests/docker-compose.yml')
+        expected = transformer.ingest_containers()
+
+        self.assertEqual(transformer.ingest_containers(), expected)
+        self.assertEqual(list(transformer.iter_containers()), expected)
+        self.assertEqual(transformer.ingest_containers(), [])
@@ -0,0 +1,109 @@
+import json
+import tempfile
+from unittest import TestCase, skipIf
+
+from mock import patch
+
+from container_transform import batch
+from container_transform.batch import convert_columns
+from container_transform.converter import Converter, compile_plan
+from container_transform.marathon import MarathonTransformer
+
+
+class BatchTests(TestCase):
+
+    def _assert_equivalent(self):
+        fixtures = [
+            ('compose', 'docker-compose.yml'),
+            ('compose', 'composev2.yml'),
+            ('ecs', 'containers.json'),
+            ('marathon', 'marathon-group.json'),
+            ('chronos', 'fixtures/chronos-list.json'),
+            ('kubernetes', 'k8s_tests/dns.yaml'),
+        ]
+        output_types = ['compose', 'ecs', 'marathon', 'chronos', 'kubernetes', 'systemd']
+        for input_type, filename in fixtures:
+            filename = './container_transform/tests/{}'.format(filename)
+            for output_type in output_types:
+                options = {}
+                if output_type == 'chronos':
+                    options['schedule'] = 'R/2016-01-01T00:00:00/PT1H'
+                if output_type == 'ecs' and input_type == 'ecs':
+                    continue
+
+                scalar = Converter(filename, input_type, output_type, output_options=options)
+                batched = Converter(
+                    filename, input_type, output_type, output_options=options, batch=True
+                )
+                try:
+                    expected = scalar.convert()
+                except Exception:
+                    # Not every pair converts, e.g. ECS volumesFrom to marathon
+                    continue
+                self.assertEqual(expected, batched.convert(), (filename, output_type))
+                self.assertEqual(scalar.messages, batched.messages)
+
+    @skipIf(batch.numpy is None, 'NumPy is not installed')
+    def test_batch_equivalent_numpy(self):
+        self._assert_equivalent()
+
+    @patch.object(batch, 'numpy', None)
+    def test_batch_equivalent_array(self):
+        self._assert_equivalent()
+
+    @patch.object(batch, 'numpy', None)
+    def test_convert_columns(self):
+        containers = [
+            {'id': 'a', 'cpus': 0.25, 'mem': 512},
+            {'id': 'b'},
+            {'id': 'c', 'cpus': 2, 'mem': 1},
+        ]
+        transformer = MarathonTransformer()
+
+        columns = convert_columns(
+            compile_plan('marathon', 'marathon', fast_path=False),
+            containers,
+            'marathon',
+            'marathon',
+            transformer,
+            transformer
+        )
+
+        self.assertEqual(columns['cpu'], [0.25, None, 2.0])
+        self.assertEqual(columns['memory'], [512, None, 4])
+
+    def test_convert_columns_fallback(self):
+        # Values that don't fit a column are converted one at a time
+        containers = [{'id': 'a', 'mem': 1 << 50}]
+        transformer = MarathonTransformer()
+
+        columns = convert_columns(
+            compile_plan('marathon', 'marathon', fast_path=False),
+            containers,
+            'marathon',
+            'marathon',
+            transformer,
+            transformer
+        )
+
+        self.assertEqual(columns['memory'], [1 << 50])
+
+    def test_batch_large_export(self):
+        apps = [
+            {
+                'id': 'app-{}'.format(i),
+                'cpus': (i % 8) / 4 or 0.1,
+                'mem': 64 + i,
+                'container': {'docker': {'image': 'me/app'}},
+            }
+            for i
+            in range(500)
+        ]
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as f:
+            json.dump(apps, f)
+            f.flush()
+
+            scalar = Converter(f.name, 'marathon', 'ecs').convert()
+            batched = Converter(f.name, 'marathon', 'ecs', batch=True).convert()
+
+        self.assertEqual(scalar, batched)
@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from container_transform.cache import ConversionCache
+from container_transform.converter import Converter
+
+
+SIDECAR = (
+    'logs:\n'
+    '  image: me/log-shipper\n'
+    '  mem_limit: 64m\n'
+    '  volumes:\n'
+    '    - /var/log:/var/log:ro\n'
+)
+
+
+class ConversionCacheTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filenames = []
+        for name in ('web', 'worker'):
+            filename = os.path.join(self.directory, '{}.yml'.format(name))
+            with open(filename, 'w') as f:
+                f.write('{}:\n  image: me/{}\n  mem_limit: 256m\n'.format(name, name))
+                f.write(SIDECAR)
+            self.filenames.append(filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_dedup_across_files(self):
+        cache = ConversionCache()
+
+        outputs = [
+            Converter(filename, 'compose', 'ecs', dedup=cache).convert()
+            for filename
+            in self.filenames
+        ]
+
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(
+            outputs,
+            [Converter(filename, 'compose', 'ecs').convert() for filename in self.filenames]
+        )
+
+    def test_dedup_messages(self):
+        cache = ConversionCache()
+        for filename in self.filenames:
+            conv = Converter(filename, 'compose', 'ecs', dedup=cache)
+            conv.convert()
+
+            plain = Converter(filename, 'compose', 'ecs')
+            plain.convert()
+            self.assertEqual(conv.messages, plain.messages)
+
+    def test_dedup_same_definition(self):
+        # Identical services in one file are converted once, under their own names
+        filename = os.path.join(self.directory, 'replicas.yml')
+        with open(filename, 'w') as f:
+            for name in ('worker1', 'worker2'):
+                f.write('{}:\n  mem_limit: 64m\n  volumes:\n    - /data:/data\n'.format(name))
+
+        for output_type in ('ecs', 'kubernetes', 'systemd'):
+            cache = ConversionCache()
+            conv = Converter(filename, 'compose', output_type, dedup=cache)
+            plain = Converter(filename, 'compose', output_type)
+
+            self.assertEqual(conv.convert(), plain.convert())
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(conv.messages, plain.messages)
+            self.assertEqual(len(conv.messages), 2)
+
+    def test_dedup_kubernetes_volume_names(self):
+        # Host paths whose volume names collide, converted separately
+        filename = os.path.join(self.directory, 'volumes.yml')
+        with open(filename, 'w') as f:
+            f.write(
+                'one:\n  image: one\n  volumes:\n    - /a-b:/x\n'
+                'two:\n  image: two\n  volumes:\n    - /a/b:/y\n'
+            )
+        manifest = os.path.join(self.directory, 'manifest.json')
+
+        want = Converter(filename, 'compose', 'kubernetes').convert()
+        self.assertIn('a-b-2', want)
+
+        self.assertEqual(Converter(filename, 'compose', 'kubernetes', dedup=True).convert(), want)
+        for _ in range(2):
+            # Converted, then reused from the manifest
+            self.assertEqual(
+                Converter(filename, 'compose', 'kubernetes', manifest=manifest).convert(),
+                want
+            )
+
+    def test_dedup_copies(self):
+        cache = ConversionCache()
+        cache.put('key', {'name': 'logs'}, {}, set())
+
+        first = cache.get('key')
+        first['container']['name'] = 'changed'
+
+        self.assertEqual(cache.get('key')['container'], {'name': 'logs'})
+
+    def test_dedup_settings(self):
+        # The same definition converted with different settings isn't reused
+        cache = ConversionCache()
+        for kind in ('Deployment', 'Job'):
+            Converter(
+                self.filenames[0], 'compose', 'kubernetes',
+                output_options={'kind': kind}, dedup=cache
+            ).convert()
+
+        self.assertEqual(cache.hits, 0)
+
+    def test_dedup_true(self):
+        conv = Converter(self.filenames[0], 'compose', 'ecs', dedup=True)
+        conv.convert()
+
+        self.assertIsInstance(conv.cache, ConversionCache)
+        self.assertEqual(conv.cache.misses, 2)
@@ -29,6 +29,45 @@ class ChronosTransformerTests(TestCase):
             'report_task'
         )
 
+    def test_validate_schedule(self):
+        """
+        Test .validate() gives every job the same schedule
+        """
+        first = self.transformer.validate({'name': 'first'})
+        second = self.transformer.validate({'name': 'second'})
+
+        self.assertEqual(first['schedule'], self.transformer.schedule)
+        self.assertEqual(second['schedule'], self.transformer.schedule)
+
+        transformer = ChronosTransformer(schedule='R/2016-01-01T00:00:00Z/P1D')
+        self.assertEqual(
+            transformer.validate({'name': 'first'})['schedule'],
+            'R/2016-01-01T00:00:00Z/P1D'
+        )
+
+    def test_validate_parameters_sorted(self):
+        """
+        Test .validate() sorts parameters by key, then value
+        """
+        container = {
+            'name': 'report_task',
+            'container.parameters.label': [
+                {'key': 'label', 'value': 'b=2'},
+                {'key': 'env', 'value': 'A=1'},
+                {'key': 'label', 'value': 'a=1'},
+            ]
+        }
+
+        validated = self.transformer.validate(container)
+        self.assertEqual(
+            validated['container']['parameters'],
+            [
+                {'key': 'env', 'value': 'A=1'},
+                {'key': 'label', 'value': 'a=1'},
+                {'key': 'label', 'value': 'b=2'},
+            ]
+        )
+
     def test_ingest_cpu(self):
         cpu = 0.5
         self.assertEqual(
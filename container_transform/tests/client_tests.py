@@ -1,9 +1,13 @@
+import gzip
+import lzma
 import os
 import json
 from unittest import TestCase
 
 
+import yaml
 from click.testing import CliRunner
+from mock import patch
 
 from container_transform.client import transform
 
@@ -224,6 +228,17 @@ class ClientTests(TestCase):
         result_data = json.loads(result.output)
         self.assertIsInstance(result_data, dict)
 
+    def test_prompt_compose_marathon_json_backend(self):
+        runner = CliRunner()
+        input_file = '{}/marathon-test.yaml'.format(os.path.dirname(__file__))
+        args = [input_file, '-q', '--output-type', 'marathon', '--no-verbose']
+
+        expected = runner.invoke(transform, args)
+        result = runner.invoke(transform, args + ['--json-backend', 'auto'])
+
+        assert result.exit_code == 0
+        self.assertEqual(result.output, expected.output)
+
     def test_prompt_compose_to_chronos_quiet(self):
         runner = CliRunner()
         input_file = '{}/marathon-test.yaml'.format(os.path.dirname(__file__))
@@ -350,3 +365,173 @@ class ClientTests(TestCase):
             result.output,
             service_contents
         )
+
+    def test_prompt_compose_compress(self):
+        runner = CliRunner()
+        input_file = '{}/composev2.yml'.format(os.path.dirname(__file__))
+
+        result = runner.invoke(
+            transform,
+            [input_file, '-q', '--no-verbose', '--compress', 'gzip'])
+        assert result.exit_code == 0
+
+        result_data = json.loads(gzip.decompress(result.stdout_bytes).decode('utf-8'))
+        self.assertEqual(result_data['containerDefinitions'][0]['name'], 'web')
+
+    def test_prompt_compose_output_file(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose-web.yml'.format(os.path.dirname(__file__))
+        service_file = '{}/web.service'.format(os.path.dirname(__file__))
+
+        with runner.isolated_filesystem():
+            result = runner.invoke(
+                transform,
+                [input_file, '-q', '-o', 'systemd', '--output', 'web.service'])
+            assert result.exit_code == 0
+            self.assertEqual(result.output, '')
+
+            with open('web.service') as f:
+                output = f.read()
+            self.assertEqual(os.listdir('.'), ['web.service'])
+
+        with open(service_file) as f:
+            self.assertEqual(output, f.read())
+
+    def test_prompt_compose_output_file_compress(self):
+        runner = CliRunner()
+        input_file = '{}/composev2.yml'.format(os.path.dirname(__file__))
+
+        with runner.isolated_filesystem():
+            result = runner.invoke(
+                transform,
+                [input_file, '-q', '-O', 'task.json.xz', '--compress', 'lzma'])
+            assert result.exit_code == 0
+
+            with open('task.json.xz', 'rb') as f:
+                result_data = json.loads(lzma.decompress(f.read()).decode('utf-8'))
+        self.assertEqual(result_data['containerDefinitions'][0]['name'], 'web')
+
+    @patch('container_transform.client.click.get_text_stream')
+    def test_prompt_compose_tty(self, mock_get_text_stream):
+        mock_get_text_stream.return_value.isatty.return_value = True
+        runner = CliRunner()
+        input_file = '{}/composev2.yml'.format(os.path.dirname(__file__))
+
+        result = runner.invoke(transform, [input_file, '-q'], color=True)
+        assert result.exit_code == 0
+        self.assertTrue(result.output.startswith('\x1b[32m{'))
+
+    def test_prompt_compose_override(self):
+        runner = CliRunner()
+
+        with runner.isolated_filesystem():
+            with open('docker-compose.yml', 'w') as f:
+                f.write(self.yaml_input)
+            with open('docker-compose.prod.yml', 'w') as f:
+                f.write('web2:\n  image: me/myapp\n')
+
+            result = runner.invoke(
+                transform, ['docker-compose.yml', '-f', 'docker-compose.prod.yml'])
+            assert result.exit_code == 0
+
+            data = json.loads(result.output)
+
+        self.assertIn(
+            {
+                'name': 'web2',
+                'image': 'me/myapp',
+                'memory': 4,
+                'essential': True
+            },
+            data['containerDefinitions'],
+        )
+
+    def test_prompt_override_not_compose(self):
+        runner = CliRunner()
+        input_file = '{}/task.json'.format(os.path.dirname(__file__))
+
+        result = runner.invoke(
+            transform, [input_file, '-i', 'ecs', '-o', 'compose', '-f', input_file])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('--override requires compose input', result.output)
+
+    def test_prompt_compose_interpolate(self):
+        runner = CliRunner()
+
+        with runner.isolated_filesystem():
+            with open('docker-compose.yml', 'w') as f:
+                f.write('web:\n  image: me/myapp:${TAG}\n  mem_limit: ${MEMORY:-1024b}\n')
+            with open('.env', 'w') as f:
+                f.write('TAG=1.0\n')
+
+            result = runner.invoke(transform, ['docker-compose.yml', '--interpolate'])
+            assert result.exit_code == 0
+
+            data = json.loads(result.output)
+
+        self.assertEqual(
+            [{
+                'name': 'web',
+                'image': 'me/myapp:1.0',
+                'memory': 4,
+                'essential': True
+            }],
+            data['containerDefinitions'],
+        )
+
+    def test_prompt_compose_kubernetes_split(self):
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            with open('docker-compose.yml', 'w') as f:
+                f.write(self.yaml_input)
+
+            result = runner.invoke(
+                transform,
+                ['docker-compose.yml', '-q', '-o', 'kubernetes', '--split',
+                 '--api-version', 'apps/v1']
+            )
+            assert result.exit_code == 0
+
+            output = list(yaml.safe_load_all(result.output))
+        self.assertEqual([o['metadata']['name'] for o in output], ['web', 'web2'])
+        self.assertEqual({o['apiVersion'] for o in output}, {'apps/v1'})
+
+    def test_prompt_kind_not_kubernetes(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose.yml'.format(os.path.dirname(__file__))
+
+        result = runner.invoke(transform, [input_file, '-o', 'ecs', '--kind', 'Job'])
+
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('require kubernetes output', result.output)
+
+    def test_prompt_incremental_options(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose.yml'.format(os.path.dirname(__file__))
+
+        for args in (['--dedup', '--workers', '2'], ['--manifest', 'm.json', '--batch']):
+            result = runner.invoke(transform, [input_file] + args)
+
+            self.assertEqual(result.exit_code, 2)
+            self.assertIn("can't be used with --dedup or --manifest", result.output)
+
+    def test_prompt_validate_only(self):
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            with open('docker-compose.yml', 'w') as f:
+                f.write('web:\n  image: me/myapp\n  cpu_shares: high\n')
+
+            result = runner.invoke(transform, ['docker-compose.yml', '--validate-only'])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('Container web: "cpu_shares" cpu should be a number', result.output)
+        self.assertNotIn('containerDefinitions', result.output)
+
+    def test_prompt_validate_only_valid(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose.yml'.format(os.path.dirname(__file__))
+
+        result = runner.invoke(transform, [input_file, '--validate-only', '-q'])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, '')
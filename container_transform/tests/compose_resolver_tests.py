@@ -0,0 +1,174 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import yaml
+
+from container_transform.compose import ComposeTransformer
+from container_transform.compose_resolver import ComposeResolver, merge_service
+
+
+class MergeServiceTests(TestCase):
+    """
+    Tests for merge_service()
+    """
+
+    def test_merge_service(self):
+        base = {
+            'image': 'web:1',
+            'ports': ['80:80'],
+            'environment': ['A=1', 'B=2'],
+            'labels': {'team': 'web'},
+            'volumes': ['/data:/data', '/logs:/var/log:ro'],
+            'command': 'serve',
+        }
+        override = {
+            'image': 'web:2',
+            'ports': ['443:443'],
+            'environment': {'B': '3', 'C': '4'},
+            'labels': ['tier=front'],
+            'volumes': ['/other-logs:/var/log'],
+            'mem_limit': '1g',
+        }
+
+        merged = merge_service(base, override)
+
+        self.assertEqual(merged, {
+            'image': 'web:2',
+            'ports': ['80:80', '443:443'],
+            'environment': {'A': '1', 'B': '3', 'C': '4'},
+            'labels': {'team': 'web', 'tier': 'front'},
+            'volumes': ['/data:/data', '/other-logs:/var/log'],
+            'command': 'serve',
+            'mem_limit': '1g',
+        })
+        self.assertEqual(base['ports'], ['80:80'])
+        self.assertEqual(base['environment'], ['A=1', 'B=2'])
+
+    def test_merge_service_single_values(self):
+        merged = merge_service(
+            {'dns': '8.8.8.8', 'volumes': [{'type': 'bind', 'target': '/data'}]},
+            {'dns': '8.8.4.4', 'volumes': ['/srv:/data'], 'image': None},
+        )
+        self.assertEqual(merged, {
+            'dns': ['8.8.8.8', '8.8.4.4'],
+            'volumes': ['/srv:/data'],
+            'image': None,
+        })
+
+
+class ComposeResolverTests(TestCase):
+    """
+    Tests for ComposeResolver
+    """
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.loads = []
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def write(self, filename, data):
+        path = os.path.join(self.tempdir, filename)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as f:
+            yaml.safe_dump(data, f)
+        return path
+
+    def loader(self, filename):
+        self.loads.append(filename)
+        with open(filename) as f:
+            return yaml.safe_load(f)
+
+    def test_resolve_single_file(self):
+        data = {'version': '2', 'services': {'web': {'image': 'web'}}}
+        filename = self.write('docker-compose.yml', data)
+
+        self.assertEqual(ComposeResolver(self.loader).resolve([filename]), data)
+
+    def test_resolve_extends_across_files(self):
+        self.write('common/common.yml', {
+            'version': '2',
+            'services': {
+                'base': {'image': 'base', 'environment': {'A': '1'}, 'links': ['db']},
+                'app': {'extends': 'base', 'command': 'run', 'ports': ['80']},
+            },
+        })
+        filename = self.write('docker-compose.yml', {
+            'version': '2',
+            'services': dict(
+                ('app{}'.format(i), {
+                    'extends': {'file': 'common/common.yml', 'service': 'app'},
+                    'environment': {'B': str(i)},
+                    'ports': ['90'],
+                })
+                for i in range(20)
+            ),
+            'volumes': {'data': {}},
+        })
+
+        document = ComposeResolver(self.loader).resolve([filename])
+
+        self.assertEqual(len(self.loads), 2)
+        self.assertEqual(document['version'], '2')
+        self.assertEqual(document['volumes'], {'data': {}})
+        self.assertEqual(document['services']['app3'], {
+            'image': 'base',
+            'command': 'run',
+            'environment': {'A': '1', 'B': '3'},
+            'ports': ['80', '90'],
+        })
+
+    def test_resolve_overrides(self):
+        base = self.write('docker-compose.yml', {
+            'web': {'image': 'web', 'ports': ['80:80']},
+            'db': {'image': 'postgres'},
+        })
+        override = self.write('docker-compose.prod.yml', {
+            'web': {'image': 'web:prod', 'ports': ['443:443']},
+            'worker': {'extends': 'web', 'command': 'work'},
+        })
+
+        services = ComposeResolver(self.loader).resolve([base, override])
+
+        self.assertEqual(services, {
+            'web': {'image': 'web:prod', 'ports': ['80:80', '443:443']},
+            'db': {'image': 'postgres'},
+            'worker': {'image': 'web:prod', 'ports': ['443:443'], 'command': 'work'},
+        })
+
+    def test_resolve_circular_extends(self):
+        filename = self.write('docker-compose.yml', {
+            'a': {'extends': 'b'},
+            'b': {'extends': 'a'},
+        })
+        with self.assertRaises(ValueError):
+            ComposeResolver(self.loader).resolve([filename])
+
+    def test_resolve_missing_service(self):
+        filename = self.write('docker-compose.yml', {'a': {'extends': 'b'}})
+        with self.assertRaises(ValueError):
+            ComposeResolver(self.loader).resolve([filename])
+
+    def test_compose_transformer_files(self):
+        base = self.write('docker-compose.yml', {
+            'version': '2',
+            'services': {'web': {'image': 'web', 'volumes': ['/data:/data']}},
+        })
+        override = self.write('docker-compose.override.yml', {
+            'version': '2',
+            'services': {'web': {'mem_limit': '1g'}},
+        })
+
+        transformer = ComposeTransformer([base, override])
+
+        self.assertEqual(transformer.stream_version, 2)
+        self.assertEqual(transformer.ingest_containers(), [{
+            'name': 'web',
+            'image': 'web',
+            'volumes': ['/data:/data'],
+            'mem_limit': '1g',
+        }])
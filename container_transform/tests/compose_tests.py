@@ -1,9 +1,11 @@
 from unittest import TestCase
 
+import yaml
 from mock import patch
 import uuid
 
 from container_transform.compose import ComposeTransformer
+from container_transform.hashing import content_name
 
 
 class ComposeTransformerTests(TestCase):
@@ -12,10 +14,10 @@ class ComposeTransformerTests(TestCase):
         self.file_name = './container_transform/tests/docker-compose.yml'
         self.transformer = ComposeTransformer(self.file_name)
 
-    @patch.object(uuid, 'uuid4', return_value='2e9c3538-b9d3-4f47-8a23-2a19315b370b')
-    def test_emit_containers_no_name(self, mock_uuid):
+    def test_emit_containers_no_name(self):
         """
-        Test .emit_containers() for a container without a name
+        Test .emit_containers() names a container without a name after its
+        content
         """
         containers = [{
             'image': 'postgres:9.3',
@@ -27,14 +29,35 @@ class ComposeTransformerTests(TestCase):
         self.assertEqual(
             (
                 'services:\n'
-                '  {mock_uuid}:\n'
+                '  {name}:\n'
                 '    cpu: 200\n'
                 '    image: postgres:9.3\n'
                 'version: \'2\'\n'
-            ).format(mock_uuid=mock_uuid.return_value),
+            ).format(name=content_name({'image': 'postgres:9.3', 'cpu': 200})),
             output
         )
 
+    def test_emit_containers_identical_no_name(self):
+        """
+        Test .emit_containers() keeps identical containers without a name
+        """
+        containers = [{'image': 'postgres:9.3'}, {'image': 'postgres:9.3'}]
+
+        output = yaml.safe_load(self.transformer.emit_containers(containers))
+
+        self.assertEqual(len(output['services']), 2)
+
+    @patch.object(uuid, 'uuid4', return_value=uuid.UUID('2e9c3538-b9d3-4f47-8a23-2a19315b370b'))
+    def test_emit_containers_random_names(self, mock_uuid):
+        """
+        Test .emit_containers() with random names
+        """
+        transformer = ComposeTransformer(random_names=True)
+
+        output = transformer.emit_containers([{'image': 'postgres:9.3'}])
+
+        self.assertIn('  2e9c3538b9d3:\n', output)
+
     def test_emit_mapping(self):
         """
         Test ._emit_mapping()
@@ -105,6 +128,37 @@ class ComposeTransformerTests(TestCase):
             }
         )
 
+    def test_parse_port_mapping_range(self):
+        """
+        Test ._parse_port_mapping() keeps port ranges as spans
+        """
+        self.assertEqual(
+            self.transformer._parse_port_mapping('8000-8100:9000-9100'),
+            {
+                'host_port': 8000,
+                'host_port_end': 8100,
+                'container_port': 9000,
+                'container_port_end': 9100,
+                'protocol': 'tcp'
+            }
+        )
+        self.assertEqual(
+            self.transformer._parse_port_mapping('9000-9999/udp'),
+            {
+                'container_port': 9000,
+                'container_port_end': 9999,
+                'protocol': 'udp'
+            }
+        )
+
+    def test_emit_port_mappings_range(self):
+        mappings = ['127.0.0.1:8000-8100:9000-9100', '9000-9999/udp']
+
+        self.assertEqual(
+            self.transformer.emit_port_mappings(self.transformer.ingest_port_mappings(mappings)),
+            mappings
+        )
+
     def test_ingest_cpu(self):
         cpu = 100
         self.assertEqual(
@@ -1,7 +1,12 @@
 import json
+import tempfile
+from datetime import datetime
 from unittest import TestCase
 
-from container_transform.converter import Converter
+import yaml
+from mock import patch
+
+from container_transform.converter import Converter, compile_plan
 
 
 class ConverterTests(TestCase):
@@ -16,6 +21,17 @@ class ConverterTests(TestCase):
 
         self.assertEqual(0, len(conv.messages))
 
+    def test_ecs_converter_deterministic(self):
+        filename = './container_transform/tests/task.json'
+
+        outputs = [Converter(filename, 'ecs', 'compose').convert() for _ in range(2)]
+        random = Converter(
+            filename, 'ecs', 'compose', input_options={'random_names': True}
+        ).convert()
+
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertNotEqual(random, outputs[0])
+
     def test_ecs_converter_just_containers(self):
         filename = './container_transform/tests/containers.json'
         conv = Converter(filename, 'ecs', 'compose')
@@ -91,3 +107,167 @@ class ConverterTests(TestCase):
 
         output_want = open(output_filename, 'r').read()
         self.assertEqual(output, output_want)
+
+    def test_compose_converter_v2_to_ecs_parallel(self):
+        self.maxDiff = None
+
+        filename = './container_transform/tests/composev2_extended.yml'
+
+        conv = Converter(filename, 'compose', 'ecs')
+        output = conv.convert()
+        parallel_conv = Converter(filename, 'compose', 'ecs', workers=2, chunk_size=1)
+        parallel_output = parallel_conv.convert()
+
+        self.assertEqual(output, parallel_output)
+        self.assertEqual(conv.messages, parallel_conv.messages)
+
+    def test_compose_converter_to_k8s_parallel(self):
+        self.maxDiff = None
+
+        filename = './container_transform/tests/k8s_tests/dns-compose.yaml'
+
+        output = Converter(filename, 'compose', 'kubernetes').convert()
+        parallel_output = Converter(filename, 'compose', 'kubernetes', workers=2).convert()
+
+        self.assertEqual(output, parallel_output)
+
+    def test_compose_converter_to_k8s_parallel_volume_names(self):
+        # Host paths whose volume names collide in different chunks
+        with tempfile.NamedTemporaryFile('w', suffix='.yml') as f:
+            f.write(
+                'one:\n  image: one\n  volumes:\n    - /a-b:/x\n'
+                'two:\n  image: two\n  volumes:\n    - /a/b:/y\n'
+            )
+            f.flush()
+
+            output = Converter(f.name, 'compose', 'kubernetes').convert()
+            parallel_output = Converter(f.name, 'compose', 'kubernetes', workers=2).convert()
+
+        self.assertEqual(output, parallel_output)
+        pod = yaml.safe_load(parallel_output)['spec']['template']['spec']
+        self.assertEqual(
+            pod['volumes'],
+            [
+                {'name': 'a-b', 'hostPath': {'path': '/a-b'}},
+                {'name': 'a-b-2', 'hostPath': {'path': '/a/b'}},
+            ]
+        )
+        self.assertEqual(
+            [c['volumeMounts'][0]['name'] for c in pod['containers']],
+            ['a-b', 'a-b-2']
+        )
+
+    def test_converter_parallel_messages(self):
+        filename = './container_transform/tests/docker-compose.yml'
+
+        conv = Converter(filename, 'compose', 'marathon')
+        output = conv.convert()
+        parallel_conv = Converter(filename, 'compose', 'marathon', workers=3)
+        parallel_output = parallel_conv.convert()
+
+        self.assertEqual(output, parallel_output)
+        self.assertEqual(conv.messages, parallel_conv.messages)
+
+    def test_converter_parallel_single_chunk(self):
+        filename = './container_transform/tests/containers.json'
+
+        output = Converter(filename, 'ecs', 'compose').convert()
+        parallel_output = Converter(
+            filename, 'ecs', 'compose', workers=2, chunk_size=100
+        ).convert()
+
+        self.assertEqual(output, parallel_output)
+
+    @patch('container_transform.chronos.datetime')
+    def test_same_format_fast_path(self, mock_datetime):
+        """
+        Converting a format to itself copies passthrough parameters, and gives
+        the same output as calling every ingest and emit method.
+        """
+        self.maxDiff = None
+        mock_datetime.utcnow.return_value = datetime(2016, 1, 1)
+
+        fixtures = [
+            ('compose', 'docker-compose.yml'),
+            ('compose', 'composev2.yml'),
+            ('compose', 'composev2_extended.yml'),
+            ('marathon', 'marathon-test.json'),
+            ('marathon', 'marathon-group.json'),
+            ('chronos', 'fixtures/chronos-list.json'),
+            ('kubernetes', 'k8s_tests/dns.yaml'),
+        ]
+        for transformation_type, filename in fixtures:
+            filename = './container_transform/tests/{}'.format(filename)
+
+            conv = Converter(filename, transformation_type, transformation_type)
+            self.assertTrue(any(step.copy for step in conv._plan))
+            output = conv.convert()
+
+            full_conv = Converter(filename, transformation_type, transformation_type)
+            full_conv._plan = compile_plan(
+                transformation_type, transformation_type, fast_path=False
+            )
+            self.assertFalse(any(step.copy for step in full_conv._plan))
+
+            self.assertEqual(output, full_conv.convert())
+            self.assertEqual(conv.messages, full_conv.messages)
+
+    def test_same_format_fast_path_ecs(self):
+        for filename in ('task.json', 'containers.json'):
+            filename = './container_transform/tests/{}'.format(filename)
+
+            output = Converter(filename, 'ecs', 'ecs').convert()
+            full_conv = Converter(filename, 'ecs', 'ecs')
+            full_conv._plan = compile_plan('ecs', 'ecs', fast_path=False)
+
+            self.assertEqual(output, full_conv.convert())
+
+            with open(filename) as f:
+                definitions = json.load(f)
+            if isinstance(definitions, dict):
+                definitions = definitions['containerDefinitions']
+            self.assertEqual(
+                [
+                    definition['volumesFrom']
+                    for definition in json.loads(output)['containerDefinitions']
+                    if 'volumesFrom' in definition
+                ],
+                [
+                    definition['volumesFrom']
+                    for definition in definitions
+                    if 'volumesFrom' in definition
+                ]
+            )
+
+    def test_ecs_volumes_from_to_other_formats(self):
+        filename = './container_transform/tests/task.json'
+
+        compose_output = yaml.safe_load(Converter(filename, 'ecs', 'compose').convert())
+        self.assertIn(
+            ['web:ro', 'web2'],
+            [service.get('volumes_from') for service in compose_output['services'].values()]
+        )
+
+        systemd_output = Converter(filename, 'ecs', 'systemd').convert()
+        self.assertIn('--volumes-from web:ro', systemd_output)
+        self.assertIn('--volumes-from web2 ', systemd_output)
+
+    def test_compile_plan_other_format(self):
+        self.assertFalse(any(step.copy for step in compile_plan('compose', 'ecs')))
+
+    def test_converter_port_ranges(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.yml') as f:
+            f.write('relay:\n  image: me/relay\n  ports:\n    - "10000-10999:10000-10999/udp"\n')
+            f.flush()
+
+            systemd_output = Converter(f.name, 'compose', 'systemd').convert()
+            ecs_output = json.loads(Converter(f.name, 'compose', 'ecs').convert())
+
+        self.assertIn('-p 10000-10999:10000-10999/udp', systemd_output)
+
+        port_mappings = ecs_output['containerDefinitions'][0]['portMappings']
+        self.assertEqual(len(port_mappings), 1000)
+        self.assertEqual(
+            port_mappings[-1],
+            {'hostPort': 10999, 'containerPort': 10999, 'protocol': 'udp'}
+        )
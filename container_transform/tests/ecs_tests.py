@@ -1,3 +1,4 @@
+import json
 from unittest import TestCase
 
 from mock import patch
@@ -15,24 +16,81 @@ class ECSTransformerTests(TestCase):
         self.file_name = './container_transform/tests/task.json'
         self.transformer = ECSTransformer(self.file_name)
 
-    @patch.object(uuid, 'uuid4', return_value='2e9c3538-b9d3-4f47-8a23-2a19315b370b')
-    def test_validate(self, mock_uuid):
+    def test_validate(self):
         """
         Test .validate()
         """
-        container = {
-            'image': 'postgres:9.3',
-            'cpu': 200,
-            'memory': 40
-        }
+        validated = self.transformer.validate({'image': 'postgres:9.3'})
 
-        validated = self.transformer.validate(container)
-        self.assertEqual(
-            validated['name'],
-            mock_uuid.return_value
-        )
         self.assertTrue(validated['essential'])
 
+    def _names(self, transformer, containers):
+        output = json.loads(transformer.emit_containers(containers))
+        return [container['name'] for container in output['containerDefinitions']]
+
+    def test_emit_containers_names(self):
+        """
+        Test .emit_containers() names containers after their content
+        """
+        names = self._names(self.transformer, [
+            {'image': 'postgres:9.3', 'cpu': 200, 'memory': 40},
+            {'image': 'redis'},
+        ])
+        again = self._names(ECSTransformer(), [
+            {'memory': 40, 'image': 'postgres:9.3', 'cpu': 200},
+            {'image': 'redis'},
+        ])
+
+        self.assertEqual(names, again)
+        self.assertEqual(len(set(names)), 2)
+        for name in names:
+            self.assertRegex(name, '^[0-9a-f]{12}$')
+
+    def test_emit_containers_identical_no_name(self):
+        """
+        Test .emit_containers() gives identical containers without a name
+        different names
+        """
+        names = self._names(self.transformer, [{'image': 'redis'}, {'image': 'redis'}])
+
+        self.assertEqual(len(set(names)), 2)
+
+    @patch.object(uuid, 'uuid4', return_value=uuid.UUID('2e9c3538-b9d3-4f47-8a23-2a19315b370b'))
+    def test_emit_containers_random_names(self, mock_uuid):
+        """
+        Test .emit_containers() with random names
+        """
+        transformer = ECSTransformer(random_names=True)
+
+        self.assertEqual(self._names(transformer, [{'image': 'postgres:9.3'}]), ['2e9c3538b9d3'])
+
+    def test_ingest_volumes_param(self):
+        """
+        Test .ingest_volumes_param() gives volumes without a source path the
+        same host path every time
+        """
+        volumes = [
+            {'name': 'data', 'host': {}},
+            {'name': 'logs', 'host': {'sourcePath': '/var/log'}},
+        ]
+
+        first = self.transformer.ingest_volumes_param(volumes, 'web', ['web'])
+        second = ECSTransformer().ingest_volumes_param(volumes, 'web', ['web'])
+
+        self.assertEqual(first, second)
+        self.assertRegex(first['data']['path'], '^/tmp/[0-9a-f]{8}$')
+        self.assertEqual(first['logs'], {'path': '/var/log', 'readonly': False})
+
+        # Other tasks with the same volume get their own directory
+        self.assertNotEqual(
+            self.transformer.ingest_volumes_param(volumes, 'worker', ['web'])['data'],
+            first['data']
+        )
+        self.assertNotEqual(
+            self.transformer.ingest_volumes_param(volumes, 'web', ['worker'])['data'],
+            first['data']
+        )
+
     def test_ingest_cpu(self):
         cpu = 100
         self.assertEqual(
@@ -0,0 +1,109 @@
+import json
+import os
+from unittest import TestCase
+
+from click.testing import CliRunner
+
+from container_transform.client import transform
+from container_transform.converter import Converter
+from container_transform.hashing import container_hash, document_hash, field_hash
+
+
+class HashingTests(TestCase):
+
+    def test_field_hash_order_independent(self):
+        self.assertEqual(
+            field_hash('logging', {'driver': 'gelf', 'options': {'a': 1, 'b': 2}}),
+            field_hash('logging', {'options': {'b': 2, 'a': 1}, 'driver': 'gelf'})
+        )
+        self.assertNotEqual(field_hash('cpu', 1), field_hash('memory', 1))
+
+    def test_container_hash(self):
+        first = {'name': 'web', 'image': 'me/web', 'schedule': 'R/now/PT1H'}
+        second = {'schedule': 'R/later/PT1H', 'image': 'me/web', 'name': 'web'}
+
+        self.assertNotEqual(container_hash(first), container_hash(second))
+        self.assertEqual(
+            container_hash(first, frozenset(['schedule'])),
+            container_hash(second, frozenset(['schedule']))
+        )
+
+    def test_document_hash(self):
+        self.assertEqual(document_hash(['a', 'b']), document_hash(['b', 'a']))
+        self.assertNotEqual(
+            document_hash(['a'], {'volumes': []}),
+            document_hash(['a'], {'volumes': [{'name': 'data'}]})
+        )
+
+    def test_converter_hashes(self):
+        filename = './container_transform/tests/docker-compose.yml'
+
+        conv = Converter(filename, 'compose', 'chronos', hashes=True)
+        conv.convert()
+        again = Converter(filename, 'compose', 'chronos', hashes=True)
+        again.convert()
+
+        self.assertIn('web', conv.container_hashes)
+        self.assertEqual(conv.container_hashes, again.container_hashes)
+        self.assertEqual(conv.document_hash, again.document_hash)
+
+    def test_converter_hashes_settings(self):
+        filename = './container_transform/tests/docker-compose.yml'
+
+        def hashes(output_type, **output_options):
+            conv = Converter(
+                filename, 'compose', output_type, hashes=True, output_options=output_options
+            )
+            conv.convert()
+            return conv.container_hashes, conv.document_hash
+
+        daily = hashes('chronos', schedule='R/2016-01-01T00:00:00/P1D')
+        hourly = hashes('chronos', schedule='R/2016-01-01T00:00:00/PT1H')
+        default = hashes('chronos')
+        self.assertEqual(daily, hashes('chronos', schedule='R/2016-01-01T00:00:00/P1D'))
+        self.assertNotEqual(daily[0], hourly[0])
+        self.assertNotEqual(daily[1], hourly[1])
+        self.assertNotEqual(daily[1], default[1])
+
+        self.assertNotEqual(
+            hashes('kubernetes', kind='Job')[1],
+            hashes('kubernetes', kind='Deployment')[1]
+        )
+
+    def test_converter_hashes_same_name(self):
+        conv = Converter(
+            './container_transform/tests/docker-compose.yml', 'compose', 'ecs', hashes=True
+        )
+        containers = [{'name': 'web', 'image': 'a'}, {'name': 'web', 'image': 'b'}]
+
+        conv._hash(conv._output_class(), containers)
+
+        self.assertEqual(
+            conv.container_hashes,
+            {'web': container_hash(containers[0]), 'web[1]': container_hash(containers[1])}
+        )
+        self.assertEqual(len(conv.messages), 1)
+
+    def test_converter_no_hashes(self):
+        conv = Converter('./container_transform/tests/docker-compose.yml', 'compose', 'ecs')
+        conv.convert()
+
+        self.assertEqual(conv.container_hashes, {})
+        self.assertIsNone(conv.document_hash)
+
+    def test_prompt_hashes(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose.yml'.format(os.path.dirname(__file__))
+
+        with runner.isolated_filesystem():
+            result = runner.invoke(
+                transform, [input_file, '-q', '-o', 'marathon', '--hashes', 'hashes.json'])
+            assert result.exit_code == 0
+
+            with open('hashes.json') as f:
+                hashes = json.load(f)
+
+        conv = Converter(input_file, 'compose', 'marathon', hashes=True)
+        conv.convert()
+        self.assertEqual(hashes['document'], conv.document_hash)
+        self.assertEqual(hashes['containers'], conv.container_hashes)
@@ -0,0 +1,90 @@
+import io
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase, skipUnless
+
+from mock import patch
+
+from container_transform.converter import Converter
+from container_transform.input import load_json, open_input
+
+
+class UnmappableFile(mmap.mmap):
+
+    def __new__(cls, *args, **kwargs):
+        raise OSError('No such device')
+
+
+class InputTests(TestCase):
+    """
+    Tests for the input reading helpers
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, data):
+        filename = os.path.join(self.directory, name)
+        with open(filename, 'wb') as f:
+            f.write(data)
+        return filename
+
+    def test_open_input_maps_regular_files(self):
+        filename = self._write('task.json', b'{"family": "web"}')
+
+        with open_input(filename) as stream:
+            self.assertIsInstance(stream, mmap.mmap)
+            self.assertEqual(load_json(stream), {'family': 'web'})
+        self.assertTrue(stream.closed)
+
+    def test_open_input_streams_empty_files(self):
+        filename = self._write('empty.yml', b'')
+
+        with open_input(filename) as stream:
+            self.assertNotIsInstance(stream, mmap.mmap)
+            self.assertEqual(stream.read(), b'')
+
+    def test_open_input_falls_back_when_mapping_fails(self):
+        filename = self._write('task.json', b'[]')
+
+        with patch('container_transform.input.mmap.mmap', UnmappableFile):
+            with open_input(filename) as stream:
+                self.assertNotIsInstance(stream, mmap.mmap)
+                self.assertEqual(load_json(stream), [])
+
+    @skipUnless(hasattr(os, 'mkfifo'), 'Named pipes are not supported')
+    def test_open_input_streams_pipes(self):
+        filename = os.path.join(self.directory, 'pipe')
+        os.mkfifo(filename)
+
+        def write():
+            with open(filename, 'wb') as f:
+                f.write(b'{"id": "web"}')
+        writer = threading.Thread(target=write)
+        writer.start()
+
+        with open_input(filename) as stream:
+            self.assertNotIsInstance(stream, mmap.mmap)
+            self.assertEqual(load_json(stream), {'id': 'web'})
+        writer.join()
+
+    def test_load_json_encodings(self):
+        filename = self._write('app.json', '{"id": "café"}'.encode('utf-16'))
+
+        with open_input(filename) as stream:
+            self.assertEqual(load_json(stream), {'id': 'café'})
+        self.assertEqual(load_json(io.BytesIO(b'{"id": 1}')), {'id': 1})
+        self.assertEqual(load_json(io.StringIO('{"id": 1}')), {'id': 1})
+
+    def test_convert_binary_stream(self):
+        stream = io.BytesIO(b'web:\n  image: me/web\n  mem_limit: 64m\n')
+
+        output = Converter(stream, 'compose', 'marathon').convert()
+
+        self.assertIn('"id": "web"', output)
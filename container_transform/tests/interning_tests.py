@@ -0,0 +1,119 @@
+import copy
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from unittest import TestCase
+
+import yaml
+
+from container_transform.converter import Converter
+from container_transform.interning import FrozenDict, Interner
+
+
+class FrozenDictTests(TestCase):
+
+    def test_immutable(self):
+        environment = FrozenDict({'LANG': 'C.UTF-8'})
+
+        with self.assertRaises(TypeError):
+            environment['LANG'] = 'C'
+        with self.assertRaises(TypeError):
+            environment.update({'TZ': 'UTC'})
+        with self.assertRaises(TypeError):
+            del environment['LANG']
+
+        modified = environment.copy()
+        modified['LANG'] = 'C'
+        self.assertEqual(type(modified), dict)
+        self.assertEqual(environment, {'LANG': 'C.UTF-8'})
+
+    def test_copies_are_shared(self):
+        environment = FrozenDict({'LANG': 'C.UTF-8'})
+
+        self.assertIs(copy.copy(environment), environment)
+        self.assertIs(copy.deepcopy({'environment': environment})['environment'], environment)
+
+    def test_pickle(self):
+        environment = FrozenDict({'LANG': 'C.UTF-8'})
+
+        loaded = pickle.loads(pickle.dumps(environment))
+
+        self.assertEqual(type(loaded), FrozenDict)
+        self.assertEqual(loaded, environment)
+        self.assertEqual(hash(loaded), hash(environment))
+
+    def test_serialize(self):
+        environment = FrozenDict({'LANG': 'C.UTF-8'})
+
+        self.assertEqual(json.dumps(environment), '{"LANG": "C.UTF-8"}')
+        self.assertEqual(yaml.safe_dump(environment), 'LANG: C.UTF-8\n')
+
+
+class InternerTests(TestCase):
+
+    def test_map_shared(self):
+        interner = Interner()
+
+        first = interner.map({'LANG': 'C.UTF-8', 'TZ': 'UTC'})
+        second = interner.map({'TZ': 'UTC', 'LANG': 'C.UTF-8'})
+
+        self.assertIs(first, second)
+        self.assertEqual(type(first), FrozenDict)
+        self.assertEqual(len(interner), 1)
+        self.assertIs(interner.map(first), first)
+
+    def test_map_value_types(self):
+        interner = Interner()
+
+        self.assertIsNot(interner.map({'a': 1}), interner.map({'a': True}))
+        self.assertEqual(interner.map({'a': True}), {'a': True})
+
+    def test_map_unhashable(self):
+        interner = Interner()
+        labels = {'a': ['b']}
+
+        self.assertIs(interner.map(labels), labels)
+        self.assertIsNone(interner.map(None))
+        self.assertEqual(len(interner), 0)
+
+
+class ConverterInterningTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'docker-compose.yml')
+        with open(self.filename, 'w') as f:
+            for name in ('web', 'worker'):
+                f.write(
+                    '{}:\n'
+                    '  image: me/app\n'
+                    '  environment:\n'
+                    '    PRICE: $$5\n'
+                    '    LANG: C.UTF-8\n'
+                    '  labels:\n'
+                    '    team: core\n'.format(name)
+                )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_containers_share_maps(self):
+        converter = Converter(self.filename, 'compose', 'marathon')
+
+        output = json.loads(converter.convert())
+
+        self.assertEqual(output[0]['env'], {'PRICE': '$5', 'LANG': 'C.UTF-8'})
+        self.assertEqual(output[0]['labels'], {'team': 'core'})
+        self.assertEqual(len(converter.interner), 2)
+
+    def test_compose_output_unchanged(self):
+        output = yaml.safe_load(Converter(self.filename, 'compose', 'compose').convert())
+
+        for name in ('web', 'worker'):
+            self.assertEqual(
+                output['services'][name]['environment'],
+                {'PRICE': '$$5', 'LANG': 'C.UTF-8'}
+            )
+            self.assertEqual(output['services'][name]['labels'], {'team': 'core'})
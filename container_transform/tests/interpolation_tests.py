@@ -0,0 +1,115 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from container_transform.compose import ComposeTransformer
+from container_transform.interpolation import Interpolator, load_environment, read_env_file
+
+
+class InterpolatorTests(TestCase):
+
+    def setUp(self):
+        self.interpolator = Interpolator({'TAG': '1.0', 'EMPTY': ''})
+
+    def test_interpolate_named(self):
+        self.assertEqual(self.interpolator.interpolate('web:$TAG'), 'web:1.0')
+        self.assertEqual(self.interpolator.interpolate('web:${TAG}-x'), 'web:1.0-x')
+
+    def test_interpolate_defaults(self):
+        interpolate = self.interpolator.interpolate
+        self.assertEqual(interpolate('${MISSING:-latest}'), 'latest')
+        self.assertEqual(interpolate('${MISSING-latest}'), 'latest')
+        self.assertEqual(interpolate('${EMPTY:-latest}'), 'latest')
+        self.assertEqual(interpolate('${EMPTY-latest}'), '')
+        self.assertEqual(interpolate('${TAG:-latest}'), '1.0')
+        self.assertEqual(self.interpolator.messages, set())
+
+    def test_interpolate_escaped(self):
+        self.assertEqual(self.interpolator.interpolate('po$$tgres'), 'po$tgres')
+
+    def test_interpolate_unset(self):
+        self.assertEqual(self.interpolator.interpolate('web:${MISSING}'), 'web:')
+        self.assertEqual(
+            self.interpolator.messages,
+            {'The "MISSING" variable is not set. Defaulting to a blank string.'}
+        )
+
+    def test_interpolate_required(self):
+        self.assertEqual(self.interpolator.interpolate('${MISSING:?need a tag}'), '')
+        self.assertEqual(
+            self.interpolator.messages,
+            {'Required variable "MISSING" is not set: need a tag'}
+        )
+
+    def test_interpolate_invalid(self):
+        self.assertEqual(self.interpolator.interpolate('${TAG'), '${TAG')
+        self.assertEqual(
+            self.interpolator.messages,
+            {'Invalid interpolation format in "${TAG".'}
+        )
+
+    def test_interpolate_nested(self):
+        definition = {
+            'image': 'web:${TAG}',
+            'ports': ['${PORT:-80}:80'],
+            'mem_limit': 1024,
+        }
+        self.assertEqual(
+            self.interpolator.interpolate(definition),
+            {'image': 'web:1.0', 'ports': ['80:80'], 'mem_limit': 1024}
+        )
+        self.assertEqual(definition['image'], 'web:${TAG}')
+
+
+class EnvironmentTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.env_file = os.path.join(self.directory, '.env')
+        with open(self.env_file, 'w') as f:
+            f.write('# comment\n\nTAG=1.0\nCT_TEST_INTERPOLATION=file\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        os.environ.pop('CT_TEST_INTERPOLATION', None)
+
+    def test_read_env_file(self):
+        self.assertEqual(
+            read_env_file(self.env_file),
+            {'TAG': '1.0', 'CT_TEST_INTERPOLATION': 'file'}
+        )
+
+    def test_load_environment_project_dir(self):
+        os.environ['CT_TEST_INTERPOLATION'] = 'process'
+
+        environment = load_environment(project_dir=self.directory)
+
+        self.assertEqual(environment['TAG'], '1.0')
+        self.assertEqual(environment['CT_TEST_INTERPOLATION'], 'process')
+
+    def test_load_environment_no_env_file(self):
+        environment = load_environment(project_dir=os.path.dirname(__file__))
+
+        self.assertNotIn('CT_TEST_INTERPOLATION', environment)
+
+    def test_compose_interpolation(self):
+        filename = os.path.join(self.directory, 'docker-compose.yml')
+        with open(filename, 'w') as f:
+            f.write(
+                'web:\n'
+                '  image: me/web:${TAG}\n'
+                '  environment:\n'
+                '    - DB_PASS=po$$tgres\n'
+                '    - HOME=${MISSING}\n'
+            )
+        transformer = ComposeTransformer(filename, environment={'TAG': '1.0'})
+
+        container = transformer.ingest_containers()[0]
+
+        self.assertEqual(container['image'], 'me/web:1.0')
+        self.assertEqual(
+            transformer.ingest_environment(container['environment']),
+            {'DB_PASS': 'po$tgres', 'HOME': ''}
+        )
+        self.assertEqual(len(transformer.messages), 1)
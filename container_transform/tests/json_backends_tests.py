@@ -0,0 +1,123 @@
+import io
+import os
+from unittest import TestCase, skipUnless
+
+from mock import patch
+
+from container_transform import json_backends
+from container_transform.converter import Converter
+from container_transform.input import load_json, open_input
+from container_transform.json_backends import (
+    JSONBackend, OrjsonBackend, get_backend
+)
+
+TESTS = './container_transform/tests'
+
+FIXTURES = [
+    os.path.join(TESTS, 'containers.json'),
+    os.path.join(TESTS, 'task.json'),
+    os.path.join(TESTS, 'marathon-group.json'),
+    os.path.join(TESTS, 'marathon-list.json'),
+    os.path.join(TESTS, 'marathon-test.json'),
+    os.path.join(TESTS, 'composev2_output.json'),
+    os.path.join(TESTS, 'fixtures', 'chronos.json'),
+    os.path.join(TESTS, 'fixtures', 'chronos-list.json'),
+    os.path.join(TESTS, 'fixtures', 'chronos-single.json'),
+]
+
+SCHEDULE = 'R/2016-01-01T00:00:00Z/P1D'
+
+
+class GetBackendTests(TestCase):
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default(self):
+        self.assertEqual(type(get_backend()), JSONBackend)
+
+    @patch.dict(os.environ, {'CT_JSON_BACKEND': 'auto'})
+    @patch.object(json_backends, 'orjson', None)
+    def test_fallback(self):
+        self.assertEqual(type(get_backend()), JSONBackend)
+        self.assertEqual(type(get_backend('orjson')), JSONBackend)
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            get_backend('simplejson')
+
+    @skipUnless(json_backends.orjson, 'orjson is not installed')
+    @patch.dict(os.environ, {'CT_JSON_BACKEND': 'orjson'})
+    def test_environment(self):
+        self.assertEqual(type(get_backend()), OrjsonBackend)
+        self.assertEqual(type(get_backend('json')), JSONBackend)
+
+
+@skipUnless(json_backends.orjson, 'orjson is not installed')
+class OrjsonBackendTests(TestCase):
+    """
+    The orjson backend reads and writes the same JSON as the standard library
+    """
+
+    def setUp(self):
+        self.json = JSONBackend()
+        self.orjson = OrjsonBackend()
+
+    def test_fixtures(self):
+        for filename in FIXTURES:
+            with open_input(filename) as stream:
+                expected = load_json(stream, self.json)
+                data = load_json(stream, self.orjson)
+
+            self.assertEqual(data, expected, filename)
+            for verbose in (True, False):
+                self.assertEqual(
+                    self.orjson.dumps(data, verbose),
+                    self.json.dumps(data, verbose),
+                    filename
+                )
+                self.assertEqual(
+                    ''.join(self.orjson.iterencode(data, verbose)),
+                    ''.join(self.json.iterencode(data, verbose)),
+                    filename
+                )
+
+    def test_escaping(self):
+        data = {'env': 'café \U0001f600 \x7f\x01\n"\\/', 'mem': [1 << 70, 0.5]}
+
+        self.assertEqual(self.orjson.dumps(data, False), self.json.dumps(data, False))
+
+    def test_non_finite_floats(self):
+        data = {'cpus': float('nan'), 'mem': [float('inf'), -float('inf'), None]}
+
+        self.assertEqual(self.orjson.dumps(data, False), self.json.dumps(data, False))
+
+    def test_loads_encodings(self):
+        data = '{"id": "café"}'
+
+        for encoding in ('utf-8', 'utf-8-sig', 'utf-16', 'utf-32'):
+            self.assertEqual(
+                self.orjson.loads(memoryview(data.encode(encoding))),
+                {'id': 'café'}
+            )
+        self.assertEqual(load_json(io.StringIO(data), self.orjson), {'id': 'café'})
+
+    def test_conversions(self):
+        conversions = [
+            ('marathon', 'chronos', os.path.join(TESTS, 'marathon-group.json')),
+            ('chronos', 'marathon', os.path.join(TESTS, 'fixtures', 'chronos.json')),
+            ('marathon', 'ecs', os.path.join(TESTS, 'marathon-test.json')),
+        ]
+        for input_type, output_type, filename in conversions:
+            outputs = []
+            for backend in ('json', 'orjson'):
+                output_options = {'json_backend': backend}
+                if output_type == 'chronos':
+                    output_options['schedule'] = SCHEDULE
+                converter = Converter(
+                    filename,
+                    input_type,
+                    output_type,
+                    input_options={'json_backend': backend},
+                    output_options=output_options
+                )
+                outputs.append(converter.convert(verbose=False))
+            self.assertEqual(outputs[0], outputs[1], filename)
@@ -0,0 +1,297 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import TestCase
+
+import yaml
+
+from container_transform.converter import Converter
+from container_transform.kubernetes import KubernetesTransformer, VolumeDescriptor
+
+
+POD = '''
+kind: Pod
+apiVersion: v1
+metadata:
+  name: web
+spec:
+  containers:
+  - name: web
+    image: me/web
+    volumeMounts:
+    - name: logs
+      mountPath: /var/log/web
+      subPath: web
+    - name: config
+      mountPath: /etc/web
+      readOnly: true
+    - name: data
+      mountPath: /data
+    - name: scratch
+      mountPath: /tmp
+    - name: custom
+      mountPath: /custom
+    - name: missing
+      mountPath: /missing
+  volumes:
+  - name: logs
+    hostPath:
+      path: /var/log/
+  - name: config
+    configMap:
+      name: web-config
+  - name: data
+    persistentVolumeClaim:
+      claimName: web-data
+  - name: scratch
+    emptyDir: {}
+  - name: custom
+    somethingNew: {}
+'''
+
+
+class KubernetesTransformerTests(TestCase):
+
+    def setUp(self):
+        self.transformer = KubernetesTransformer(StringIO(POD))
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_ingest_volumes_param(self):
+        self.assertEqual(
+            self.transformer.volumes_in['data'],
+            VolumeDescriptor('data', 'persistentVolumeClaim', '', {'claimName': 'web-data'})
+        )
+        self.assertEqual(self.transformer.volumes_in['scratch'].host, '')
+        self.assertEqual(self.transformer.volumes_in['config'].type, 'configMap')
+        self.assertIsNone(self.transformer.volumes_in['custom'].type)
+
+    def test_ingest_volumes(self):
+        container = self.transformer.ingest_containers()[0]
+
+        self.assertEqual(
+            self.transformer.ingest_volumes(container['volumeMounts']),
+            [
+                {'host': '/var/log/web', 'container': '/var/log/web', 'readonly': False},
+                {'host': '', 'container': '/etc/web', 'readonly': True, 'volume': 'config'},
+                {
+                    'host': '',
+                    'container': '/data',
+                    'readonly': False,
+                    'volume': 'data',
+                    'type': 'persistentVolumeClaim',
+                    'source': {'claimName': 'web-data'},
+                },
+                {'host': '', 'container': '/tmp', 'readonly': False, 'volume': 'scratch'},
+                {'host': '', 'container': '/custom', 'readonly': False, 'volume': 'custom'},
+            ]
+        )
+
+    def test_persistent_volume_claim(self):
+        filename = os.path.join(self.tempdir, 'pod.yaml')
+        with open(filename, 'w') as f:
+            f.write(POD)
+
+        conv = Converter(filename, 'kubernetes', 'kubernetes')
+        output = yaml.safe_load(conv.convert())
+        pod = output['spec']['template']['spec']
+
+        self.assertIn(
+            {'name': 'data', 'persistentVolumeClaim': {'claimName': 'web-data'}},
+            pod['volumes']
+        )
+        self.assertIn({'name': 'data', 'mountPath': '/data'}, pod['containers'][0]['volumeMounts'])
+        self.assertFalse(any('persistentVolumeClaim' in m for m in conv.messages))
+
+        conv = Converter(filename, 'kubernetes', 'ecs')
+        output = conv.convert()
+        self.assertNotIn('web-data', output)
+        self.assertIn(
+            'Volume "data" of type persistentVolumeClaim is not supported by ecs output and '
+            'is mounted as an anonymous volume.',
+            conv.messages
+        )
+
+    def test_volume_messages(self):
+        self.transformer.ingest_containers()
+
+        self.assertEqual(
+            self.transformer.messages,
+            {
+                'Volume "config" of type configMap is not supported and is mounted as an '
+                'anonymous volume.',
+                'Volume "custom" has an unknown type and is mounted as an anonymous volume.',
+                'Container web mounts volume "missing", which is not defined in the pod, '
+                'and is skipped.',
+            }
+        )
+
+
+class KubernetesEmitTests(TestCase):
+
+    def setUp(self):
+        self.containers = [
+            {'name': 'web', 'image': 'me/web'},
+            {'name': 'worker', 'image': 'me/worker'},
+        ]
+
+    def _emit(self, transformer, volumes):
+        containers = [
+            transformer.validate(dict(container, volumeMounts=transformer.emit_volumes(mounts)))
+            for container, mounts
+            in zip(self.containers, volumes)
+        ]
+        return list(yaml.safe_load_all(transformer.emit_containers(containers)))
+
+    def test_emit_volumes_shared(self):
+        transformer = KubernetesTransformer()
+        mounts = transformer.emit_volumes([
+            {'host': '/var/log', 'container': '/logs'},
+            {'host': '/var/log', 'container': '/other-logs', 'readonly': True},
+            {'host': '', 'container': '/scratch'},
+        ])
+
+        self.assertEqual(
+            mounts,
+            [
+                {'name': 'var-log', 'mountPath': '/logs'},
+                {'name': 'var-log', 'mountPath': '/other-logs', 'readOnly': True},
+                {'name': 'scratch', 'mountPath': '/scratch'},
+            ]
+        )
+        self.assertEqual(
+            transformer.volumes,
+            {
+                'var-log': {'name': 'var-log', 'hostPath': {'path': '/var/log'}},
+                'scratch': {'name': 'scratch', 'emptyDir': {}},
+            }
+        )
+
+    def test_emit_volumes_names_unique(self):
+        transformer = KubernetesTransformer()
+        mounts = transformer.emit_volumes([
+            {'host': '/data', 'container': '/srv'},
+            {'host': '', 'container': '/data'},
+            {'host': '', 'container': '/data'},
+            {'host': 'data/', 'container': '/other'},
+        ])
+
+        # Anonymous volumes aren't shared, even at the same path
+        self.assertEqual([m['name'] for m in mounts], ['data', 'data-2', 'data-3', 'data-4'])
+        self.assertEqual(
+            transformer.volumes,
+            {
+                'data': {'name': 'data', 'hostPath': {'path': '/data'}},
+                'data-2': {'name': 'data-2', 'emptyDir': {}},
+                'data-3': {'name': 'data-3', 'emptyDir': {}},
+                'data-4': {'name': 'data-4', 'hostPath': {'path': 'data/'}},
+            }
+        )
+
+    def test_emit_volumes_pod_volume(self):
+        # Mounts of one pod volume share it, wherever they are mounted
+        transformer = KubernetesTransformer()
+        mounts = transformer.emit_volumes([
+            {'host': '', 'container': '/s1', 'volume': 'scratch'},
+            {'host': '', 'container': '/s2', 'volume': 'scratch'},
+            {'host': '', 'container': '/s1', 'volume': 'other'},
+        ])
+
+        self.assertEqual([m['name'] for m in mounts], ['scratch', 'scratch', 'other'])
+        self.assertEqual(
+            transformer.volumes,
+            {
+                'scratch': {'name': 'scratch', 'emptyDir': {}},
+                'other': {'name': 'other', 'emptyDir': {}},
+            }
+        )
+
+    def test_emit_containers_grouped(self):
+        transformer = KubernetesTransformer(kind='StatefulSet')
+        output = self._emit(transformer, [
+            [{'host': '/var/log', 'container': '/logs'}],
+            [{'host': '/data', 'container': '/data'}],
+        ])
+
+        self.assertEqual(len(output), 1)
+        self.assertEqual(output[0]['kind'], 'StatefulSet')
+        self.assertEqual(output[0]['apiVersion'], 'apps/v1')
+        pod = output[0]['spec']['template']['spec']
+        self.assertEqual([c['name'] for c in pod['containers']], ['web', 'worker'])
+        self.assertEqual([v['name'] for v in pod['volumes']], ['data', 'var-log'])
+        self.assertEqual(output[0]['spec']['serviceName'], 'web')
+
+    def test_emit_containers_split(self):
+        transformer = KubernetesTransformer(kind='Job', split=True)
+        output = self._emit(transformer, [
+            [{'host': '/var/log', 'container': '/logs'}],
+            [{'host': '/data', 'container': '/data'}],
+        ])
+
+        self.assertEqual([o['metadata']['name'] for o in output], ['web', 'worker'])
+        for workload in output:
+            self.assertEqual(workload['kind'], 'Job')
+            self.assertEqual(workload['apiVersion'], 'batch/v1')
+            self.assertNotIn('replicas', workload['spec'])
+            self.assertEqual(workload['spec']['template']['spec']['restartPolicy'], 'Never')
+        self.assertEqual(
+            output[1]['spec']['template']['spec']['volumes'],
+            [{'name': 'data', 'hostPath': {'path': '/data'}}]
+        )
+
+    def test_api_version(self):
+        transformer = KubernetesTransformer(api_version='apps/v1')
+        output = self._emit(transformer, [[], []])
+
+        self.assertEqual(output[0]['kind'], 'Deployment')
+        self.assertEqual(output[0]['apiVersion'], 'apps/v1')
+
+    def test_unsupported_kind(self):
+        with self.assertRaises(ValueError):
+            KubernetesTransformer(kind='CronJob')
+
+
+class KubernetesCommandTests(TestCase):
+    """
+    Converting commands from Kubernetes gives the arguments splitting the
+    joined command gives, with quotes inside an argument removed
+    """
+    filename = './container_transform/tests/k8s_tests/dns.yaml'
+    argument = '-cmd=nslookup kubernetes.default.svc.cluster.local 127.0.0.1 >/dev/null'
+
+    def convert(self, output_type, output_options=None):
+        return Converter(
+            self.filename, 'kubernetes', output_type, output_options=output_options
+        ).convert()
+
+    def test_json_outputs(self):
+        outputs = [
+            self.convert('ecs'),
+            self.convert('marathon'),
+            self.convert('chronos', {'schedule': 'R/2016-01-01T00:00:00Z/P1D'}),
+        ]
+        for output in outputs:
+            self.assertIn(json.dumps(self.argument), output)
+            self.assertNotIn('\\"nslookup', output)
+
+    def test_kubernetes_output(self):
+        output = yaml.safe_load(self.convert('kubernetes'))
+        args = [
+            arg
+            for container in output['spec']['template']['spec']['containers']
+            for arg in container.get('args') or []
+        ]
+
+        self.assertIn(self.argument, args)
+
+    def test_compose_output(self):
+        output = yaml.safe_load(self.convert('compose'))
+
+        self.assertEqual(
+            output['services']['healthz']['command'],
+            '-cmd="nslookup kubernetes.default.svc.cluster.local 127.0.0.1 >/dev/null" -port=8080'
+        )
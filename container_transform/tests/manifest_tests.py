@@ -0,0 +1,112 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from unittest import TestCase
+
+from mock import patch
+
+from container_transform.converter import Converter
+from container_transform.manifest import Manifest
+
+
+class ManifestTests(TestCase):
+    """
+    Tests for incremental conversion with a Manifest
+    """
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.manifest_file = os.path.join(self.tempdir, 'manifest.json')
+        self.compose_file = os.path.join(self.tempdir, 'docker-compose.yml')
+        shutil.copy('./container_transform/tests/composev2_extended.yml', self.compose_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def convert(self, manifest=None):
+        conv = Converter(self.compose_file, 'compose', 'ecs', manifest=manifest)
+        return conv.convert(), conv.messages
+
+    def test_convert_unchanged(self):
+        want, want_messages = self.convert()
+
+        manifest = Manifest(self.manifest_file)
+        output, messages = self.convert(manifest)
+        self.assertEqual(output, want)
+        self.assertEqual(messages, want_messages)
+        self.assertEqual((manifest.hits, manifest.misses), (0, 3))
+
+        manifest = Manifest(self.manifest_file)
+        output, messages = self.convert(manifest)
+        self.assertEqual(output, want)
+        self.assertEqual(messages, want_messages)
+        self.assertEqual((manifest.hits, manifest.misses), (3, 0))
+
+    def test_convert_changed_service(self):
+        self.convert(self.manifest_file)
+
+        with open(self.compose_file, 'a') as f:
+            f.write(
+                '  worker:\n'
+                '    image: worker\n'
+                '    volumes:\n'
+                '     - /data:/data\n'
+            )
+        with open(self.compose_file) as f:
+            contents = f.read()
+        with open(self.compose_file, 'w') as f:
+            f.write(contents.replace('image: redis', 'image: redis:3'))
+
+        want, want_messages = self.convert()
+        manifest = Manifest(self.manifest_file)
+        output, messages = self.convert(manifest)
+
+        self.assertEqual(output, want)
+        self.assertEqual(messages, want_messages)
+        self.assertEqual((manifest.hits, manifest.misses), (2, 2))
+        self.assertIn(
+            {'name': 'Data', 'host': {'sourcePath': '/data'}},
+            json.loads(output)['volumes']
+        )
+
+    def test_save_drops_removed_containers(self):
+        self.convert(self.manifest_file)
+        with open(self.manifest_file) as f:
+            self.assertEqual(len(json.load(f)['containers']), 3)
+
+        with open(self.compose_file, 'w') as f:
+            f.write('web:\n  image: nginx\n')
+        self.convert(self.manifest_file)
+
+        with open(self.manifest_file) as f:
+            self.assertEqual(len(json.load(f)['containers']), 1)
+
+    def test_context_changes(self):
+        conv = Converter(self.compose_file, 'compose', 'marathon', manifest=self.manifest_file)
+        conv.convert()
+        manifest = Manifest(self.manifest_file)
+        self.convert(manifest)
+        self.assertEqual((manifest.hits, manifest.misses), (0, 3))
+
+    @patch('container_transform.chronos.datetime')
+    def test_convert_default_schedule(self, mock_datetime):
+        # Containers are reused with the schedule of the current run
+        conv = Converter(self.compose_file, 'compose', 'chronos', manifest=self.manifest_file)
+        mock_datetime.utcnow.return_value = datetime(2016, 1, 1)
+        conv.convert()
+
+        mock_datetime.utcnow.return_value = datetime(2016, 1, 2)
+        want = Converter(self.compose_file, 'compose', 'chronos').convert()
+        manifest = Manifest(self.manifest_file)
+        output = Converter(self.compose_file, 'compose', 'chronos', manifest=manifest).convert()
+
+        self.assertEqual((manifest.hits, manifest.misses), (3, 0))
+        self.assertEqual(output, want)
+        self.assertIn('2016-01-02', output)
+
+    def test_unknown_version(self):
+        with open(self.manifest_file, 'w') as f:
+            json.dump({'version': 0, 'containers': {'a': {}}}, f)
+        self.assertEqual(Manifest(self.manifest_file).entries, {})
@@ -1,5 +1,10 @@
+import json
+import os
+import shutil
+import tempfile
 from unittest import TestCase
 
+from container_transform.converter import Converter
 from container_transform.marathon import MarathonTransformer
 
 
@@ -12,6 +17,76 @@ class MarathonTransformerTests(TestCase):
         self.file_name = './container_transform/tests/marathon-test.json'
         self.transformer = MarathonTransformer(self.file_name)
 
+    def test_convert_identical_no_id(self):
+        """
+        Test identical apps without an id get different ids
+        """
+        app = {'container': {'docker': {'image': 'redis'}}, 'mem': 64}
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        filename = os.path.join(directory, 'apps.json')
+        with open(filename, 'w') as f:
+            json.dump([app, app], f)
+
+        apps = json.loads(Converter(filename, 'marathon', 'marathon').convert())
+        containers = json.loads(Converter(filename, 'marathon', 'ecs').convert())
+
+        self.assertEqual(len(set(app['id'] for app in apps)), 2)
+        self.assertEqual(
+            len(set(c['name'] for c in containers['containerDefinitions'])),
+            2
+        )
+
+    def test_validate_parameters_sorted(self):
+        container = {
+            'id': 'web',
+            'container.docker.parameters.label': [
+                {'key': 'label', 'value': 'b=2'},
+                {'key': 'env', 'value': 'A=1'},
+                {'key': 'label', 'value': 'a=1'},
+            ]
+        }
+
+        validated = self.transformer.validate(container)
+        self.assertEqual(
+            validated['container']['docker']['parameters'],
+            [
+                {'key': 'env', 'value': 'A=1'},
+                {'key': 'label', 'value': 'a=1'},
+                {'key': 'label', 'value': 'b=2'},
+            ]
+        )
+
+    def test_validate_port_mappings(self):
+        container = {
+            'id': 'web',
+            'container.docker.portMappings': [
+                {'containerPort': 80, 'hostPort': 0},
+                {'containerPort': 443},
+            ]
+        }
+
+        validated = self.transformer.validate(container)
+        self.assertFalse(validated['requirePorts'])
+        self.assertNotIn('ports', validated)
+        self.assertEqual(validated['container']['docker']['network'], 'BRIDGE')
+        self.assertEqual(len(validated['healthChecks']), 1)
+
+    def test_validate_port_mappings_host_network(self):
+        container = {
+            'id': 'web',
+            'container.docker.network': 'HOST',
+            'container.docker.portMappings': [
+                {'containerPort': 80, 'hostPort': 8080},
+                {'hostPort': 8443},
+            ]
+        }
+
+        validated = self.transformer.validate(container)
+        self.assertTrue(validated['requirePorts'])
+        self.assertEqual(validated['ports'], [80, 8443])
+        self.assertEqual(validated['container']['docker']['network'], 'HOST')
+
     def test_emit_fetch(self):
         fetch = [
             {'uri': 'https://s3.amazonaws.com/bucket/item.json'},
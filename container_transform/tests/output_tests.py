@@ -0,0 +1,116 @@
+import gzip
+import io
+import json
+import lzma
+import os
+import shutil
+import stat
+import tempfile
+from datetime import datetime
+from unittest import TestCase
+
+from mock import patch
+
+from container_transform.converter import Converter
+from container_transform.output import dumps, write_atomic, write_chunks
+
+
+class OutputTests(TestCase):
+    """
+    Tests for the output encoding helpers
+    """
+
+    def setUp(self):
+        self.data = {'b': [1, 2], 'a': {'c': 'd'}}
+
+    def test_dumps(self):
+        self.assertEqual(dumps(self.data), json.dumps(self.data, indent=4, sort_keys=True))
+        self.assertEqual(dumps(self.data, verbose=False), '{"b":[1,2],"a":{"c":"d"}}')
+
+    def test_write_chunks(self):
+        stream = io.BytesIO()
+        chunks = ['abc', 'def', 'gé']
+        with patch.object(stream, 'write', wraps=stream.write) as mock_write:
+            write_chunks(chunks, stream, chunk_size=4)
+        self.assertEqual(stream.getvalue(), 'abcdefgé'.encode('utf-8'))
+        self.assertEqual(mock_write.call_count, 2)
+
+    def test_write_chunks_gzip(self):
+        stream = io.BytesIO()
+        write_chunks(['abc', 'def'], stream, compression='gzip')
+        self.assertEqual(gzip.decompress(stream.getvalue()), b'abcdef')
+        self.assertFalse(stream.closed)
+
+    def test_write_chunks_lzma(self):
+        stream = io.BytesIO()
+        write_chunks(['abc', 'def'], stream, compression='lzma')
+        self.assertEqual(lzma.decompress(stream.getvalue()), b'abcdef')
+
+    def test_write_chunks_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            write_chunks(['abc'], io.BytesIO(), compression='zip')
+
+
+class WriteAtomicTests(TestCase):
+    """
+    Tests for write_atomic()
+    """
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tempdir, 'output.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_write_atomic(self):
+        write_atomic(self.filename, 'data')
+        with open(self.filename) as f:
+            self.assertEqual(f.read(), 'data')
+        self.assertEqual(os.listdir(self.tempdir), ['output.json'])
+
+    def test_write_atomic_mode(self):
+        umask = os.umask(0o022)
+        try:
+            write_atomic(self.filename, 'data')
+        finally:
+            os.umask(umask)
+        self.assertEqual(stat.S_IMODE(os.stat(self.filename).st_mode), 0o644)
+
+        os.chmod(self.filename, 0o640)
+        write_atomic(self.filename, 'new')
+        self.assertEqual(stat.S_IMODE(os.stat(self.filename).st_mode), 0o640)
+
+    def test_write_atomic_failure(self):
+        write_atomic(self.filename, 'old')
+        with self.assertRaises(TypeError):
+            write_atomic(self.filename, b'new')
+        with open(self.filename) as f:
+            self.assertEqual(f.read(), 'old')
+        self.assertEqual(os.listdir(self.tempdir), ['output.json'])
+
+
+class ConverterWriteTests(TestCase):
+    """
+    Tests for Converter.write()
+    """
+
+    @patch('container_transform.chronos.datetime')
+    def test_write_json(self, mock_datetime):
+        mock_datetime.utcnow.return_value = datetime(2016, 1, 1)
+        filename = './container_transform/tests/composev2_extended.yml'
+
+        for output_type in ['ecs', 'marathon', 'chronos']:
+            for verbose in [True, False]:
+                want = Converter(filename, 'compose', output_type).convert(verbose)
+
+                stream = io.BytesIO()
+                Converter(filename, 'compose', output_type).write(stream, verbose)
+
+                self.assertEqual(stream.getvalue().decode('utf-8'), want)
+
+    def test_write_systemd(self):
+        filename = './container_transform/tests/task.json'
+        stream = io.BytesIO()
+        Converter(filename, 'ecs', 'systemd').write(stream, compression='gzip')
+        self.assertIn(b'ExecStart=/usr/bin/docker run', gzip.decompress(stream.getvalue()))
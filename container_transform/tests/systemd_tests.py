@@ -82,8 +82,14 @@ class SystemdTransformerTests(TestCase):
         # .emit_entrypoint()
         self.assertEqual(self.transformer.emit_entrypoint('/bin/true'), '/bin/true')
 
-        # .emit_volumes_from()
-        self.assertEqual(self.transformer.emit_volumes_from(['web']), ['web'])
+    def test_emit_volumes_from(self):
+        self.assertEqual(
+            self.transformer.emit_volumes_from([
+                {'source_container': 'web'},
+                {'source_container': 'db', 'read_only': True},
+            ]),
+            ['web', 'db:ro']
+        )
 
     def test_emit_memory(self):
         self.assertEqual(self.transformer.emit_memory('1024'), '1024b')
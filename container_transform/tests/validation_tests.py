@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+from container_transform.compose import ComposeTransformer
+from container_transform.converter import Converter
+from container_transform.ecs import ECSTransformer
+from container_transform.validation import (
+    ValidationError, compile_validators, validate_containers
+)
+
+
+class ValidationTests(TestCase):
+
+    def test_compile_validators_cached(self):
+        self.assertIs(
+            compile_validators('compose', ComposeTransformer),
+            compile_validators('compose', ComposeTransformer)
+        )
+
+    def test_validate_containers(self):
+        containers = [
+            {
+                'name': 'web',
+                'image': 'me/web',
+                'mem_limit': 'lots',
+                'ports': ['80:80'],
+            },
+            {
+                'name': 'worker',
+                'image': 'me/worker',
+                'cpu_shares': 'high',
+                'environment': ['A=1'],
+            },
+        ]
+
+        errors = validate_containers(containers, 'compose', ComposeTransformer())
+
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(errors[0].container, 'web')
+        self.assertEqual(errors[0].field, 'mem_limit')
+        self.assertTrue(errors[0].message.startswith('could not be read'))
+        self.assertEqual(
+            errors[1],
+            ValidationError('worker', 'cpu_shares', 'cpu should be a number, got str')
+        )
+
+    def test_validate_nested(self):
+        containers = [{
+            'name': 'web',
+            'image': 'me/web',
+            'portMappings': [{'containerPort': 80, 'hostPort': '80'}],
+        }]
+
+        errors = validate_containers(containers, 'ecs', ECSTransformer())
+
+        self.assertEqual(
+            errors,
+            [ValidationError(
+                'web',
+                'portMappings',
+                'port_mappings[].host_port should be a number, got str'
+            )]
+        )
+
+    def test_converter_validate_fixtures(self):
+        fixtures = [
+            ('compose', 'docker-compose.yml'),
+            ('ecs', 'task.json'),
+            ('marathon', 'marathon-group.json'),
+            ('chronos', 'fixtures/chronos.json'),
+            ('kubernetes', 'k8s_tests/dns.yaml'),
+            ('kubernetes', 'k8s_tests/dns-k8s-out.yaml'),
+        ]
+        for input_type, filename in fixtures:
+            filename = './container_transform/tests/{}'.format(filename)
+            self.assertEqual(Converter(filename, input_type, 'compose').validate(), [])
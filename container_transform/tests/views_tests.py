@@ -0,0 +1,88 @@
+import copy
+import pickle
+from unittest import TestCase
+
+from mock import patch
+
+from container_transform.compose import ComposeTransformer
+from container_transform.converter import Converter
+from container_transform.manifest import Manifest
+from container_transform.marathon import MarathonTransformer
+from container_transform.views import ContainerView
+
+
+class ContainerViewTests(TestCase):
+
+    def setUp(self):
+        self.definition = {'image': 'redis', 'mem_limit': '64m'}
+        self.view = ContainerView(self.definition, {'name': 'cache', 'image': 'redis:3'})
+
+    def test_mapping(self):
+        self.assertEqual(self.view['image'], 'redis:3')
+        self.assertEqual(self.view.get('mem_limit'), '64m')
+        self.assertIsNone(self.view.get('command'))
+        self.assertIn('name', self.view)
+        self.assertNotIn('command', self.view)
+        self.assertEqual(list(self.view), ['mem_limit', 'name', 'image'])
+        self.assertEqual(len(self.view), 3)
+        self.assertEqual(self.view, {'image': 'redis:3', 'mem_limit': '64m', 'name': 'cache'})
+
+    def test_read_only(self):
+        with self.assertRaises(TypeError):
+            self.view['image'] = 'postgres'
+        self.assertEqual(self.definition, {'image': 'redis', 'mem_limit': '64m'})
+
+    def test_pickle(self):
+        self.assertEqual(pickle.loads(pickle.dumps(self.view)), self.view)
+        self.assertEqual(copy.deepcopy(self.view), self.view)
+
+    def test_manifest_key(self):
+        self.assertEqual(
+            Manifest.container_key(self.view, 'context'),
+            Manifest.container_key(dict(self.view), 'context')
+        )
+
+
+class IngestViewTests(TestCase):
+
+    def test_compose_ingest_leaves_input(self):
+        transformer = ComposeTransformer('./container_transform/tests/docker-compose.yml')
+        stream = copy.deepcopy(transformer.stream)
+
+        first = transformer.ingest_containers()
+        second = transformer.ingest_containers()
+
+        self.assertEqual(transformer.stream, stream)
+        self.assertEqual(first, second)
+        self.assertTrue(all(isinstance(container, ContainerView) for container in first))
+        self.assertIn('name', first[0])
+
+    def test_marathon_flatten_leaves_input(self):
+        transformer = MarathonTransformer('./container_transform/tests/marathon-group.json')
+        stream = copy.deepcopy(transformer.stream)
+
+        containers = transformer.ingest_containers()
+
+        self.assertEqual(transformer.stream, stream)
+        self.assertIn('container.docker.image', containers[0])
+        self.assertTrue(all('container.docker.image' not in app for app in stream['apps']))
+
+    def test_convert_parsed_input_twice(self):
+        """
+        One parsed document converts to the same output every time, and is
+        left as it was
+        """
+        filename = './container_transform/tests/marathon-group.json'
+        stream = MarathonTransformer(filename).stream
+        expected = copy.deepcopy(stream)
+
+        outputs = []
+        with patch.object(MarathonTransformer, '_read_file', return_value=stream):
+            for _ in range(2):
+                containers = list(MarathonTransformer(filename).iter_containers())
+                self.assertEqual(stream, expected)
+                outputs.append(Converter(filename, 'marathon', 'compose').convert())
+
+        self.assertEqual(len(containers), len(expected['apps']))
+        self.assertEqual(stream, expected)
+        self.assertEqual(outputs[0], outputs[1])
@@ -0,0 +1,143 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from click.testing import CliRunner
+from mock import patch
+
+from container_transform.client import main, watch
+from container_transform.watch import Watcher
+
+
+class WatcherTests(TestCase):
+    """
+    Tests for the Watcher
+    """
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.input_dir = os.path.join(self.tempdir, 'services')
+        os.mkdir(self.input_dir)
+        self.compose_file = os.path.join(self.input_dir, 'web.yml')
+        with open(self.compose_file, 'w') as f:
+            f.write('web:\n  image: nginx\n  mem_limit: 64m\n')
+        with open(os.path.join(self.input_dir, 'README'), 'w') as f:
+            f.write('not an input')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def touch(self, filename, contents):
+        stat = os.stat(filename)
+        with open(filename, 'w') as f:
+            f.write(contents)
+        os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    def test_check(self):
+        watcher = Watcher([self.input_dir], 'compose', 'ecs')
+
+        self.assertEqual(watcher.check(), [self.compose_file])
+        self.assertEqual(watcher.check(), [])
+
+        self.touch(self.compose_file, 'web:\n  image: nginx:1\n')
+        self.assertEqual(watcher.check(), [self.compose_file])
+        self.assertEqual(watcher.check(), [])
+
+    def test_check_missing_file(self):
+        missing = os.path.join(self.tempdir, 'missing.yml')
+        watcher = Watcher([missing], 'compose', 'ecs')
+        self.assertEqual(watcher.check(), [])
+
+    def test_poll_debounce(self):
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) == 2:
+                self.touch(self.compose_file, 'web:\n  image: nginx:2\n')
+
+        watcher = Watcher([self.compose_file], 'compose', 'ecs', interval=5, debounce=1,
+                          sleep=sleep)
+        watcher.check()
+
+        self.assertEqual(watcher.poll(), [self.compose_file])
+        self.assertEqual(sleeps, [5, 5, 1])
+
+    def test_convert(self):
+        output_dir = os.path.join(self.tempdir, 'out')
+        os.mkdir(output_dir)
+        watcher = Watcher([self.input_dir], 'compose', 'ecs', output_dir=output_dir)
+
+        output_file, elapsed, messages = watcher.convert(self.compose_file)
+
+        self.assertEqual(output_file, os.path.join(output_dir, 'web.json'))
+        self.assertGreater(elapsed, 0)
+        self.assertEqual(messages, set())
+        with open(output_file) as f:
+            self.assertEqual(json.load(f)['containerDefinitions'][0]['image'], 'nginx')
+
+    def test_convert_same_extension(self):
+        watcher = Watcher([self.input_dir], 'compose', 'compose')
+        watcher.check()
+
+        output_file, _, _ = watcher.convert(self.compose_file)
+
+        self.assertEqual(output_file, os.path.join(self.input_dir, 'web.out.yml'))
+        # Outputs aren't picked up as inputs
+        self.assertEqual(watcher.check(), [])
+
+    def test_check_outputs_after_restart(self):
+        for output_type in ('compose', 'kubernetes'):
+            output_file, _, _ = Watcher([self.input_dir], 'compose', output_type).convert(
+                self.compose_file
+            )
+
+            # A new watcher doesn't pick up the outputs of an earlier one either
+            watcher = Watcher([self.input_dir], 'compose', output_type)
+            self.assertEqual(watcher.check(), [self.compose_file])
+            os.unlink(output_file)
+
+
+class WatchClientTests(TestCase):
+    """
+    Tests for the watch command
+    """
+
+    def test_watch(self):
+        runner = CliRunner()
+        calls = []
+
+        def poll(watcher):
+            calls.append(watcher)
+            if len(calls) > 1:
+                raise KeyboardInterrupt
+            return ['docker-compose.yml', 'broken.yml']
+
+        with runner.isolated_filesystem():
+            with open('docker-compose.yml', 'w') as f:
+                f.write('web:\n  mem_limit: 1024b\n')
+            with open('broken.yml', 'w') as f:
+                f.write('web: [\n')
+
+            with patch.object(Watcher, 'poll', poll):
+                result = runner.invoke(watch, ['.'])
+
+            self.assertEqual(result.exit_code, 0)
+            self.assertTrue(os.path.exists('docker-compose.json'))
+
+        self.assertIn('Converted docker-compose.yml to docker-compose.json', result.output)
+        self.assertIn('Container web is missing required parameter "image".', result.output)
+        self.assertIn('Failed to convert broken.yml', result.output)
+
+    @patch('container_transform.client.transform')
+    @patch('container_transform.client.watch')
+    def test_main(self, mock_watch, mock_transform):
+        main(['watch', '.', '-o', 'marathon'])
+        mock_watch.main.assert_called_once_with(
+            ['.', '-o', 'marathon'], prog_name='container-transform watch')
+
+        main(['docker-compose.yml'])
+        mock_transform.main.assert_called_once_with(
+            ['docker-compose.yml'], prog_name='container-transform')
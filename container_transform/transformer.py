@@ -1,5 +1,10 @@
 import shlex
+import uuid
 from abc import ABCMeta, abstractmethod
+from functools import lru_cache
+
+from .hashing import content_name
+from .input import open_input
 
 """The SCHEMA defines the argument format the .ingest_*() and .emit_*()
 methods should produce and accept (respectively)"""
@@ -15,16 +20,21 @@ SCHEMA = {
     'port_mappings': [{
         'host_ip': str,
         'host_port': int,  # 0 is a valid, non-false value
+        'host_port_end': int,  # The last port of a range, only set for ranges
         'container_ip': str,
         'container_port': int,
+        'container_port_end': int,  # The last port of a range, only set for ranges
         'protocol': 'tcp' or 'udp',
         'name': str,
     }],
     'environment': dict,  # A simple key: value dictionary
-    'entrypoint': str,  # An unsplit string
-    'command': str,  # An unsplit string
-    'volumes_from': list,  # A list of containers
+    'entrypoint': str,  # An unsplit string, may be a CommandLine
+    'command': str,  # An unsplit string, may be a CommandLine
+    'volumes_from': list,  # A list of dict {'source_container': 'name', 'read_only': True}
     'volumes': list,  # A list of dict {'host': '/path', 'container': '/path', 'readonly': True}
+    # Volumes of a type only some formats support, such as a Kubernetes
+    # persistentVolumeClaim, also have 'volume' (the volume name), 'type'
+    # and 'source' (the options of the volume type), and an empty 'host'
     'dns': list,
     'domain': list,
     'labels': dict,
@@ -35,6 +45,163 @@ SCHEMA = {
 }
 
 
+@lru_cache(maxsize=4096)
+def _quote(cmd):
+    """
+    Make sure that each cmd in command list will be treated as a single token
+    :param cmd: str
+    :return: The token to join, and the argument splitting it gives back
+    :rtype: tuple
+    """
+    tokens = shlex.split(cmd)
+    if len(tokens) == 1:
+        # Already a single token, do nothing. Splitting it still removes
+        # any quotes in it
+        return cmd, tokens[0]
+    else:
+        return shlex.quote(cmd), cmd
+
+
+@lru_cache(maxsize=1024)
+def _split(command):
+    return tuple(shlex.split(command))
+
+
+def parse_port_range(value):
+    """
+    Parse a port or a ``start-end`` port range
+
+    :type value: str or int
+    :rtype: tuple
+    :returns: The first and last port, the last port is None for a single port
+    """
+    start, _, end = str(value).partition('-')
+    return int(start), int(end) if end else None
+
+
+def port_range_fields(side, value):
+    """
+    Parse a port or port range into base schema port mapping fields
+
+    :param side: 'host' or 'container'
+    :type side: str
+    :type value: str or int
+    :rtype: dict
+    """
+    start, end = parse_port_range(value)
+    fields = {'{}_port'.format(side): start}
+    if end is not None:
+        fields['{}_port_end'.format(side)] = end
+    return fields
+
+
+def format_port_range(start, end=None):
+    """
+    The reverse of :func:`parse_port_range`
+
+    :rtype: str
+    """
+    if end is None or end == start:
+        return str(start)
+    return '{}-{}'.format(start, end)
+
+
+def parse_volumes_from(value):
+    """
+    Parse a docker ``--volumes-from`` value, ``name`` or ``name:ro``, into a
+    base schema ``volumes_from`` entry
+
+    :type value: str
+    :rtype: dict
+    """
+    source_container, _, mode = value.rpartition(':')
+    if mode not in ('ro', 'rw'):
+        return {'source_container': value}
+    volume = {'source_container': source_container}
+    if mode == 'ro':
+        volume['read_only'] = True
+    return volume
+
+
+def format_volumes_from(volume):
+    """
+    The reverse of :func:`parse_volumes_from`
+
+    :type volume: dict
+    :rtype: str
+    """
+    if volume.get('read_only'):
+        return '{}:ro'.format(volume['source_container'])
+    return volume['source_container']
+
+
+def expand_port_mappings(port_mappings):
+    """
+    Lazily expand base schema port mappings with ``*_port_end`` ranges into
+    one mapping per port, for formats that can't express ranges. Mappings
+    without a range are yielded as they are.
+
+    :type port_mappings: list of dict
+    :rtype: generator of dict
+    """
+    for mapping in port_mappings:
+        if 'host_port_end' not in mapping and 'container_port_end' not in mapping:
+            yield mapping
+            continue
+
+        single = {
+            key: value
+            for key, value
+            in mapping.items()
+            if key not in ('host_port_end', 'container_port_end')
+        }
+        start = mapping['container_port']
+        end = mapping.get('container_port_end') or start
+        for offset in range(end - start + 1):
+            expanded = dict(single, container_port=start + offset)
+            if mapping.get('host_port') and end > start:
+                expanded['host_port'] = mapping['host_port'] + offset
+            yield expanded
+
+
+def passthrough(func):
+    """
+    Mark an ``ingest_*()`` or ``emit_*()`` method that returns its argument
+    unchanged. When both methods for a parameter are marked, converting to
+    the same format copies the value instead of calling them.
+    """
+    func.passthrough = True
+    return func
+
+
+class CommandLine(str):
+    """
+    An unsplit ``command``/``entrypoint`` string that also carries the
+    argument list splitting it gives, so formats that take a list don't
+    need to split the string again. The list is the one splitting would
+    give, not the one the string was joined from: quotes inside an argument,
+    such as ``-cmd="nslookup host"``, are removed like a split removes them.
+    """
+
+    def __new__(cls, value, argv=None):
+        command = super(CommandLine, cls).__new__(cls, value)
+        command.argv = argv
+        return command
+
+
+def _drain(items):
+    """
+    Yield the items of a list in order, removing each from the list as it is
+    yielded, so the list doesn't keep it alive once the consumer is done
+    with it.
+
+    :type items: list
+    """
+    items.reverse()
+    while items:
+        yield items.pop()
+
+
 class BaseTransformer(object, metaclass=ABCMeta):
     """
     The base class for Transformer classes to inherit from.
@@ -47,28 +214,83 @@ class BaseTransformer(object, metaclass=ABCMeta):
         normalized_keys = transformer.ingest_containers()
 
     """
+    # Name containers and volumes with uuids instead of hashes of their content
+    random_names = False
+
+    # The volume types, besides host paths and anonymous volumes, the emitters
+    # support. Other volume types are mounted as anonymous volumes
+    volume_types = ()
+
     @staticmethod
     def _list2cmdline(commands):
-        def quote(cmd):
-            """
-            Make sure that each cmd in command list will be treated as a single token
-            :param cmd: str
-            :return:
-            """
-            if len(shlex.split(cmd)) == 1:
-                # Already a single token, do nothing
-                return cmd
-            else:
-                return shlex.quote(cmd)
-
-        return ' '.join(quote(cmd) for cmd in commands)
+        """
+        :param commands: A list of arguments
+        :type commands: list of str
+        :rtype: CommandLine
+        """
+        quoted = [_quote(cmd) for cmd in commands]
+        return CommandLine(
+            ' '.join(token for token, _ in quoted),
+            argv=tuple(argument for _, argument in quoted)
+        )
+
+    @staticmethod
+    def _cmdline2list(command):
+        """
+        :param command: An unsplit command string
+        :type command: str
+        :rtype: list of str
+        """
+        argv = getattr(command, 'argv', None)
+        if argv is None:
+            argv = _split(command)
+        return list(argv)
+
+    def _generate_name(self, data, length=12):
+        """
+        Name a container or volume that doesn't have a name, after a hash of
+        its content, or randomly if ``self.random_names`` is set
+
+        :param data: The definition to name
+        :type data: dict
+        :rtype: str
+        """
+        if self.random_names:
+            return uuid.uuid4().hex[:length]
+        return content_name(data, length)
+
+    def _name_containers(self, containers, key='name'):
+        """
+        Name the containers that don't have ``key`` with
+        ``._generate_name()``. Emitters name containers once all of them are
+        known, so identical containers without a name get different names.
+
+        :type containers: list of dict
+        :rtype: list of dict
+        """
+        names = set(container.get(key) for container in containers)
+        for container in containers:
+            if not container.get(key):
+                name = self._generate_name(container)
+                while name in names:
+                    # An identical container without a name
+                    name = self._generate_name([name, container])
+                container[key] = name
+                names.add(name)
+        return containers
 
     def _read_file(self, filename):
         """
-        :param filename: The location of the file to read
+        Files are read as bytes, memory-mapped when they are regular files,
+        see :func:`container_transform.input.open_input`.
+
+        :param filename: The location of the file to read, or an already open
+            file-like object
         :type filename: str
         """
-        with open(filename, 'r') as stream:
+        if hasattr(filename, 'read'):
+            return self._read_stream(stream=filename)
+        with open_input(filename) as stream:
             return self._read_stream(stream=stream)
 
     @abstractmethod
@@ -77,12 +299,33 @@ class BaseTransformer(object, metaclass=ABCMeta):
         Override this method and parse the stream to be passed to
         ``self.transform()``
 
-        :param stream: A file-like object
-        :type stream: file
+        :param stream: A text or binary file-like object, or a memory map
+        :type stream: file or mmap.mmap
         """
         raise NotImplementedError
 
-    @abstractmethod
+    def _raw_containers(self, containers):
+        """
+        Override this method to find the container definitions in parsed
+        input, such as the applications of a Marathon group.
+
+        :param containers: The parsed input, like ``self.stream``
+        :returns: The items ``._ingest_container()`` is called with
+        :rtype: list
+        """
+        if isinstance(containers, dict):
+            return [containers]
+        return containers
+
+    def _ingest_container(self, container):
+        """
+        Override this method to normalize one item of ``._raw_containers()``
+        into an un-converted container definition dictionary.
+
+        :rtype: dict
+        """
+        return container
+
     def ingest_containers(self, containers=None):
         """
         Ingest self.stream and return a list of un-converted container
@@ -95,12 +338,96 @@ class BaseTransformer(object, metaclass=ABCMeta):
 
         :rtype: list of dict
         """
-        raise NotImplementedError
+        return [
+            self._ingest_container(container)
+            for container
+            in self._raw_containers(containers or self.stream or {})
+        ]
+
+    def iter_containers(self):
+        """
+        Ingest self.stream one container at a time, like
+        ``.ingest_containers()``, and let go of the parsed input as it goes,
+        so each raw container definition can be freed as soon as it has been
+        converted. The transformer can't ingest its input again afterwards,
+        but the parsed input itself is left as it was: a copy of its list of
+        containers is drained, not the list itself.
+
+        :rtype: iterator of dict
+        """
+        containers = list(self._raw_containers(self.stream or {}))
+        self.stream = None
+        for container in _drain(containers):
+            yield self._ingest_container(container)
 
     @abstractmethod
     def emit_containers(self, containers, verbose=True):
         raise NotImplementedError
 
+    def emit_stream(self, containers, verbose=True):
+        """
+        Emit the output as an iterable of text chunks. Override this when the
+        output can be produced without building it as one string.
+
+        :param containers: List of the container definitions
+        :type containers: list of dict
+        :param verbose: Expand/minify the output
+        :type verbose: bool
+
+        :rtype: iterable of str
+        """
+        return [self.emit_containers(containers, verbose)]
+
+    def settings(self):
+        """
+        Return the settings of the transformer that affect its output, such
+        as the Kubernetes workload kind: every public attribute besides the
+        parsed input and messages.
+
+        :rtype: dict
+        """
+        return {
+            key: value
+            for key, value
+            in vars(self).items()
+            if key not in ('stream', 'obj', 'messages') and not key.startswith('_')
+        }
+
+    def volatile_fields(self):
+        """
+        Return the output fields and settings that change between runs
+        without the input or options changing, such as a schedule starting
+        now, so hashes can leave them out.
+
+        :rtype: frozenset
+        """
+        return frozenset()
+
+    def export_state(self):
+        """
+        Return any state the ``emit_*()`` methods accumulated outside of the
+        container definitions (such as task or pod volumes) as plain,
+        picklable data.
+
+        :rtype: dict
+        """
+        return {}
+
+    def merge_state(self, state, containers=()):
+        """
+        Merge the output of another transformer's ``.export_state()`` into
+        this transformer. Used when containers are converted by several
+        transformer instances, for example in worker processes.
+
+        :param state: The exported state
+        :type state: dict
+        :param containers: The containers the other transformer converted.
+            Updated if merging renames something they refer to, such as a
+            volume whose name was already taken
+        :type containers: list of dict
+        """
+        pass
+
     @staticmethod
     @abstractmethod
     def validate(container):
@@ -116,33 +443,43 @@ class BaseTransformer(object, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    @passthrough
     def ingest_name(self, name):
         return name
 
+    @passthrough
     def emit_name(self, name):
         return name
 
+    @passthrough
     def ingest_image(self, image):
         return image
 
+    @passthrough
     def emit_image(self, image):
         return image
 
+    @passthrough
     def ingest_links(self, image):
         return image
 
+    @passthrough
     def emit_links(self, image):
         return image
 
+    @passthrough
     def ingest_user(self, user):
         return user
 
+    @passthrough
     def emit_user(self, user):
         return user
 
+    @passthrough
     def ingest_net_mode(self, net_mode):
         return net_mode
 
+    @passthrough
     def emit_net_mode(self, net_mode):
         return net_mode
 
@@ -151,6 +488,7 @@ class BaseTransformer(object, metaclass=ABCMeta):
             network = [network]
         return network
 
+    @passthrough
     def emit_network(self, network):
         return network
 
@@ -159,6 +497,7 @@ class BaseTransformer(object, metaclass=ABCMeta):
             domain = [domain]
         return domain
 
+    @passthrough
     def emit_domain(self, domain):
         return domain
 
@@ -167,24 +506,31 @@ class BaseTransformer(object, metaclass=ABCMeta):
             dns = [dns]
         return dns
 
+    @passthrough
     def emit_dns(self, dns):
         return dns
 
+    @passthrough
     def ingest_work_dir(self, work_dir):
         return work_dir
 
+    @passthrough
     def emit_work_dir(self, work_dir):
         return work_dir
 
+    @passthrough
     def ingest_labels(self, labels):
         return labels
 
+    @passthrough
     def emit_labels(self, labels):
         return labels
 
+    @passthrough
     def ingest_pid(self, pid):
         return pid
 
+    @passthrough
     def emit_pid(self, pid):
         return pid
 
@@ -193,6 +539,7 @@ class BaseTransformer(object, metaclass=ABCMeta):
             env_file = [env_file]
         return env_file
 
+    @passthrough
     def emit_env_file(self, env_file):
         return env_file
 
@@ -201,18 +548,23 @@ class BaseTransformer(object, metaclass=ABCMeta):
             expose = [expose]
         return expose
 
+    @passthrough
     def emit_expose(self, expose):
         return expose
 
+    @passthrough
     def ingest_privileged(self, privileged):
         return privileged
 
+    @passthrough
     def emit_privileged(self, privileged):
         return privileged
 
+    @passthrough
     def ingest_fetch(self, fetch):
         return fetch
 
+    @passthrough
     def emit_fetch(self, fetch):
         return fetch
 
@@ -0,0 +1,166 @@
+from collections import namedtuple
+from functools import lru_cache
+from numbers import Real
+
+from .schema import ARG_MAP
+from .transformer import SCHEMA
+
+
+ValidationError = namedtuple('ValidationError', ['container', 'field', 'message'])
+ValidationError.__doc__ = """
+A problem with one field of one container. ``field`` is the name of the field
+in the input format.
+"""
+
+
+def _type_name(value):
+    return type(value).__name__
+
+
+def _number_check(path):
+    def check(value):
+        if isinstance(value, bool) or not isinstance(value, Real):
+            yield path, 'should be a number, got {}'.format(_type_name(value))
+    return check
+
+
+def _type_check(expected, path):
+    def check(value):
+        if not isinstance(value, expected):
+            yield path, 'should be {}, got {}'.format(expected.__name__, _type_name(value))
+    return check
+
+
+def _dict_check(expected, path):
+    key_checks = [
+        (key, _build_check(item, '{}.{}'.format(path, key)))
+        for key, item
+        in expected.items()
+    ]
+
+    def check(value):
+        if not isinstance(value, dict):
+            yield path, 'should be dict, got {}'.format(_type_name(value))
+            return
+        for key, key_check in key_checks:
+            if value.get(key) is not None:
+                yield from key_check(value[key])
+    return check
+
+
+def _list_check(expected, path):
+    item_check = _build_check(expected[0], path + '[]') if expected else None
+
+    def check(value):
+        if not isinstance(value, list):
+            yield path, 'should be list, got {}'.format(_type_name(value))
+            return
+        if item_check is not None:
+            for item in value:
+                yield from item_check(item)
+    return check
+
+
+def _build_check(expected, path):
+    """
+    Turn a ``SCHEMA`` entry into a function that takes a normalized value and
+    yields ``(path, message)`` for everything wrong with it.
+
+    ``int`` accepts any real number, since some formats ingest fractional cpu.
+    A dict entry with keys checks those keys, a one item list checks every
+    element, and a string (such as ``protocol``) only requires a string.
+    """
+    if expected is int:
+        return _number_check(path)
+    if isinstance(expected, str):
+        return _type_check(str, path)
+    if isinstance(expected, type):
+        return _type_check(expected, path)
+    if isinstance(expected, dict):
+        return _dict_check(expected, path)
+    if isinstance(expected, list):
+        return _list_check(expected, path)
+    raise TypeError('Unsupported schema entry {!r}'.format(expected))
+
+
+def _allow_type(common_type, check):
+    def allowing_check(value):
+        if isinstance(value, common_type):
+            return ()
+        return check(value)
+    return allowing_check
+
+
+FieldValidator = namedtuple('FieldValidator', ['parameter', 'input_name', 'ingest', 'check'])
+
+
+@lru_cache(maxsize=None)
+def compile_validators(input_type, input_class):
+    """
+    Build the checks for the fields of an input format once. ``ingest`` is
+    the transformer method that normalizes the field, and ``check`` checks
+    the normalized value against ``SCHEMA``, or is None if the parameter
+    isn't in ``SCHEMA``.
+
+    :rtype: tuple of FieldValidator
+    """
+    validators = []
+    for parameter, options in ARG_MAP.items():
+        input_name = options.get(input_type, {}).get('name')
+        ingest = 'ingest_{}'.format(parameter)
+        if not input_name or not hasattr(input_class, ingest):
+            continue
+
+        check = None
+        if parameter in SCHEMA:
+            check = _build_check(SCHEMA[parameter], parameter)
+            # Values gathered from repeated docker parameters may also
+            # stay in the format's own type, like chronos labels
+            common_type = options[input_type].get('type')
+            if common_type is not None:
+                check = _allow_type(common_type, check)
+        validators.append(FieldValidator(parameter, input_name, ingest, check))
+    return tuple(validators)
+
+
+def validate_containers(containers, input_type, input_transformer):
+    """
+    Normalize every field of every ingested container and check it against
+    ``SCHEMA``. Fields that can't be normalized at all are reported instead
+    of raising.
+
+    :param containers: The output of ``input_transformer.ingest_containers()``
+        or ``.iter_containers()``
+    :type containers: iterable of dict
+    :param input_type: The input format
+    :type input_type: str
+    :param input_transformer: The transformer the containers were ingested with
+    :rtype: list of ValidationError
+    """
+    validators = compile_validators(input_type, type(input_transformer))
+
+    errors = []
+    for index, container in enumerate(containers):
+        name = container.get('name') or container.get('id') or str(index)
+        for validator in validators:
+            value = container.get(validator.input_name)
+            if not value:
+                continue
+            try:
+                normalized = getattr(input_transformer, validator.ingest)(value)
+            except Exception as e:
+                errors.append(ValidationError(
+                    name,
+                    validator.input_name,
+                    'could not be read: {}'.format(str(e) or type(e).__name__)
+                ))
+                continue
+            if validator.check is None or normalized is None:
+                continue
+            for path, message in validator.check(normalized):
+                errors.append(ValidationError(
+                    name,
+                    validator.input_name,
+                    '{} {}'.format(path, message)
+                ))
+    return errors
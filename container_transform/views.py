@@ -0,0 +1,58 @@
+from collections.abc import Mapping
+
+
+class ContainerView(Mapping):
+    """
+    A read-only view of a container definition from parsed input, with an
+    overlay of the keys added while ingesting it, such as the compose service
+    name or flattened Marathon parameters. Overlay keys take precedence.
+
+    Ingesting with views neither copies nor modifies the parsed input, so the
+    same input can be converted to several outputs. Values are shared with
+    the input, not copied.
+
+    To use this class:
+
+    .. code-block:: python
+
+        definition = {'image': 'redis'}
+        container = ContainerView(definition, {'name': 'cache'})
+        assert dict(container) == {'name': 'cache', 'image': 'redis'}
+        assert definition == {'image': 'redis'}
+
+    """
+    __slots__ = ('_base', '_overlay')
+
+    def __init__(self, base, overlay=None):
+        """
+        :param base: The container definition from the parsed input
+        :type base: dict
+        :param overlay: Keys to add to, or replace in, ``base``
+        :type overlay: dict
+        """
+        self._base = base
+        self._overlay = overlay or {}
+
+    def __getitem__(self, key):
+        if key in self._overlay:
+            return self._overlay[key]
+        return self._base[key]
+
+    def __contains__(self, key):
+        return key in self._overlay or key in self._base
+
+    def __iter__(self):
+        for key in self._base:
+            if key not in self._overlay:
+                yield key
+        for key in self._overlay:
+            yield key
+
+    def __len__(self):
+        return len(self._overlay) + sum(1 for key in self._base if key not in self._overlay)
+
+    def __reduce__(self):
+        return (type(self), (self._base, self._overlay))
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, dict(self))
@@ -0,0 +1,172 @@
+import os
+import time
+
+from .cache import ConversionCache
+from .converter import Converter
+from .output import write_atomic
+from .schema import TransformationTypes
+
+INPUT_EXTENSIONS = {
+    TransformationTypes.COMPOSE.value: ('.yml', '.yaml'),
+    TransformationTypes.ECS.value: ('.json',),
+    TransformationTypes.MARATHON.value: ('.json',),
+    TransformationTypes.CHRONOS.value: ('.json',),
+    TransformationTypes.KUBERNETES.value: ('.yml', '.yaml'),
+}
+
+OUTPUT_EXTENSIONS = {
+    TransformationTypes.COMPOSE.value: '.yml',
+    TransformationTypes.ECS.value: '.json',
+    TransformationTypes.SYSTEMD.value: '.service',
+    TransformationTypes.MARATHON.value: '.json',
+    TransformationTypes.CHRONOS.value: '.json',
+    TransformationTypes.KUBERNETES.value: '.yaml',
+}
+
+
+class Watcher(object):
+    """
+    Poll input files and directories and reconvert files when they change.
+
+    Directories are searched recursively for files with an extension of the
+    input type. Each output is written atomically next to its input, or into
+    ``output_dir``, named after the input with the extension of the output
+    type.
+
+    To use this class:
+
+    .. code-block:: python
+
+        watcher = Watcher(['./services'], 'compose', 'ecs', output_dir='./tasks')
+        while True:
+            for filename in watcher.poll():
+                output_file, elapsed, messages = watcher.convert(filename)
+
+    """
+
+    def __init__(self, paths, input_type, output_type, output_dir=None, verbose=True,
+                 interval=1.0, debounce=0.2, sleep=time.sleep, dedup=False):
+        """
+        :param paths: Files and directories to watch
+        :type paths: list of str
+        :param input_type: The input transformation type
+        :type input_type: str
+        :param output_type: The output transformation type
+        :type output_type: str
+        :param output_dir: The directory to write outputs to
+        :type output_dir: str
+        :param verbose: Expand/minify json output
+        :type verbose: bool
+        :param interval: Seconds between polls while nothing is changing
+        :type interval: float
+        :param debounce: Seconds a changed file must be left alone before it
+            is converted
+        :type debounce: float
+        :param dedup: Convert identical container definitions once across
+            all the watched files
+        :type dedup: bool
+        """
+        self.paths = paths
+        self.input_type = input_type
+        self.output_type = output_type
+        self.output_dir = output_dir
+        self.verbose = verbose
+        self.interval = interval
+        self.debounce = debounce
+        self._sleep = sleep
+        self.cache = ConversionCache() if dedup else None
+        self._signatures = {}
+        self._outputs = set()
+
+    def _input_files(self):
+        extensions = INPUT_EXTENSIONS.get(self.input_type, ())
+        output_suffix = '.out' + OUTPUT_EXTENSIONS[self.output_type]
+        for path in self.paths:
+            if not os.path.isdir(path):
+                yield path
+                continue
+            for root, _, filenames in os.walk(path):
+                filenames = [
+                    os.path.join(root, filename)
+                    for filename in sorted(filenames)
+                    if filename.endswith(extensions) and not filename.endswith(output_suffix)
+                ]
+                # Don't pick up our own outputs when the formats share an
+                # extension, including the outputs of an earlier run
+                outputs = self._outputs.union(self.output_file(filename) for filename in filenames)
+                for filename in filenames:
+                    if filename not in outputs:
+                        yield filename
+
+    def check(self):
+        """
+        Return the input files that were added or modified since the last
+        call. Every file counts as changed on the first call.
+
+        :rtype: list of str
+        """
+        signatures = {}
+        for filename in self._input_files():
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            signatures[filename] = (stat.st_mtime_ns, stat.st_size)
+
+        changed = [
+            filename
+            for filename, signature
+            in signatures.items()
+            if self._signatures.get(filename) != signature
+        ]
+        self._signatures = signatures
+        return sorted(changed)
+
+    def poll(self):
+        """
+        Block until files change, then wait until they stop changing
+
+        :rtype: list of str
+        """
+        changed = set()
+        while True:
+            new = self.check()
+            if new:
+                changed.update(new)
+                self._sleep(self.debounce)
+            elif changed:
+                return sorted(changed)
+            else:
+                self._sleep(self.interval)
+
+    def output_file(self, filename):
+        """
+        :param filename: An input file
+        :type filename: str
+        :rtype: str
+        """
+        root = os.path.splitext(filename)[0]
+        extension = OUTPUT_EXTENSIONS[self.output_type]
+        if self.output_dir:
+            root = os.path.join(self.output_dir, os.path.basename(root))
+        if root + extension == filename:
+            return root + '.out' + extension
+        return root + extension
+
+    def convert(self, filename):
+        """
+        Convert an input file and write the output
+
+        :param filename: An input file
+        :type filename: str
+        :rtype: tuple
+        :returns: The output file, seconds taken, messages
+        """
+        start = time.perf_counter()
+        converter = Converter(filename, self.input_type, self.output_type, dedup=self.cache)
+        output = converter.convert(self.verbose)
+
+        output_file = self.output_file(filename)
+        self._outputs.add(output_file)
+        write_atomic(output_file, output + '\n')
+        return output_file, time.perf_counter() - start, converter.messages
@@ -32,6 +32,8 @@ tests_require = [
 extras_require = {
     'test': tests_require,
     'packaging': ['wheel'],
+    'batch': ['numpy'],
+    'orjson': ['orjson'],
     'docs': ['Sphinx>=1.2.2', 'sphinx_rtd_theme'],
 }
 
@@ -59,7 +61,7 @@ setup(
     ],
     entry_points='''
         [console_scripts]
-        container-transform=container_transform.client:transform
+        container-transform=container_transform.client:main
     ''',
     license='MIT',
     install_requires=install_requires,